@@ -0,0 +1,53 @@
+"""
+Message ingestion throughput: one MessageDAO.create (INSERT + flush) per
+message, as POST /messages/ does, against MessageDAO.create_many with
+multi-row INSERT ... RETURNING in chunks, as POST /messages/bulk does.
+
+Run with: PYTHONPATH=src python -m benchmarks.bulk_messages
+"""
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.infrastructure.messages.dao import MessageDAO
+from benchmarks.common import Timing, measure, memory_engine, report
+
+ROWS: int = 2_000
+CHUNKS: list[int] = [100, 1_000]
+
+
+async def main() -> None:
+    """Time inserting ROWS messages per call with each strategy and print rows/sec."""
+    engine: AsyncEngine = await memory_engine()
+    contents: list[str] = [f"message {i}" for i in range(ROWS)]
+    timings: list[Timing] = []
+
+    async with AsyncSession(engine) as session:
+        dao = MessageDAO(session)
+
+        async def single() -> None:
+            for content in contents:
+                await dao.create("bench", content)
+            await session.rollback()
+
+        timings.append(await measure(f"single INSERT x{ROWS}", single, calls=10, warmup=1))
+
+        for chunk in CHUNKS:
+
+            async def bulk(chunk: int = chunk) -> None:
+                for start in range(0, ROWS, chunk):
+                    await dao.create_many("bench", contents[start:start + chunk])
+                await session.rollback()
+
+            timings.append(await measure(f"multi-row INSERT, chunks of {chunk}", bulk, calls=10, warmup=1))
+    await engine.dispose()
+
+    report(f"Inserting {ROWS} messages per call", timings, "bulk_messages.json")
+    for t in timings:
+        print(f"{t.name:<48}{t.ops_per_sec * ROWS:>12.0f} rows/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+import statistics
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+
+# Benchmark results are written next to other generated reports
+REPORTS_DIR: Path = Path(__file__).resolve().parents[1] / "reports" / "benchmarks"
+
+
+@dataclass
+class Timing:
+    """Per-call latency summary for one benchmark case."""
+
+    name: str
+    calls: int
+    mean_us: float
+    p50_us: float
+    p99_us: float
+    ops_per_sec: float
+
+
+async def measure(name: str, fn: Callable[[], Awaitable[Any]], calls: int = 1000, warmup: int = 50) -> Timing:
+    """Time repeated awaits of fn and summarize the per-call latency."""
+    for _ in range(warmup):
+        await fn()
+    samples: list[float] = []
+    for _ in range(calls):
+        start: float = perf_counter()
+        await fn()
+        samples.append(perf_counter() - start)
+    samples.sort()
+    mean: float = statistics.fmean(samples)
+    return Timing(
+        name=name,
+        calls=calls,
+        mean_us=mean * 1e6,
+        p50_us=samples[len(samples) // 2] * 1e6,
+        p99_us=samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6,
+        ops_per_sec=1 / mean if mean else 0.0,
+    )
+
+
+async def memory_engine() -> AsyncEngine:
+    """Create an in-memory SQLite engine with the schema in place."""
+    engine: AsyncEngine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+def report(title: str, timings: list[Timing], filename: str) -> Path:
+    """Print a results table and write the timings as JSON under reports/benchmarks."""
+    print(f"\n{title}")
+    print(f"{'case':<48}{'calls':>8}{'mean µs':>12}{'p50 µs':>12}{'p99 µs':>12}{'ops/s':>12}")
+    for t in timings:
+        print(f"{t.name:<48}{t.calls:>8}{t.mean_us:>12.1f}{t.p50_us:>12.1f}{t.p99_us:>12.1f}{t.ops_per_sec:>12.0f}")
+
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    path: Path = REPORTS_DIR / filename
+    path.write_text(json.dumps({"title": title, "timings": [asdict(t) for t in timings]}, indent=2))
+    return path
@@ -0,0 +1,61 @@
+"""
+Micro-benchmark of per-call Python overhead for DAO list queries:
+freshly built select() constructs versus the cached lambda statements.
+
+Run with: PYTHONPATH=src python -m benchmarks.dao_statements
+"""
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.db.entities.map import Map
+from app.infrastructure.maps.dao import list_maps_by_user_stmt
+from benchmarks.common import Timing, measure, memory_engine, report
+
+USERS: int = 20
+MAPS_PER_USER: int = 5
+
+
+async def main() -> None:
+    """Seed a small table and compare statement construction and execution."""
+    engine: AsyncEngine = await memory_engine()
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add_all(
+            Map(user_id=f"user-{u}", name=f"map-{u}-{m}", description="", state="{}")
+            for u in range(USERS)
+            for m in range(MAPS_PER_USER)
+        )
+        await session.commit()
+
+        user_id: str = "user-7"
+
+        async def build_select() -> None:
+            stmt = select(Map).where(Map.user_id == user_id)
+            stmt._generate_cache_key()  # pyright: ignore[reportPrivateUsage]
+
+        async def build_lambda() -> None:
+            stmt = list_maps_by_user_stmt(user_id)
+            stmt._generate_cache_key()  # pyright: ignore[reportPrivateUsage]
+
+        async def execute_select() -> None:
+            (await session.execute(select(Map).where(Map.user_id == user_id))).scalars().all()
+
+        async def execute_lambda() -> None:
+            (await session.execute(list_maps_by_user_stmt(user_id))).scalars().all()
+
+        timings: list[Timing] = [
+            await measure("build+cache key: select()", build_select, calls=5000),
+            await measure("build+cache key: lambda_stmt", build_lambda, calls=5000),
+            await measure("list_by_user execute: select()", execute_select),
+            await measure("list_by_user execute: lambda_stmt", execute_lambda),
+        ]
+
+    await engine.dispose()
+    report("DAO statement construction overhead", timings, "dao_statements.json")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+"""
+Dataset read throughput: TileDB arrays versus the current layout, where the
+dataset is JSON inside the map `state` Text column and every read fetches
+and parses the whole document before slicing.
+
+The SQL baseline runs on in-memory SQLite, and on Postgres as well when
+BENCH_POSTGRES_URL points at a scratch database (tables are created and
+dropped). Requires the optional tiledb dependency.
+
+Run with: PYTHONPATH=src python -m benchmarks.datasets
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import tempfile
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from app.db.base import Base
+from app.db.entities.map import Map
+from app.domain.datasets.models import BoundingBox
+from app.infrastructure.datasets.tiledb_repository import TileDBDatasetRepository
+from benchmarks.common import Timing, measure, memory_engine, report
+
+ROWS: int = int(os.environ.get("BENCH_DATASET_ROWS", "200000"))
+SLICE_ROWS: int = 10_000
+CALLS: int = 50
+
+# Roughly 1% of the points fall inside the box
+BBOX = BoundingBox(min_x=0.0, min_y=0.0, max_x=10.0, max_y=10.0)
+
+
+def make_dataset() -> dict[str, list[Any]]:
+    """Random points over a 100 x 100 square with a value and a label."""
+    rng = random.Random(42)
+    return {
+        "x": [rng.uniform(0, 100) for _ in range(ROWS)],
+        "y": [rng.uniform(0, 100) for _ in range(ROWS)],
+        "value": [rng.randint(0, 1_000_000) for _ in range(ROWS)],
+        "label": [f"feature-{i}" for i in range(ROWS)],
+    }
+
+
+async def bench_state_column(label: str, engine: AsyncEngine, dataset: dict[str, list[Any]]) -> list[Timing]:
+    """Time reads that load the dataset JSON from maps.state and slice it in Python."""
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        map_ = Map(user_id="bench", name="bench", description="", state=json.dumps({"dataset": dataset}))
+        session.add(map_)
+        await session.commit()
+        map_id: int = map_.id
+
+    async def load() -> dict[str, list[Any]]:
+        async with AsyncSession(engine) as session:
+            state: str = (await session.execute(select(Map.state).where(Map.id == map_id))).scalar_one()
+        return json.loads(state)["dataset"]
+
+    async def read_rows() -> None:
+        columns = await load()
+        start: int = random.randrange(0, ROWS - SLICE_ROWS)
+        {c: values[start:start + SLICE_ROWS] for c, values in columns.items()}
+
+    async def read_bbox() -> None:
+        columns = await load()
+        xs, ys = columns["x"], columns["y"]
+        hits: list[int] = [
+            i for i in range(ROWS)
+            if BBOX.min_x <= xs[i] <= BBOX.max_x and BBOX.min_y <= ys[i] <= BBOX.max_y
+        ]
+        {c: [values[i] for i in hits] for c, values in columns.items()}
+
+    return [
+        await measure(f"{label} state JSON rows[{SLICE_ROWS}]", read_rows, calls=CALLS, warmup=3),
+        await measure(f"{label} state JSON bbox", read_bbox, calls=CALLS, warmup=3),
+    ]
+
+
+async def bench_tiledb(root: str, dataset: dict[str, list[Any]]) -> list[Timing]:
+    """Time sliced reads from the TileDB arrays."""
+    repo = TileDBDatasetRepository(root)
+    await repo.write(1, "bench", dataset, x="x", y="y")
+
+    async def read_rows() -> None:
+        start: int = random.randrange(0, ROWS - SLICE_ROWS)
+        await repo.read_rows(1, "bench", start, start + SLICE_ROWS)
+
+    async def read_bbox() -> None:
+        await repo.read_bbox(1, "bench", BBOX)
+
+    return [
+        await measure(f"tiledb rows[{SLICE_ROWS}]", read_rows, calls=CALLS, warmup=3),
+        await measure("tiledb bbox", read_bbox, calls=CALLS, warmup=3),
+    ]
+
+
+async def main() -> None:
+    """Run the SQL baselines and the TileDB reads on the same dataset."""
+    dataset: dict[str, list[Any]] = make_dataset()
+    timings: list[Timing] = []
+
+    engine: AsyncEngine = await memory_engine()
+    timings += await bench_state_column("sqlite", engine, dataset)
+    await engine.dispose()
+
+    postgres_url: str | None = os.environ.get("BENCH_POSTGRES_URL")
+    if postgres_url:
+        engine = create_async_engine(postgres_url)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            timings += await bench_state_column("postgres", engine, dataset)
+        finally:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+            await engine.dispose()
+    else:
+        print("BENCH_POSTGRES_URL not set; skipping Postgres")
+
+    with tempfile.TemporaryDirectory() as root:
+        timings += await bench_tiledb(root, dataset)
+
+    report(f"Dataset reads over {ROWS} rows: maps.state JSON vs TileDB", timings, "datasets.json")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""
+Cost of fetching a page of one user's maps at increasing depth: LIMIT/OFFSET
+versus the keyset cursor on (updated_at, id). OFFSET reads and discards every
+earlier row, while the keyset page seeks straight into the composite index.
+
+Run with: PYTHONPATH=src python -m benchmarks.pagination
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Sequence
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.db.entities.map import Map
+from app.domain.pagination import Cursor
+from app.infrastructure.maps.dao import MapDAO
+from benchmarks.common import Timing, measure, memory_engine, report
+
+ROWS: int = 50_000
+PAGE: int = 50
+DEPTHS: list[int] = [1, 100, 900]
+
+
+async def main() -> None:
+    """Time page 1 and deep pages with both strategies."""
+    engine: AsyncEngine = await memory_engine()
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(Map),
+            [{"user_id": "bench", "name": f"map-{i}", "description": "", "state": "{}"} for i in range(ROWS)],
+        )
+        # Spread the rows over distinct seconds, as edits over time would
+        await conn.exec_driver_sql("UPDATE maps SET updated_at = datetime(updated_at, '-' || id || ' seconds')")
+
+    timings: list[Timing] = []
+    async with AsyncSession(engine) as session:
+        dao = MapDAO(session)
+        for depth in DEPTHS:
+            offset: int = (depth - 1) * PAGE
+            previous: Sequence[Map] = await dao.list_by_user("bench", offset) if offset else []
+            after: Cursor | None = Cursor.after(previous[-1]) if previous else None
+
+            async def by_offset() -> None:
+                stmt = (
+                    select(Map)
+                    .where(Map.user_id == "bench")
+                    .order_by(Map.updated_at.desc(), Map.id.desc())
+                    .offset(offset)
+                    .limit(PAGE)
+                )
+                (await session.execute(stmt)).scalars().all()
+
+            async def by_keyset() -> None:
+                await dao.list_by_user("bench", PAGE, after)
+
+            timings.append(await measure(f"page {depth} offset", by_offset, calls=200, warmup=10))
+            timings.append(await measure(f"page {depth} keyset", by_keyset, calls=200, warmup=10))
+    await engine.dispose()
+
+    report(f"Listing page latency over {ROWS} maps, {PAGE} per page", timings, "pagination.json")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+"""
+Per-operation latency of the map repositories: SQL (in-memory SQLite),
+the standalone in-memory repository, and the write-through front over SQL.
+
+Run with: PYTHONPATH=src python -m benchmarks.repositories
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.domain.maps.interfaces import MapRepository
+from app.domain.maps.models import MapDomain
+from app.infrastructure.maps.dao import MapDAO
+from app.infrastructure.maps.memory_repository import InMemoryMapRepository, WriteThroughMapRepository
+from app.infrastructure.maps.repository import SqlAlchemyMapRepository
+from app.infrastructure.memory_store import InMemoryStore
+from benchmarks.common import Timing, measure, memory_engine, report
+
+USERS: int = 50
+MAPS_PER_USER: int = 20
+
+
+async def seed(repo: MapRepository) -> list[MapDomain]:
+    """Fill a repository with USERS * MAPS_PER_USER maps."""
+    return [
+        await repo.create(f"user-{u}", f"map-{u}-{m}", "", "{}")
+        for u in range(USERS)
+        for m in range(MAPS_PER_USER)
+    ]
+
+
+async def run_cases(label: str, repo: MapRepository, maps: list[MapDomain]) -> list[Timing]:
+    """Time get, list_by_user, create and update against one repository."""
+    ids = itertools.cycle([m.id for m in maps])
+    users = itertools.cycle([f"user-{u}" for u in range(USERS)])
+
+    async def get() -> None:
+        await repo.get(next(ids))
+
+    async def list_by_user() -> None:
+        await repo.list_by_user(next(users))
+
+    async def create() -> None:
+        await repo.create(next(users), "bench", "", "{}")
+
+    async def update() -> None:
+        await repo.update(next(ids), "bench", "updated", "{}")
+
+    return [
+        await measure(f"{label} get", get),
+        await measure(f"{label} list_by_user ({MAPS_PER_USER} rows)", list_by_user),
+        await measure(f"{label} create", create),
+        await measure(f"{label} update", update),
+    ]
+
+
+async def main() -> None:
+    """Benchmark each repository on identical data."""
+    timings: list[Timing] = []
+
+    engine: AsyncEngine = await memory_engine()
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        sql = SqlAlchemyMapRepository(MapDAO(session))
+        maps: list[MapDomain] = await seed(sql)
+        await session.commit()
+        timings += await run_cases("sql", sql, maps)
+    await engine.dispose()
+
+    memory = InMemoryMapRepository()
+    timings += await run_cases("memory", memory, await seed(memory))
+
+    engine = await memory_engine()
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        front = WriteThroughMapRepository(SqlAlchemyMapRepository(MapDAO(session)), InMemoryStore())
+        maps = await seed(front)
+        await session.commit()
+        timings += await run_cases("write-through", front, maps)
+    await engine.dispose()
+
+    report("Map repository per-operation latency", timings, "repositories.json")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -21,7 +21,8 @@
 
 # Load settings
 settings: Settings = get_settings()
-db_url = str(settings.database.url)
+# An explicit sqlalchemy.url (e.g. a shard) takes precedence over the primary database
+db_url = config.get_main_option("sqlalchemy.url") or str(settings.database.url)
 
 def run_migrations_offline() -> None:
     """Run migrations without connecting to the database."""
@@ -40,6 +41,8 @@ def do_run_migrations(connection: Connection) -> None:
     context.configure(
         connection=connection,
         target_metadata=target_metadata,
+        # Online helpers commit inside autocommit blocks, so keep each revision in its own transaction
+        transaction_per_migration=True,
     )
     with context.begin_transaction():
         context.run_migrations()
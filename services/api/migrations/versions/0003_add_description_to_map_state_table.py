@@ -1,7 +1,7 @@
 """Add description column to map_states table
 
 Revision ID: 0003_add_description_to_map_state_table
-Revises: 0002_create_map_state_table
+Revises: 0002_create_map_table
 Create Date: 2025-06-23 12:02:00.000000
 """
 
@@ -10,20 +10,22 @@
 
 # Revision identifiers, used by Alembic.
 revision = "0003_add_description_to_map_state_table"
-down_revision = "0002_create_map_state_table"
+down_revision = "0002_create_map_table"
 branch_labels = None
 depends_on = None
 
 
 def upgrade() -> None:
-    """Add description column."""
-    op.add_column(
-        "map_states",
-        sa.Column("description", sa.String(), nullable=False, server_default=""),
-    )
-    op.alter_column("map_states", "description", server_default=None)
+    """
+    Add the description column. It was written against the old map_states
+    table; 0002 now creates maps with the column, so only add it when missing.
+    """
+    columns: set[str] = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("maps")}
+    if "description" in columns:
+        return
+    op.add_column("maps", sa.Column("description", sa.String(), nullable=False, server_default=""))
+    op.alter_column("maps", "description", server_default=None)
 
 
 def downgrade() -> None:
-    """Remove description column."""
-    op.drop_column("map_states", "description")
+    """Keep the description column, which is part of the maps table 0002 creates."""
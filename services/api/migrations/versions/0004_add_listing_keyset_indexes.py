@@ -0,0 +1,40 @@
+"""Add keyset pagination indexes for map and message listings
+
+Revision ID: 0004_add_listing_keyset_indexes
+Revises: 0003_add_description_to_map_state_table
+Create Date: 2026-10-18 12:00:00.000000
+"""
+
+import sqlalchemy as sa
+
+from app.db.online_migrations import create_index_concurrently, drop_index_concurrently
+
+# Revision identifiers, used by Alembic.
+revision = "0004_add_listing_keyset_indexes"
+down_revision = "0003_add_description_to_map_state_table"
+branch_labels = None
+depends_on = None
+
+# Listings order by (updated_at, id) descending, per user and overall
+INDEXES: list[tuple[str, str, list[str]]] = [
+    ("ix_maps_user_id_updated_at_id", "maps", ["user_id"]),
+    ("ix_maps_updated_at_id", "maps", []),
+    ("ix_messages_user_id_updated_at_id", "messages", ["user_id"]),
+    ("ix_messages_updated_at_id", "messages", []),
+]
+
+
+def upgrade() -> None:
+    """Build the listing indexes without blocking writes."""
+    for index_name, table_name, prefix in INDEXES:
+        create_index_concurrently(
+            index_name,
+            table_name,
+            [*prefix, sa.column("updated_at").desc(), sa.column("id").desc()],
+        )
+
+
+def downgrade() -> None:
+    """Drop the listing indexes."""
+    for index_name, table_name, _ in reversed(INDEXES):
+        drop_index_concurrently(index_name, table_name)
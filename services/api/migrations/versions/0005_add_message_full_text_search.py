@@ -0,0 +1,53 @@
+"""Add full-text search over message content
+
+Revision ID: 0005_add_message_full_text_search
+Revises: 0004_add_listing_keyset_indexes
+Create Date: 2026-10-18 12:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db.full_text import (
+    POSTGRES_SEARCH_VECTOR_DDL,
+    SEARCH_VECTOR_COLUMN,
+    SEARCH_VECTOR_INDEX,
+    SQLITE_FTS_DDL,
+    SQLITE_FTS_DROP,
+    SQLITE_FTS_REBUILD,
+)
+from app.db.online_migrations import create_index_concurrently, drop_index_concurrently, run_with_lock_timeout
+
+# Revision identifiers, used by Alembic.
+revision = "0005_add_message_full_text_search"
+down_revision = "0004_add_listing_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Postgres: add the generated tsvector column, then build its GIN index
+    without blocking writes. Adding a stored generated column rewrites the
+    table under its lock, so run this off-peak on large message tables.
+    SQLite: create the FTS5 table and triggers and index existing rows.
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+        op.execute(SQLITE_FTS_REBUILD)
+        return
+
+    run_with_lock_timeout(lambda: op.execute(POSTGRES_SEARCH_VECTOR_DDL))
+    create_index_concurrently(SEARCH_VECTOR_INDEX, "messages", [sa.column(SEARCH_VECTOR_COLUMN)], using="gin")
+
+
+def downgrade() -> None:
+    """Drop the search index and its column, or the FTS5 table and triggers."""
+    if op.get_bind().dialect.name != "postgresql":
+        for statement in SQLITE_FTS_DROP:
+            op.execute(statement)
+        return
+
+    drop_index_concurrently(SEARCH_VECTOR_INDEX, "messages")
+    run_with_lock_timeout(lambda: op.drop_column("messages", SEARCH_VECTOR_COLUMN))
@@ -0,0 +1,33 @@
+"""Add trigram index for fuzzy map search
+
+Revision ID: 0006_add_map_trigram_search
+Revises: 0005_add_message_full_text_search
+Create Date: 2026-10-18 12:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db.fuzzy_search import MAP_SEARCH_INDEX, MAP_SEARCH_TEXT, PG_TRGM_EXTENSION_DDL
+from app.db.online_migrations import create_index_concurrently, drop_index_concurrently
+
+# Revision identifiers, used by Alembic.
+revision = "0006_add_map_trigram_search"
+down_revision = "0005_add_message_full_text_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Enable pg_trgm and build the trigram index without blocking writes; other backends search without an index."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(PG_TRGM_EXTENSION_DDL)
+    create_index_concurrently(MAP_SEARCH_INDEX, "maps", [sa.text(f"{MAP_SEARCH_TEXT} gin_trgm_ops")], using="gin")
+
+
+def downgrade() -> None:
+    """Drop the trigram index; the extension is left installed for other users of it."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    drop_index_concurrently(MAP_SEARCH_INDEX, "maps")
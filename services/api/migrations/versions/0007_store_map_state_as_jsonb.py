@@ -0,0 +1,39 @@
+"""Store map state as JSONB with a containment index
+
+Revision ID: 0007_store_map_state_as_jsonb
+Revises: 0006_add_map_trigram_search
+Create Date: 2026-10-18 12:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db.json_state import MAP_STATE_INDEX
+from app.db.online_migrations import create_index_concurrently, drop_index_concurrently, run_with_lock_timeout
+
+# Revision identifiers, used by Alembic.
+revision = "0007_store_map_state_as_jsonb"
+down_revision = "0006_add_map_trigram_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Postgres: convert state to JSONB, then build its jsonb_path_ops GIN index
+    without blocking writes. The type change rewrites the table under its
+    lock, so run this off-peak on large map tables; it fails, changing
+    nothing, if any stored state is not valid JSON. Other backends keep TEXT.
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    run_with_lock_timeout(lambda: op.execute("ALTER TABLE maps ALTER COLUMN state TYPE jsonb USING state::jsonb"))
+    create_index_concurrently(MAP_STATE_INDEX, "maps", [sa.text("state jsonb_path_ops")], using="gin")
+
+
+def downgrade() -> None:
+    """Drop the containment index and store state as TEXT again."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    drop_index_concurrently(MAP_STATE_INDEX, "maps")
+    run_with_lock_timeout(lambda: op.execute("ALTER TABLE maps ALTER COLUMN state TYPE text USING state::text"))
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Sequence
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, Query, Request
+from pydantic import BaseModel, ValidationError
+from starlette import status
+
+from app.auth.check_roles import owner_scope
+from app.auth.oidc_user import OIDCUser
+from app.core.settings import Settings, get_settings
+from app.schemas.batch import BatchItem, BatchStatus
+
+M = TypeVar("M", bound=BaseModel)
+
+# Content types read line by line as newline-delimited JSON
+NDJSON_MEDIA_TYPES: tuple[str, ...] = ("application/x-ndjson", "application/jsonl")
+
+
+def batch_ids(
+    ids: list[int] = Query(..., min_length=1, description="IDs to act on; repeat the parameter, capped by BATCH_IDS_MAX"),
+) -> list[int]:
+    """Dependency parsing the ID list of a batch request, without duplicates and in request order."""
+    settings: Settings = get_settings()
+    unique: list[int] = list(dict.fromkeys(ids))
+    if len(unique) > settings.batch_ids_max:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.batch_ids_max} IDs per request",
+        )
+    return unique
+
+
+def batch_items(ids: Sequence[int], rows: Sequence[Any], user: OIDCUser, schema: type[M]) -> list[BatchItem[M]]:
+    """
+    Pair each requested ID with its row in request order. Rows the user may
+    not read (owner or admin only) are reported as forbidden, not returned.
+    """
+    owner: str | None = owner_scope(user)
+    items: list[BatchItem[M]] = []
+    for id, row in zip(ids, rows):
+        if row is None:
+            items.append(BatchItem[schema](id=id, status=BatchStatus.NOT_FOUND))
+        elif owner is not None and row.user_id != owner:
+            items.append(BatchItem[schema](id=id, status=BatchStatus.FORBIDDEN))
+        else:
+            row.user = user
+            items.append(BatchItem[schema](id=id, status=BatchStatus.OK, item=schema.model_validate(row)))
+    return items
+
+
+def bulk_body(model: type[BaseModel]) -> dict[str, Any]:
+    """OpenAPI request body of a bulk endpoint, which reads the body itself."""
+    schema: dict[str, Any] = model.model_json_schema()
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": schema}},
+                NDJSON_MEDIA_TYPES[0]: {"schema": schema},
+            },
+        }
+    }
+
+
+async def read_bulk(request: Request, model: type[M]) -> AsyncIterator[tuple[int, M | ValidationError]]:
+    """
+    Yield (index, item) for each item of a bulk body: a JSON array, or NDJSON
+    streamed line by line without buffering the whole body. Items that fail
+    validation yield their ValidationError so they can be reported one by one.
+    """
+    media_type: str = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type in NDJSON_MEDIA_TYPES:
+        index: int = 0
+        pending: bytes = b""
+        async for chunk in request.stream():
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield index, _validate_json(model, line)
+                    index += 1
+        if pending.strip():
+            yield index, _validate_json(model, pending)
+        return
+
+    try:
+        body: Any = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Request body is not valid JSON")
+    if not isinstance(body, list):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Expected a JSON array")
+    for index, item in enumerate(body):
+        try:
+            yield index, model.model_validate(item)
+        except ValidationError as err:
+            yield index, err
+
+
+def _validate_json(model: type[M], raw: bytes) -> M | ValidationError:
+    """Parse and validate one NDJSON line, returning the error instead of raising it."""
+    try:
+        return model.model_validate_json(raw)
+    except ValidationError as err:
+        return err
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, Callable
+from time import perf_counter
+from typing import Any
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, SessionTransaction
+from starlette import status
+from starlette.types import Message, Receive
+from structlog import BoundLogger
+
+from app.core.logging import get_logger
+from app.core.settings import get_settings
+from app.db.sharding import ShardedUnitOfWork
+from app.db.unit_of_work import UnitOfWork, get_sharded_unit_of_work, get_unit_of_work
+
+log: BoundLogger = get_logger()
+
+# Postgres SQLSTATE raised when statement_timeout cancels a query
+QUERY_CANCELED_SQLSTATE: str = "57014"
+
+
+def apply_statement_timeout(session: Session, timeout_ms: int) -> None:
+    """Set a Postgres statement_timeout on every transaction the session begins."""
+
+    @event.listens_for(session, "after_begin")
+    def _set_statement_timeout(  # pyright: ignore[reportUnusedFunction]
+        session: Session,
+        transaction: SessionTransaction,
+        connection: Connection,
+    ) -> None:
+        if connection.dialect.name == "postgresql":
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+def _watch_disconnect(request: Request, task: asyncio.Task[Any]) -> asyncio.Task[None]:
+    """
+    Cancel the request task (and its in-flight query) once the client goes away.
+    The watcher becomes the only reader of the ASGI receive channel and relays
+    every other message to the request, so handlers that read the body
+    themselves, like streamed bulk uploads, still receive all of it.
+    """
+    receive: Receive = request.receive
+    relay: asyncio.Queue[Message] = asyncio.Queue(maxsize=1)
+
+    async def watch() -> None:
+        while True:
+            message: Message = await receive()
+            if message["type"] == "http.disconnect":
+                task.cancel()
+                return
+            # Bounded, so a slow reader holds back the client instead of buffering the body
+            await relay.put(message)
+
+    request._receive = relay.get  # pyright: ignore[reportPrivateUsage]
+    return asyncio.create_task(watch())
+
+
+def is_budget_error(err: BaseException) -> bool:
+    """Whether a database error means the request's budget ran out, for query_budget() to report."""
+    if isinstance(err, exc.TimeoutError):
+        return True
+    return isinstance(err, exc.DBAPIError) and getattr(err.orig, "sqlstate", None) == QUERY_CANCELED_SQLSTATE
+
+
+def _route_name(request: Request) -> str:
+    """Best-effort name of the route serving the request."""
+    route: Any = request.scope.get("route")
+    return str(getattr(route, "name", None) or request.url.path)
+
+
+def _budget_error(status_code: int, error: str, route: str, budget: float, elapsed: float) -> HTTPException:
+    """Build a structured HTTP error for an exhausted budget."""
+    return HTTPException(
+        status_code=status_code,
+        detail={
+            "error": error,
+            "route": route,
+            "budget_ms": round(budget * 1000),
+            "elapsed_ms": round(elapsed * 1000),
+        },
+    )
+
+
+def query_budget(seconds: float | Callable[[], float] | None = None) -> Callable[..., AsyncGenerator[None, None]]:
+    """
+    Dependency factory enforcing a time budget on a route's database work:
+    seconds, a callable read per request (e.g. from settings), or by default
+    the query_budget_seconds database setting. The budget is set as the
+    statement_timeout of every transaction, the handler is cancelled
+    (cancelling the server-side query) when the budget runs out or the client
+    disconnects, and exhaustion is reported as a structured 504 (or 503 when
+    no pooled connection became available in time).
+    """
+
+    async def dependency(
+        request: Request,
+        uow: UnitOfWork = Depends(get_unit_of_work),
+        shards: ShardedUnitOfWork | None = Depends(get_sharded_unit_of_work),
+    ) -> AsyncGenerator[None, None]:
+        budget: float = get_settings().database.query_budget_seconds if seconds is None else (
+            seconds() if callable(seconds) else seconds
+        )
+        timeout_ms: int = round(budget * 1000)
+        apply_statement_timeout(uow.session.sync_session, timeout_ms)
+        if shards is not None:
+            shards.on_session(lambda session: apply_statement_timeout(session.sync_session, timeout_ms))
+
+        task: asyncio.Task[Any] | None = asyncio.current_task()
+        watcher: asyncio.Task[None] | None = _watch_disconnect(request, task) if task is not None else None
+        start: float = perf_counter()
+        try:
+            async with asyncio.timeout(budget):
+                yield
+        except TimeoutError:
+            elapsed: float = perf_counter() - start
+            route: str = _route_name(request)
+            log.warning("⏱️ Query budget exceeded", route=route, budget=budget, elapsed=elapsed)
+            raise _budget_error(status.HTTP_504_GATEWAY_TIMEOUT, "query_budget_exceeded", route, budget, elapsed)
+        except exc.TimeoutError:
+            elapsed = perf_counter() - start
+            route = _route_name(request)
+            log.warning("⏱️ Connection pool exhausted within budget", route=route, budget=budget, elapsed=elapsed)
+            raise _budget_error(status.HTTP_503_SERVICE_UNAVAILABLE, "database_unavailable", route, budget, elapsed)
+        except exc.DBAPIError as err:
+            if not is_budget_error(err):
+                raise
+            elapsed = perf_counter() - start
+            route = _route_name(request)
+            log.warning("⏱️ Statement timeout hit", route=route, budget=budget, elapsed=elapsed)
+            raise _budget_error(status.HTTP_504_GATEWAY_TIMEOUT, "statement_timeout", route, budget, elapsed)
+        except asyncio.CancelledError:
+            log.warning(
+                "🔌 Client disconnected, query cancelled",
+                route=_route_name(request),
+                elapsed=perf_counter() - start,
+            )
+            raise
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+
+    return dependency
@@ -62,6 +62,7 @@ def add_middlewares(app: FastAPI) -> None:
         allow_credentials=settings.cors_allow_credentials,
         allow_methods=settings.cors_allow_methods_list,
         allow_headers=settings.cors_allow_headers_list,
+        expose_headers=["Link", "X-Next-Cursor"],
         max_age=600,
     )
 
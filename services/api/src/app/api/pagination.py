@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import HTTPException, Query, Request, Response
+from starlette import status
+
+from app.core.settings import Settings, get_settings
+from app.domain.pagination import Cursor, Page, RankCursor, RankedPage
+
+# Response header carrying the opaque cursor of the next page
+NEXT_CURSOR_HEADER: str = "X-Next-Cursor"
+
+
+@dataclass(frozen=True)
+class PageParams:
+    """Validated limit and cursor of a listing request."""
+
+    limit: int
+    after: Cursor | None
+
+
+def page_params(
+    limit: int | None = Query(None, ge=1, description="Maximum rows to return; capped by PAGE_SIZE_MAX"),
+    cursor: str | None = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+) -> PageParams:
+    """Dependency parsing keyset pagination query parameters."""
+    settings: Settings = get_settings()
+    try:
+        after: Cursor | None = Cursor.decode(cursor) if cursor else None
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err))
+    return PageParams(limit=min(limit or settings.page_size_default, settings.page_size_max), after=after)
+
+
+@dataclass(frozen=True)
+class SearchParams:
+    """Validated query, limit and cursor of a ranked search request."""
+
+    q: str
+    limit: int
+    after: RankCursor | None
+
+
+def search_params(
+    q: str = Query(..., min_length=1, max_length=256, description="Words to search for; every word must match"),
+    limit: int | None = Query(None, ge=1, description="Maximum rows to return; capped by PAGE_SIZE_MAX"),
+    cursor: str | None = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+) -> SearchParams:
+    """Dependency parsing search query parameters with a rank keyset cursor."""
+    settings: Settings = get_settings()
+    try:
+        after: RankCursor | None = RankCursor.decode(cursor) if cursor else None
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err))
+    return SearchParams(q=q, limit=min(limit or settings.page_size_default, settings.page_size_max), after=after)
+
+
+def link_next_page(request: Request, response: Response, page: Page[Any] | RankedPage[Any]) -> None:
+    """Advertise the next page in the Link and X-Next-Cursor headers; the body stays a plain list."""
+    if page.next is None:
+        return
+    token: str = page.next.encode()
+    response.headers[NEXT_CURSOR_HEADER] = token
+    response.headers["Link"] = f'<{request.url.include_query_params(cursor=token)}>; rel="next"'
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response, status
+from structlog import BoundLogger
+
+from app.api.budget import query_budget
+from app.api.routes.maps import MAPS_API_PREFIX, get_map_service
+from app.auth.oidc_user import OIDCUser, map_oidc_user
+from app.core.logging import get_logger
+from app.core.settings import DatasetSettings, get_settings
+from app.domain.datasets.models import BoundingBox, DatasetInfo
+from app.domain.maps.models import MapDomain
+from app.schemas.datasets import DATASET_NAME_PATTERN, DatasetInfoRead, DatasetSliceRead, DatasetWrite
+from app.services.dataset_service import DatasetService
+from app.services.maps_service import MapService
+
+log: BoundLogger = get_logger()
+
+router = APIRouter(
+    prefix=f"{MAPS_API_PREFIX}/{{map_id}}/datasets",
+    tags=["Datasets"],
+    dependencies=[Depends(query_budget())],
+)
+
+
+def get_dataset_service() -> DatasetService:
+    """Construct the DatasetService on TileDB storage, which is an optional dependency."""
+    settings: DatasetSettings = get_settings().datasets
+    try:
+        from app.infrastructure.datasets.tiledb_repository import TileDBDatasetRepository
+    except ImportError as err:
+        log.error("❌ TileDB is not installed; dataset storage is unavailable", error=str(err))
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Dataset storage is unavailable")
+    return DatasetService(TileDBDatasetRepository(settings.uri, settings.tile_rows), settings.read_max_rows)
+
+
+async def get_owned_map(
+    map_id: int,
+    user: OIDCUser = Depends(map_oidc_user),
+    maps: MapService = Depends(get_map_service),
+) -> MapDomain:
+    """Resolve the map a dataset belongs to (must own or be admin)."""
+    map_: MapDomain | None = await maps.get(map_id)
+    if not map_:
+        raise HTTPException(status_code=404, detail="Map not found")
+    if map_.user_id != user.sub and "admin" not in (user.roles or []):
+        raise HTTPException(status_code=403, detail="Not authorized to access this map's datasets")
+    return map_
+
+
+DatasetName = Path(..., pattern=DATASET_NAME_PATTERN)
+
+
+@router.put("/{name}", response_model=DatasetInfoRead)
+async def write_dataset(
+    payload: DatasetWrite,
+    name: str = DatasetName,
+    map_: MapDomain = Depends(get_owned_map),
+    service: DatasetService = Depends(get_dataset_service),
+) -> DatasetInfoRead:
+    """Store a dataset for a map, replacing any existing one with the same name."""
+    try:
+        info: DatasetInfo = await service.write(map_.id, name, payload)
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(err))
+    log.info("🗃️ Stored dataset", map_id=map_.id, dataset=name, rows=info.rows)
+    return DatasetInfoRead.model_validate(info)
+
+
+@router.get("/{name}", response_model=DatasetInfoRead)
+async def get_dataset_info(
+    name: str = DatasetName,
+    map_: MapDomain = Depends(get_owned_map),
+    service: DatasetService = Depends(get_dataset_service),
+) -> DatasetInfoRead:
+    """Describe a dataset."""
+    info: DatasetInfo | None = await service.info(map_.id, name)
+    if not info:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    return DatasetInfoRead.model_validate(info)
+
+
+@router.get("/{name}/rows", response_model=DatasetSliceRead)
+async def read_dataset_rows(
+    name: str = DatasetName,
+    start: int = Query(0, ge=0),
+    stop: int | None = Query(None, ge=0, description="Exclusive end row; defaults to the read limit"),
+    columns: list[str] | None = Query(None),
+    map_: MapDomain = Depends(get_owned_map),
+    service: DatasetService = Depends(get_dataset_service),
+) -> DatasetSliceRead:
+    """Read a range of rows."""
+    try:
+        data: DatasetSliceRead | None = await service.read_rows(map_.id, name, start, stop, columns)
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(err))
+    if data is None:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    return data
+
+
+@router.get("/{name}/bbox", response_model=DatasetSliceRead)
+async def read_dataset_bbox(
+    min_x: float,
+    min_y: float,
+    max_x: float,
+    max_y: float,
+    name: str = DatasetName,
+    columns: list[str] | None = Query(None),
+    map_: MapDomain = Depends(get_owned_map),
+    service: DatasetService = Depends(get_dataset_service),
+) -> DatasetSliceRead:
+    """Read the rows inside a bounding box."""
+    try:
+        bbox = BoundingBox(min_x=min_x, min_y=min_y, max_x=max_x, max_y=max_y)
+        data: DatasetSliceRead | None = await service.read_bbox(map_.id, name, bbox, columns)
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(err))
+    if data is None:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    return data
+
+
+@router.delete("/{name}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_dataset(
+    name: str = DatasetName,
+    map_: MapDomain = Depends(get_owned_map),
+    service: DatasetService = Depends(get_dataset_service),
+) -> Response:
+    """Delete a dataset."""
+    if not await service.delete(map_.id, name):
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    log.info("🗑️ Deleted dataset", map_id=map_.id, dataset=name)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
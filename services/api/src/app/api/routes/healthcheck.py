@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends
 from structlog import BoundLogger
 
+from app.auth.check_roles import require_roles
 from app.core.logging import get_logger
-from app.schemas.health.response import HealthCheckResponse
+from app.db.pool import get_pool_stats
+from app.db.session import engine
+from app.schemas.health.response import HealthCheckResponse, PoolStatsResponse
 from app.services.health_service import HealthCheckService
 from app.infrastructure.health.repository import DefaultHealthCheckRepository
 from app.domain.health.models import HealthCheck
@@ -24,3 +27,12 @@ async def healthcheck(
     result: HealthCheck = await service.run()
     log.info("Health check result", result=result)
     return result.to_response()
+
+@router.get(
+    "/health/pool",
+    response_model=PoolStatsResponse,
+    dependencies=[Depends(require_roles(["admin"]))],
+)
+async def pool_stats() -> PoolStatsResponse:
+    """Endpoint to report connection pool checkout-wait and connection-age statistics (admins only)."""
+    return PoolStatsResponse.model_validate(get_pool_stats(engine))
@@ -1,19 +1,32 @@
 from __future__ import annotations
-from typing import Any, Sequence
+import json
+from typing import Any, Literal, Sequence
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from structlog import BoundLogger
 from starlette import status
 
-from app.auth.check_roles import require_roles
+from app.api.batch import batch_ids, batch_items
+from app.api.budget import is_budget_error, query_budget
+from app.api.pagination import PageParams, SearchParams, link_next_page, page_params, search_params
+from app.auth.check_roles import owner_scope, require_roles
 from app.auth.oidc_user import OIDCUser, map_oidc_user
-from app.db.session import get_async_session
-from app.domain.maps.models import MapDomain
-from app.schemas.maps import MapRead, MapSave
+from app.db.sharding import ShardedUnitOfWork
+from app.db.unit_of_work import UnitOfWork, get_sharded_unit_of_work, get_unit_of_work
+from app.domain.errors import NotOwnerError
+from app.domain.maps.filters import StateFilter
+from app.domain.maps.models import MapDomain, MapFragmentsDomain, MapSummaryDomain
+from app.domain.maps.paths import StatePath
+from app.domain.pagination import Page, RankedPage
+from app.schemas.batch import BatchItem
+from app.schemas.maps import MapRead, MapSave, MapSearchHit, MapStateFragments, MapSummary
 from app.services.maps_service import MapService
+from app.core.settings import get_settings
 from app.infrastructure.maps.dao import MapDAO
+from app.infrastructure.maps.memory_repository import InMemoryMapRepository, WriteThroughMapRepository
+from app.infrastructure.maps.sharded_dao import ShardedMapDAO
 from app.infrastructure.maps.repository import SqlAlchemyMapRepository
+from app.infrastructure.memory_store import InMemoryStore
 from app.core.logging import get_logger
 
 log: BoundLogger = get_logger()
@@ -22,16 +35,124 @@
 MAPS_API_PREFIX: str = "/maps"
 
 # Create the API router for maps
-router = APIRouter(prefix=MAPS_API_PREFIX, tags=["Maps"])
+router = APIRouter(prefix=MAPS_API_PREFIX, tags=["Maps"], dependencies=[Depends(query_budget())])
+
+# Process-wide map store behind the in-memory and write-through repositories
+map_store: InMemoryStore[MapDomain] = InMemoryStore()
 
 def get_map_service(
-    session: AsyncSession = Depends(get_async_session),
+    uow: UnitOfWork = Depends(get_unit_of_work),
+    shards: ShardedUnitOfWork | None = Depends(get_sharded_unit_of_work),
 ) -> MapService:
-    """Dependency injection for MapService."""
-    dao = MapDAO(session)
+    """Dependency injection for MapService, sharing the request's unit of work."""
+    mode: str = get_settings().database.repository
+    if mode == "memory":
+        return MapService(InMemoryMapRepository(map_store))
+
+    dao: MapDAO | ShardedMapDAO = ShardedMapDAO(shards) if shards else MapDAO(uow.session)
     repo = SqlAlchemyMapRepository(dao)
+    if mode == "write_through":
+        # Writes reach the shared store only once the transaction holding them commits
+        tx: UnitOfWork | ShardedUnitOfWork = shards if shards else uow
+        return MapService(WriteThroughMapRepository(repo, map_store, tx.on_commit, tx.on_rollback))
     return MapService(repo)
 
+# Most state paths one request may read
+MAX_STATE_PATHS: int = 16
+
+# Listing representation: full maps, or summaries whose state column is never read
+ListView = Literal["full", "summary"]
+
+
+def list_view(
+    view: ListView = Query("full", description="'summary' lists maps without their state"),
+) -> ListView:
+    """Dependency parsing the listing representation."""
+    return view
+
+
+def state_filter(
+    layer_type: str | None = Query(None, max_length=128, description="Only maps with a layer of this type (admin)"),
+    dataset_id: str | None = Query(None, max_length=256, description="Only maps using this dataset (admin)"),
+    config: str | None = Query(
+        None, max_length=4096, description="Only maps whose config contains this JSON object (admin)"
+    ),
+) -> StateFilter:
+    """Dependency parsing the state filters; config must be a JSON object."""
+    fragment: Any = None
+    if config is not None:
+        try:
+            fragment = json.loads(config)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="config must be a JSON object")
+        if not isinstance(fragment, dict):
+            raise HTTPException(status_code=400, detail="config must be a JSON object")
+    return StateFilter(layer_type=layer_type, dataset_id=dataset_id, config=fragment)
+
+
+def state_paths(
+    path: list[str] = Query(
+        ...,
+        min_length=1,
+        max_length=MAX_STATE_PATHS,
+        description="JSON paths into the state, repeatable: dotted keys and [n] indexes, e.g. config.visState.layers[0]",
+    ),
+) -> list[StatePath]:
+    """Dependency parsing the requested state paths."""
+    try:
+        return [StatePath.parse(p) for p in path]
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err))
+
+
+async def render_listing(
+    request: Request,
+    response: Response,
+    service: MapService,
+    owner: str | None,
+    view: ListView,
+    paging: PageParams,
+    user: OIDCUser,
+    state: StateFilter = StateFilter(),
+) -> list[MapRead] | list[MapSummary]:
+    """
+    Read one listing page of a user's maps, or of all maps when owner is None, in the requested view.
+    State filters are evaluated in the database and restricted to admins.
+    """
+    if state and "admin" not in (user.roles or []):
+        raise HTTPException(status_code=403, detail="State filters require the admin role")
+
+    if state:
+        matching: Page[MapSummaryDomain] = await service.page_matching(state, owner, paging.limit, paging.after)
+        link_next_page(request, response, matching)
+        if view == "summary":
+            for summary in matching.items:
+                summary.user = user
+            return [MapSummary.model_validate(s) for s in matching.items]
+        # Full view: fetch the matching page's states with one more query
+        full: Sequence[MapDomain | None] = await service.get_many([s.id for s in matching.items])
+        found: list[MapDomain] = [m for m in full if m is not None]
+        for map in found:
+            map.user = user
+        return [MapRead.model_validate(m) for m in found]
+
+    if view == "summary":
+        summaries: Page[MapSummaryDomain] = await service.page_summaries(owner, paging.limit, paging.after)
+        link_next_page(request, response, summaries)
+        for summary in summaries.items:
+            summary.user = user
+        return [MapSummary.model_validate(s) for s in summaries.items]
+
+    page: Page[MapDomain] = await (
+        service.page(paging.limit, paging.after)
+        if owner is None
+        else service.page_by_user(owner, paging.limit, paging.after)
+    )
+    link_next_page(request, response, page)
+    for map in page.items:
+        map.user = user
+    return [MapRead.model_validate(m) for m in page.items]
+
 from fastapi.responses import JSONResponse
 
 @router.post("/", response_model=MapRead)
@@ -43,40 +164,22 @@ async def save_map(
     log.info("📦 Received save_map upsert request", map_id=payload.id, user_id=user.sub)
 
     try:
-        existing: MapDomain | None = await service.get(payload.id)
-
-        if existing:
-            log.info("🔁 Map exists, attempting update", map_id=payload.id, owner=existing.user_id)
-
-            if existing.user_id != user.sub:
-                log.warning("🚫 Unauthorized map update attempt", user_id=user.sub, owner_id=existing.user_id)
-                raise HTTPException(status_code=403, detail="Not authorized to update this map")
-
-            updated = await service.update(payload.id, payload)
-            if not updated:
-                log.error("❌ Update failed — service returned None", map_id=payload.id)
-                raise HTTPException(status_code=500, detail="Failed to update map")
-
-            updated.user = user
-            log.info("✅ Map updated successfully", map_id=updated.id)
-            return JSONResponse(
-                status_code=status.HTTP_200_OK,
-                content=MapRead.model_validate(updated).model_dump(mode="json"),
-            )
-
-        # Create new map with provided UUID
-        log.info("📄 Map not found — creating new", map_id=payload.id)
-
-        created: MapDomain = await service.create(user.sub, payload)
-        if not created:
-            log.error("❌ Map creation failed — service returned None", payload=payload.model_dump())
-            raise HTTPException(status_code=500, detail="Failed to create map")
-
-        created.user = user
-        log.info("🎉 Map created successfully", map_id=created.id, user_id=user.sub)
+        # One INSERT ... ON CONFLICT DO UPDATE; the ownership check is part of the statement
+        saved: tuple[MapDomain, bool] | None = await service.save(user.sub, payload)
+
+        if saved is None:
+            log.warning("🚫 Unauthorized map update attempt", user_id=user.sub, map_id=payload.id)
+            raise HTTPException(status_code=403, detail="Not authorized to update this map")
+
+        map_, created = saved
+        map_.user = user
+        if created:
+            log.info("🎉 Map created successfully", map_id=map_.id, user_id=user.sub)
+        else:
+            log.info("✅ Map updated successfully", map_id=map_.id)
         return JSONResponse(
-            status_code=status.HTTP_201_CREATED,
-            content=MapRead.model_validate(created).model_dump(mode="json"),
+            status_code=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+            content=MapRead.model_validate(map_).model_dump(mode="json"),
         )
 
     except HTTPException as http_err:
@@ -84,64 +187,122 @@ async def save_map(
         raise http_err
 
     except Exception as unhandled:
+        if is_budget_error(unhandled):
+            raise  # query_budget reports it as a structured 503/504
         log.exception("🔥 Unhandled error in save_map", error=str(unhandled), map_id=payload.id)
         raise HTTPException(
             status_code=500,
             detail="An unexpected error occurred while saving the map.",
         )
 
-@router.get("/", response_model=list[MapRead])
+@router.get("/", response_model=list[MapRead] | list[MapSummary])
 async def list_all_maps(
+    request: Request,
+    response: Response,
+    paging: PageParams = Depends(page_params),
+    view: ListView = Depends(list_view),
+    state: StateFilter = Depends(state_filter),
     user: OIDCUser = Depends(require_roles([])),
     service: MapService = Depends(get_map_service),
-) -> list[MapRead]:
-    """List all maps."""
-    log.info("📥 Received list_all_maps request", user_id=user.sub)
+) -> list[MapRead] | list[MapSummary]:
+    """List all maps, newest first, one page at a time."""
+    log.info("📥 Received list_all_maps request", user_id=user.sub, view=view)
 
     try:
-        maps: Sequence[MapDomain] = await service.list()
+        maps: list[MapRead] | list[MapSummary] = await render_listing(
+            request, response, service, None, view, paging, user, state
+        )
 
         if not maps:
             log.info("📭 No maps found", user_id=user.sub)
 
-        for map in maps:
-            map.user = user
-
-        response: list[MapRead] = [MapRead.model_validate(m) for m in maps]
-        log.info("📦 Returning map list", count=len(response))
-        return response
+        log.info("📦 Returning map list", count=len(maps))
+        return maps
 
     except HTTPException as http_err:
         log.warning("⚠️ HTTPException during map listing", status=http_err.status_code, detail=http_err.detail)
         raise http_err
 
     except Exception as err:
+        if is_budget_error(err):
+            raise  # query_budget reports it as a structured 503/504
         log.exception("🔥 Unhandled error during list_all_maps", error=str(err))
         raise HTTPException(status_code=500, detail="Failed to list maps due to unexpected error.")
 
-@router.get("/me", response_model=list[MapRead])
+@router.get("/me", response_model=list[MapRead] | list[MapSummary])
 async def list_my_maps(
+    request: Request,
+    response: Response,
+    paging: PageParams = Depends(page_params),
+    view: ListView = Depends(list_view),
+    state: StateFilter = Depends(state_filter),
     user: OIDCUser = Depends(map_oidc_user),
     service: MapService = Depends(get_map_service),
-) -> list[MapRead]:
-    """List all maps owned by the current user."""
-    maps: Sequence[MapDomain] = await service.list_by_user(user.sub)
-    for map in maps:
-        map.user = user
-    return [MapRead.model_validate(map) for map in maps]
+) -> list[MapRead] | list[MapSummary]:
+    """List the maps owned by the current user, newest first, one page at a time."""
+    return await render_listing(request, response, service, user.sub, view, paging, user, state)
 
 
-@router.get("/by/{user_id}", response_model=list[MapRead])
+@router.get("/by/{user_id}", response_model=list[MapRead] | list[MapSummary])
 async def list_maps_by_user_id(
     user_id: str,
+    request: Request,
+    response: Response,
+    paging: PageParams = Depends(page_params),
+    view: ListView = Depends(list_view),
+    state: StateFilter = Depends(state_filter),
     user: OIDCUser = Depends(require_roles([])),
     service: MapService = Depends(get_map_service),
+) -> list[MapRead] | list[MapSummary]:
+    """List the maps owned by a specific user, newest first, one page at a time."""
+    return await render_listing(request, response, service, user_id, view, paging, user, state)
+
+
+@router.get("/search", response_model=list[MapSearchHit])
+async def search_maps(
+    request: Request,
+    response: Response,
+    search: SearchParams = Depends(search_params),
+    user: OIDCUser = Depends(map_oidc_user),
+    service: MapService = Depends(get_map_service),
+) -> list[MapSearchHit]:
+    """
+    Typo-tolerant search over map names and descriptions, best match first, one page at a time.
+    Searches the caller's maps, or all maps for admins; returns summaries without the state.
+    """
+    page: RankedPage[MapSummaryDomain] = await service.search(search.q, owner_scope(user), search.limit, search.after)
+    link_next_page(request, response, page)
+    log.info("Searched maps", hits=len(page.items), user_id=user.sub)
+    hits: list[MapSearchHit] = []
+    for hit in page.items:
+        hit.item.user = user
+        hits.append(MapSearchHit.model_validate(hit.item.model_dump() | {"rank": hit.rank}))
+    return hits
+
+
+@router.get("/batch", response_model=list[BatchItem[MapRead]])
+async def get_maps(
+    ids: list[int] = Depends(batch_ids),
+    user: OIDCUser = Depends(map_oidc_user),
+    service: MapService = Depends(get_map_service),
+) -> list[BatchItem[MapRead]]:
+    """Get several maps with one query — one entry per ID in request order, owner or admin only."""
+    rows: Sequence[MapDomain | None] = await service.get_many(ids)
+    return batch_items(ids, rows, user, MapRead)
+
+
+@router.delete("/batch", response_model=list[MapRead])
+async def delete_maps(
+    ids: list[int] = Depends(batch_ids),
+    user: OIDCUser = Depends(map_oidc_user),
+    service: MapService = Depends(get_map_service),
 ) -> list[MapRead]:
-    """List all maps owned by a specific user."""
-    maps: Sequence[MapDomain] = await service.list_by_user(user_id)
-    for map in maps:
+    """Delete several maps in one statement and return those deleted; other users' maps are skipped unless admin."""
+    removed: list[MapDomain] = await service.remove_many(ids, owner_scope(user))
+    log.info("Deleted maps", requested=len(ids), deleted=len(removed), user_id=user.sub)
+    for map in removed:
         map.user = user
-    return [MapRead.model_validate(map) for map in maps]
+    return [MapRead.model_validate(map) for map in removed]
 
 
 @router.get("/{map_id}", response_model=MapRead)
@@ -168,9 +329,35 @@ async def get_map(
         raise http_err
 
     except Exception as err:
+        if is_budget_error(err):
+            raise  # query_budget reports it as a structured 503/504
         log.exception("🔥 Unhandled error in get_map_by_id", error=str(err), map_id=map_id)
         raise HTTPException(status_code=500, detail="Failed to retrieve map due to unexpected error.")
 
+@router.get("/{map_id}/state", response_model=MapStateFragments)
+async def get_map_state_fragments(
+    map_id: int,
+    paths: list[StatePath] = Depends(state_paths),
+    user: OIDCUser = Depends(map_oidc_user),
+    service: MapService = Depends(get_map_service),
+) -> MapStateFragments:
+    """
+    Read parts of a map's state by JSON path (must own or be admin). Paths are
+    evaluated in the database, so only the fragments are read and serialized;
+    paths with no value in the state are left out.
+    """
+    found: MapFragmentsDomain | None = await service.get_fragments(map_id, paths)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Map not found")
+    owner: str | None = owner_scope(user)
+    if owner is not None and found.user_id != owner:
+        raise HTTPException(status_code=403, detail="Not authorized to read this map")
+
+    found.user = user
+    log.info("Read map state fragments", map_id=map_id, paths=len(paths), found=len(found.fragments))
+    return MapStateFragments.model_validate(found)
+
+
 @router.put("/{map_id}", response_model=MapRead)
 async def update_map(
     map_id: int,
@@ -178,17 +365,15 @@ async def update_map(
     user: OIDCUser = Depends(map_oidc_user),
     service: MapService = Depends(get_map_service),
 ) -> MapRead:
-    """Update a map (must own or be admin)."""
-    map: MapDomain | None = await service.get(map_id)
-    if not map:
-        raise HTTPException(status_code=404, detail="Map not found")
-
-    if map.user_id != user.sub and "admin" not in (user.roles or []):
+    """Update a map (must own or be admin) with one conditional UPDATE ... RETURNING."""
+    try:
+        updated: MapDomain | None = await service.update(map_id, payload, owner_scope(user))
+    except NotOwnerError:
         raise HTTPException(status_code=403, detail="Not authorized to update this map")
+    if not updated:
+        raise HTTPException(status_code=404, detail="Map not found")
 
-    updated: MapDomain | None = await service.update(map_id, payload)
-    if updated:
-        updated.user = user
+    updated.user = user
     return MapRead.model_validate(updated)
 
 
@@ -198,15 +383,14 @@ async def delete_map(
     user: OIDCUser = Depends(map_oidc_user),
     service: MapService = Depends(get_map_service),
 ) -> MapRead:
-    """Delete a map (must own or be admin)."""
-    map: MapDomain | None = await service.get(map_id)
+    """Delete a map (must own or be admin) with one DELETE ... RETURNING."""
+    try:
+        map: MapDomain | None = await service.remove(map_id, owner_scope(user))
+    except NotOwnerError:
+        raise HTTPException(status_code=403, detail="Not authorized to delete this map")
     if not map:
         raise HTTPException(status_code=404, detail="Map not found")
 
-    if map.user_id != user.sub and "admin" not in (user.roles or []):
-        raise HTTPException(status_code=403, detail="Not authorized to delete this map")
-
     map.user = user
-    await service.delete(map_id)
     log.info("Deleted map", map_id=map_id, user_id=user.sub)
     return MapRead.model_validate(map)
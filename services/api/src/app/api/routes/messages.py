@@ -2,28 +2,62 @@
 
 from typing import Sequence
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import ValidationError
 from structlog import BoundLogger
 
+from app.api.batch import batch_ids, batch_items, bulk_body, read_bulk
+from app.api.budget import query_budget
+from app.api.pagination import PageParams, SearchParams, link_next_page, page_params, search_params
+from app.auth.check_roles import owner_scope
 from app.auth.oidc_user import OIDCUser, map_oidc_user
-from app.db.session import get_async_session
+from app.db.sharding import ShardedUnitOfWork
+from app.db.unit_of_work import UnitOfWork, get_sharded_unit_of_work, get_unit_of_work
+from app.domain.errors import NotOwnerError
 from app.domain.messages.models import MessageDomain
-from app.schemas.messages import MessageCreate, MessageRead, MessageUpdate
+from app.domain.pagination import Page, RankedPage
+from app.schemas.batch import BatchItem
+from app.schemas.messages import MessageBulkError, MessageBulkRead, MessageCreate, MessageRead, MessageSearchHit, MessageUpdate
 from app.services.message_service import MessageService
+from app.core.settings import get_settings
+from app.infrastructure.memory_store import InMemoryStore
 from app.infrastructure.messages.dao import MessageDAO
+from app.infrastructure.messages.memory_repository import InMemoryMessageRepository, WriteThroughMessageRepository
+from app.infrastructure.messages.sharded_dao import ShardedMessageDAO
 from app.infrastructure.messages.repository import SqlAlchemyMessageRepository
 from app.core.logging import get_logger
 
 log: BoundLogger = get_logger()
 
-router = APIRouter(prefix="/messages", tags=["Messages"])
+router = APIRouter(prefix="/messages", tags=["Messages"], dependencies=[Depends(query_budget())])
 
+# Bulk writes stream their body inside the budget, so they get the longer bulk budget instead
+bulk_router = APIRouter(
+    prefix="/messages",
+    tags=["Messages"],
+    dependencies=[Depends(query_budget(lambda: get_settings().database.bulk_budget_seconds))],
+)
 
-def get_message_service(session: AsyncSession = Depends(get_async_session)) -> MessageService:
-    """Construct the MessageService with SQLAlchemy-backed repository."""
-    dao = MessageDAO(session)
+
+# Process-wide message store behind the in-memory and write-through repositories
+message_store: InMemoryStore[MessageDomain] = InMemoryStore()
+
+
+def get_message_service(
+    uow: UnitOfWork = Depends(get_unit_of_work),
+    shards: ShardedUnitOfWork | None = Depends(get_sharded_unit_of_work),
+) -> MessageService:
+    """Construct the MessageService with SQLAlchemy-backed repository on the request's unit of work."""
+    mode: str = get_settings().database.repository
+    if mode == "memory":
+        return MessageService(InMemoryMessageRepository(message_store))
+
+    dao: MessageDAO | ShardedMessageDAO = ShardedMessageDAO(shards) if shards else MessageDAO(uow.session)
     repo = SqlAlchemyMessageRepository(dao)
+    if mode == "write_through":
+        # Writes reach the shared store only once the transaction holding them commits
+        tx: UnitOfWork | ShardedUnitOfWork = shards if shards else uow
+        return MessageService(WriteThroughMessageRepository(repo, message_store, tx.on_commit, tx.on_rollback))
     return MessageService(repo)
 
 
@@ -40,6 +74,53 @@ async def create_message(
     return MessageRead.model_validate(created)
 
 
+@bulk_router.post(
+    "/bulk",
+    response_model=MessageBulkRead,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=bulk_body(MessageCreate),
+)
+async def create_messages(
+    request: Request,
+    user: OIDCUser = Depends(map_oidc_user),
+    service: MessageService = Depends(get_message_service),
+) -> MessageBulkRead:
+    """
+    Create many messages from a JSON array or an NDJSON stream of MessageCreate.
+    Valid items are inserted BULK_CHUNK_SIZE at a time with multi-row INSERT ... RETURNING;
+    invalid items are skipped and reported by position. Bodies of more than
+    BULK_ITEMS_MAX items are refused with 413 and nothing is created.
+    """
+    chunk_size: int = get_settings().bulk_chunk_size
+    items_max: int = get_settings().bulk_items_max
+    created: list[MessageDomain] = []
+    errors: list[MessageBulkError] = []
+    pending: list[MessageCreate] = []
+
+    async for index, item in read_bulk(request, MessageCreate):
+        if index >= items_max:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {items_max} items per bulk request",
+            )
+        if isinstance(item, ValidationError):
+            errors.append(
+                MessageBulkError(index=index, detail=item.errors(include_url=False, include_context=False, include_input=False))
+            )
+            continue
+        pending.append(item)
+        if len(pending) >= chunk_size:
+            created += await service.create_many(user.sub, pending)
+            pending.clear()
+    if pending:
+        created += await service.create_many(user.sub, pending)
+
+    for m in created:
+        m.user = user
+    log.info("Created messages in bulk", created=len(created), rejected=len(errors), user_id=user.sub)
+    return MessageBulkRead(created=[MessageRead.model_validate(m) for m in created], errors=errors)
+
+
 @router.get("/generate", response_model=MessageRead, status_code=status.HTTP_201_CREATED)
 async def generate_message(
     user: OIDCUser = Depends(map_oidc_user),
@@ -54,14 +135,19 @@ async def generate_message(
 
 @router.get("/", response_model=list[MessageRead])
 async def list_all_messages(
+    request: Request,
+    response: Response,
+    paging: PageParams = Depends(page_params),
     user: OIDCUser = Depends(map_oidc_user),
     service: MessageService = Depends(get_message_service),
 ) -> list[MessageRead]:
-    """List all messages — reserved for admin users."""
+    """List all messages newest first, one page at a time — reserved for admin users."""
     if "admin" not in (user.roles or []):
         raise HTTPException(status_code=403, detail="Admin privileges required")
 
-    messages: Sequence[MessageDomain] = await service.list()
+    page: Page[MessageDomain] = await service.page(paging.limit, paging.after)
+    link_next_page(request, response, page)
+    messages: Sequence[MessageDomain] = page.items
     log.info("Fetched all messages", count=len(messages), user_id=user.sub)
     for m in messages:
         m.user = user
@@ -70,11 +156,16 @@ async def list_all_messages(
 
 @router.get("/me", response_model=list[MessageRead])
 async def list_my_messages(
+    request: Request,
+    response: Response,
+    paging: PageParams = Depends(page_params),
     user: OIDCUser = Depends(map_oidc_user),
     service: MessageService = Depends(get_message_service),
 ) -> list[MessageRead]:
-    """List messages created by the current user."""
-    messages: Sequence[MessageDomain] = await service.list_by_user(user.sub)
+    """List messages created by the current user, newest first, one page at a time."""
+    page: Page[MessageDomain] = await service.page_by_user(user.sub, paging.limit, paging.after)
+    link_next_page(request, response, page)
+    messages: Sequence[MessageDomain] = page.items
     log.info("Fetched user's own messages", count=len(messages), user_id=user.sub)
     for m in messages:
         m.user = user
@@ -84,20 +175,72 @@ async def list_my_messages(
 @router.get("/by/{user_id}", response_model=list[MessageRead])
 async def list_messages_by_user_id(
     user_id: str,
+    request: Request,
+    response: Response,
+    paging: PageParams = Depends(page_params),
     user: OIDCUser = Depends(map_oidc_user),
     service: MessageService = Depends(get_message_service),
 ) -> list[MessageRead]:
-    """List messages by a specific user — admin only."""
+    """List messages by a specific user, newest first, one page at a time — admin only."""
     if "admin" not in (user.roles or []):
         raise HTTPException(status_code=403, detail="Admin privileges required")
 
-    messages: Sequence[MessageDomain] = await service.list_by_user(user_id)
+    page: Page[MessageDomain] = await service.page_by_user(user_id, paging.limit, paging.after)
+    link_next_page(request, response, page)
+    messages: Sequence[MessageDomain] = page.items
     log.info("Fetched messages for user", query_user_id=user_id, requester=user.sub)
     for m in messages:
         m.user = user
     return [MessageRead.model_validate(m) for m in messages]
 
 
+@router.get("/search", response_model=list[MessageSearchHit])
+async def search_messages(
+    request: Request,
+    response: Response,
+    search: SearchParams = Depends(search_params),
+    user: OIDCUser = Depends(map_oidc_user),
+    service: MessageService = Depends(get_message_service),
+) -> list[MessageSearchHit]:
+    """
+    Full-text search over message content, best match first, one page at a time.
+    Searches the caller's messages, or everyone's for admins.
+    """
+    page: RankedPage[MessageDomain] = await service.search(search.q, owner_scope(user), search.limit, search.after)
+    link_next_page(request, response, page)
+    log.info("Searched messages", hits=len(page.items), user_id=user.sub)
+    hits: list[MessageSearchHit] = []
+    for hit in page.items:
+        hit.item.user = user
+        hits.append(MessageSearchHit.model_validate(hit.item.model_dump() | {"rank": hit.rank}))
+    return hits
+
+
+@router.get("/batch", response_model=list[BatchItem[MessageRead]])
+async def get_messages(
+    ids: list[int] = Depends(batch_ids),
+    user: OIDCUser = Depends(map_oidc_user),
+    service: MessageService = Depends(get_message_service),
+) -> list[BatchItem[MessageRead]]:
+    """Get several messages with one query — one entry per ID in request order, owner or admin only."""
+    rows: Sequence[MessageDomain | None] = await service.get_many(ids)
+    return batch_items(ids, rows, user, MessageRead)
+
+
+@router.delete("/batch", response_model=list[MessageRead])
+async def delete_messages(
+    ids: list[int] = Depends(batch_ids),
+    user: OIDCUser = Depends(map_oidc_user),
+    service: MessageService = Depends(get_message_service),
+) -> list[MessageRead]:
+    """Delete several messages in one statement and return those deleted — other users' are skipped unless admin."""
+    removed: list[MessageDomain] = await service.remove_many(ids, owner_scope(user))
+    log.info("Deleted messages", requested=len(ids), deleted=len(removed), user_id=user.sub)
+    for m in removed:
+        m.user = user
+    return [MessageRead.model_validate(m) for m in removed]
+
+
 @router.get("/{message_id}", response_model=MessageRead)
 async def get_message(
     message_id: int,
@@ -123,17 +266,15 @@ async def update_message(
     user: OIDCUser = Depends(map_oidc_user),
     service: MessageService = Depends(get_message_service),
 ) -> MessageRead:
-    """Update a message — only owner or admin."""
-    msg: MessageDomain | None = await service.get(message_id)
-    if msg is None:
-        raise HTTPException(status_code=404, detail="Message not found")
-
-    if msg.user_id != user.sub and "admin" not in (user.roles or []):
+    """Update a message — only owner or admin — with one conditional UPDATE ... RETURNING."""
+    try:
+        updated: MessageDomain | None = await service.update(message_id, payload, owner_scope(user))
+    except NotOwnerError:
         raise HTTPException(status_code=403, detail="Not authorized to update this message")
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Message not found")
 
-    updated: MessageDomain | None = await service.update(message_id, payload)
-    if updated is not None:
-        updated.user = user
+    updated.user = user
     return MessageRead.model_validate(updated)
 
 
@@ -143,20 +284,15 @@ async def delete_message(
     user: OIDCUser = Depends(map_oidc_user),
     service: MessageService = Depends(get_message_service),
 ) -> MessageRead:
-    """Delete a message and return it — only owner or admin."""
-    msg: MessageDomain | None = await service.get(message_id)
+    """Delete a message and return it — only owner or admin — with one DELETE ... RETURNING."""
+    try:
+        msg: MessageDomain | None = await service.remove(message_id, owner_scope(user))
+    except NotOwnerError:
+        raise HTTPException(status_code=403, detail="Not authorized to delete this message")
     if msg is None:
         raise HTTPException(status_code=404, detail="Message not found")
 
-    if msg.user_id != user.sub and "admin" not in (user.roles or []):
-        raise HTTPException(status_code=403, detail="Not authorized to delete this message")
-
     # Inject user object for response schema
     msg.user = user
-
-    # Delete the message
-    await service.delete(message_id)
     log.info("Deleted message", message_id=message_id, user_id=user.sub)
-
-    # Return the deleted object
     return MessageRead.model_validate(msg)
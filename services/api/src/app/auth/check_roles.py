@@ -22,3 +22,11 @@ def dependency(user: OIDCUser = Depends(map_oidc_user)) -> OIDCUser:
         return user
 
     return dependency
+
+
+def owner_scope(user: OIDCUser) -> Optional[str]:
+    """
+    Owner that writes on behalf of the user are restricted to: the user
+    themselves, or None (any owner) for admins.
+    """
+    return None if "admin" in (user.roles or []) else user.sub
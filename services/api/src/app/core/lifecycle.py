@@ -3,6 +3,8 @@
 from structlog import BoundLogger
 from app.core.settings import get_settings
 from app.db.migrations import run_migrations_async
+from app.db.session import engine, replica_engines, shard_engines
+from app.db.warmup import WarmupReport, warm_up, warmup_connection_count
 
 async def startup(app: FastAPI, log: BoundLogger) -> None:
     settings = get_settings()
@@ -10,6 +12,21 @@ async def startup(app: FastAPI, log: BoundLogger) -> None:
     try:
         settings.print_settings_summary()
         await run_migrations_async()
+        for url in settings.database.shard_urls:
+            await run_migrations_async(url)
+
+        connections: int = warmup_connection_count(settings.database)
+        for target in (engine, *replica_engines, *shard_engines):
+            report: WarmupReport = await warm_up(target, connections)
+            log.info(
+                "🔥 Database warm-up complete",
+                database=target.url.render_as_string(hide_password=True),
+                connections=report.connections,
+                mappers_ms=round(report.mappers_seconds * 1000, 2),
+                connections_ms=round(report.connections_seconds * 1000, 2),
+                total_ms=round(report.total_seconds * 1000, 2),
+            )
+
         logging.getLogger("watchfiles").setLevel(logging.WARNING)
         log.info("✅ Application startup complete")
     except Exception as e:
@@ -18,4 +35,6 @@ async def startup(app: FastAPI, log: BoundLogger) -> None:
 
 async def shutdown(app: FastAPI, log: BoundLogger) -> None:
     log.info("🛑 Shutting down")
+    for target in (engine, *replica_engines, *shard_engines):
+        await target.dispose()
     log.info("🛑 Shutdown complete")
@@ -9,7 +9,7 @@
 from structlog import BoundLogger
 from tzlocal import get_localzone_name
 from functools import lru_cache
-from typing import Any, List
+from typing import Any, List, Literal
 from pydantic import BaseModel, Field, SecretStr, PostgresDsn, model_validator
 from pydantic_settings import (
     BaseSettings,
@@ -97,6 +97,135 @@ class DatabaseSettings(BaseModel):
         default="universal",
         description="Database name, e.g., 'universal'"
     )
+    pool_profile: Literal["auto", "queue", "null", "static"] = Field(
+        default="auto",
+        description="Connection pool profile; 'auto' picks a queue pool for Postgres and a null/static pool for SQLite"
+    )
+    pool_size: int = Field(
+        default=5,
+        ge=1,
+        description="Number of persistent connections kept open by the queue pool"
+    )
+    pool_max_overflow: int = Field(
+        default=10,
+        ge=0,
+        description="Extra connections the queue pool may open above pool_size under load"
+    )
+    pool_timeout: float = Field(
+        default=30.0,
+        gt=0,
+        description="Seconds to wait for a pooled connection before giving up"
+    )
+    pool_recycle: int = Field(
+        default=1800,
+        description="Seconds after which a pooled connection is replaced (-1 disables recycling)"
+    )
+    pool_pre_ping: bool = Field(
+        default=True,
+        description="Test pooled connections for liveness on checkout"
+    )
+    pool_warmup_connections: int = Field(
+        default=5,
+        ge=0,
+        description="Connections to pre-open and validate at startup (capped at pool_size; 0 disables)"
+    )
+    prepared_statement_cache_size: int = Field(
+        default=256,
+        ge=0,
+        description="asyncpg prepared statement cache size per connection (0 disables, e.g. behind pgbouncer)"
+    )
+    compiled_cache_size: int = Field(
+        default=1000,
+        ge=0,
+        description="SQLAlchemy compiled SQL cache size per engine"
+    )
+    query_budget_seconds: float = Field(
+        default=10.0,
+        gt=0,
+        description="Default per-route query budget; also applied as the Postgres statement_timeout"
+    )
+    bulk_budget_seconds: float = Field(
+        default=300.0,
+        gt=0,
+        description="Query budget of bulk write routes, which also covers streaming the request body"
+    )
+    slow_query_ms: float = Field(
+        default=250.0,
+        ge=0,
+        description="Statements slower than this many milliseconds are logged (0 disables)"
+    )
+    slow_query_explain_rate: float = Field(
+        default=0.0,
+        ge=0,
+        le=1,
+        description="Fraction of slow SELECTs re-run under EXPLAIN (ANALYZE, BUFFERS) on Postgres"
+    )
+    slow_query_explain_dir: Path = Field(
+        default=Path("reports/explain"),
+        description="Directory where captured EXPLAIN plans are written"
+    )
+    sqlite_wal: bool = Field(
+        default=False,
+        description="Run file-backed SQLite in single-node production mode: WAL, tuned pragmas, one writer and a reader pool"
+    )
+    sqlite_busy_timeout_ms: int = Field(
+        default=5000,
+        ge=0,
+        description="SQLite busy_timeout in milliseconds"
+    )
+    sqlite_cache_size_kib: int = Field(
+        default=65536,
+        ge=0,
+        description="SQLite page cache size per connection in KiB"
+    )
+    sqlite_mmap_size: int = Field(
+        default=268_435_456,
+        ge=0,
+        description="SQLite mmap_size in bytes"
+    )
+    sqlite_reader_pool_size: int = Field(
+        default=4,
+        ge=1,
+        description="Read-only SQLite connections kept open in production mode"
+    )
+    repository: Literal["sql", "memory", "write_through"] = Field(
+        default="sql",
+        description="Map/message repositories: SQL only, in-memory only (demo stacks), or in-memory write-through over SQL"
+    )
+    shard_urls: list[str] = Field(
+        default_factory=list,
+        description="Shard database URLs; maps and messages are partitioned across them by user_id when set"
+    )
+    replica_urls: list[str] = Field(
+        default_factory=list,
+        description="Read replica URLs; read-only queries are routed to these when set"
+    )
+    read_your_writes_window: float = Field(
+        default=5.0,
+        ge=0,
+        description="Seconds after a commit during which the same user's reads stay on the primary"
+    )
+
+    @property
+    def is_sqlite(self: DatabaseSettings) -> bool:
+        """Whether the configured database is SQLite."""
+        return str(self.url).startswith("sqlite")
+
+    @property
+    def is_memory(self: DatabaseSettings) -> bool:
+        """Whether the configured database is an in-memory SQLite database."""
+        return self.is_sqlite and str(self.url).endswith(":memory:")
+
+    @property
+    def resolved_pool_profile(self: DatabaseSettings) -> Literal["queue", "null", "static"]:
+        """Resolve the 'auto' pool profile against the configured backend."""
+        if self.pool_profile != "auto":
+            return self.pool_profile
+        if self.is_memory:
+            return "static"
+        if self.is_sqlite:
+            return "null"
+        return "queue"
 
     @model_validator(mode="before")
     @classmethod
@@ -123,6 +252,22 @@ def build_url_from_components(cls: type[DatabaseSettings], values: dict[str, Any
 
             return values
 
+class DatasetSettings(BaseModel):
+    uri: str = Field(
+        default="data/datasets",
+        description="Root TileDB URI (local path or object store) under which map datasets are stored"
+    )
+    tile_rows: int = Field(
+        default=65536,
+        ge=1,
+        description="Rows per TileDB tile; larger tiles favour scans, smaller ones selective slices"
+    )
+    read_max_rows: int = Field(
+        default=100_000,
+        ge=1,
+        description="Most rows returned by one dataset read"
+    )
+
 class SystemSettings(BaseModel):
     project_root: Path = Field(default_factory=lambda: Path(__file__).resolve().parents[3])
     shell: str = Field(default_factory=lambda: Path(os.environ.get("SHELL", "unknown")).name)
@@ -155,9 +300,15 @@ class Settings(BaseSettings):
     rate_limit_timespan: int = Field(default=300, description="Time window for rate limiting in seconds")
     rate_limit_block_duration: int = Field(default=300, description="Block duration in seconds after exceeding rate limit")
     body_size_max_bytes: int = Field(default=1_000_000_000, alias="MAX_BODY_SIZE_BYTES", description="Max request body size in bytes")
+    page_size_default: int = Field(default=100, alias="PAGE_SIZE_DEFAULT", description="Rows per page when a listing request gives no limit")
+    page_size_max: int = Field(default=500, alias="PAGE_SIZE_MAX", description="Upper bound on the limit of a listing request")
+    batch_ids_max: int = Field(default=500, alias="BATCH_IDS_MAX", description="Most IDs a single batch request may name")
+    bulk_chunk_size: int = Field(default=1000, ge=1, alias="BULK_CHUNK_SIZE", description="Rows inserted per multi-row INSERT chunk of a bulk request")
+    bulk_items_max: int = Field(default=50_000, ge=1, alias="BULK_ITEMS_MAX", description="Most items a single bulk request may carry")
 
     database: DatabaseSettings
     keycloak: KeycloakSettings
+    datasets: DatasetSettings = Field(default_factory=DatasetSettings)
     system: SystemSettings = Field(default_factory=SystemSettings)
 
     model_config = SettingsConfigDict(
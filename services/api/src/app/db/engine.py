@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
+
+from app.core.settings import DatabaseSettings
+from app.db.pool import InstrumentedAsyncAdaptedQueuePool, attach_pool_stats
+from app.db.slow_query import attach_slow_query_log
+
+
+def engine_options(database: DatabaseSettings) -> dict[str, Any]:
+    """Build create_async_engine keyword arguments for the configured pool profile."""
+    profile: str = database.resolved_pool_profile
+    options: dict[str, Any] = {"query_cache_size": database.compiled_cache_size}
+
+    if database.is_sqlite:
+        options["connect_args"] = {"check_same_thread": False}
+    elif str(database.url).startswith("postgresql+asyncpg"):
+        options["connect_args"] = {"prepared_statement_cache_size": database.prepared_statement_cache_size}
+
+    if profile == "queue":
+        options.update(
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_size=database.pool_size,
+            max_overflow=database.pool_max_overflow,
+            pool_timeout=database.pool_timeout,
+            pool_recycle=database.pool_recycle,
+            pool_pre_ping=database.pool_pre_ping,
+        )
+    elif profile == "static":
+        options["poolclass"] = StaticPool
+    else:
+        options["poolclass"] = NullPool
+
+    return options
+
+
+def build_engine(database: DatabaseSettings, *, echo: bool = False) -> AsyncEngine:
+    """Create an async engine using the pool profile from DatabaseSettings."""
+    engine: AsyncEngine = create_async_engine(
+        str(database.url),
+        echo=echo,
+        **engine_options(database),
+    )
+    attach_pool_stats(engine)
+    attach_slow_query_log(engine, database)
+    return engine
+
+
+def build_replica_engines(database: DatabaseSettings, *, echo: bool = False) -> list[AsyncEngine]:
+    """Create one engine per configured read replica, sharing the primary's pool profile."""
+    return [
+        build_engine(database.model_copy(update={"url": url}), echo=echo)
+        for url in database.replica_urls
+    ]
+
+
+def build_shard_engines(database: DatabaseSettings, *, echo: bool = False) -> list[AsyncEngine]:
+    """Create one engine per configured shard, sharing the primary's pool profile."""
+    return [
+        build_engine(database.model_copy(update={"url": url}), echo=echo)
+        for url in database.shard_urls
+    ]
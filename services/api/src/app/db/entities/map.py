@@ -1,21 +1,25 @@
 from datetime import datetime
 
-from sqlalchemy import Text, DateTime, func
+from sqlalchemy import Index, DateTime, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
+from app.db.fuzzy_search import install_map_search
+from app.db.json_state import JSONDocument, install_map_state_index
 
 
 class Map(Base):
     """SQLAlchemy model for the 'maps' table."""
 
     __tablename__: str = "maps"
+    # Fetch server-generated timestamps with RETURNING at flush time instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, index=True)
     user_id: Mapped[str] = mapped_column(nullable=False, index=True)
     name: Mapped[str] = mapped_column(nullable=False)
     description: Mapped[str] = mapped_column(nullable=False)
-    state: Mapped[str] = mapped_column(Text, nullable=False)
+    state: Mapped[str] = mapped_column(JSONDocument, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -28,3 +32,14 @@ class Map(Base):
         onupdate=func.now(),
         nullable=False,
     )
+
+
+# Keyset pagination indexes matching the (updated_at, id) descending listing order
+Index("ix_maps_user_id_updated_at_id", Map.user_id, Map.updated_at.desc(), Map.id.desc())
+Index("ix_maps_updated_at_id", Map.updated_at.desc(), Map.id.desc())
+
+# Trigram index for fuzzy search over name and description, on Postgres
+install_map_search(Map.__table__)
+
+# GIN jsonb_path_ops index answering state containment queries, on Postgres
+install_map_state_index(Map.__table__)
@@ -1,11 +1,14 @@
 from datetime import datetime
-from sqlalchemy import Text, DateTime, func
+from sqlalchemy import Index, Text, DateTime, func
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
+from app.db.full_text import install_message_search
 
 class Message(Base):
     """SQLAlchemy model for the messages table."""
     __tablename__: str = "messages"
+    # Fetch server-generated timestamps with RETURNING at flush time instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, index=True)
     user_id: Mapped[str] = mapped_column(nullable=False, index=True)
@@ -23,3 +26,11 @@ class Message(Base):
         onupdate=func.now(),
         nullable=False,
     )
+
+
+# Keyset pagination indexes matching the (updated_at, id) descending listing order
+Index("ix_messages_user_id_updated_at_id", Message.user_id, Message.updated_at.desc(), Message.id.desc())
+Index("ix_messages_updated_at_id", Message.updated_at.desc(), Message.id.desc())
+
+# Full-text index over content: a generated tsvector on Postgres, an FTS5 table on SQLite
+install_message_search(Message.__table__)
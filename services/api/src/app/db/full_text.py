@@ -0,0 +1,81 @@
+"""
+Full-text index over messages.content.
+
+Postgres keeps a generated tsvector column with a GIN index; SQLite keeps an
+external-content FTS5 table synced by triggers. The DDL is shared by the
+Alembic revision and by metadata.create_all(), so test and benchmark schemas
+can be searched like migrated ones.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from sqlalchemy import DDL, Table, event
+from sqlalchemy.engine import Connection
+
+# Text search configuration used to build and query the tsvector
+TEXT_SEARCH_CONFIG: str = "english"
+
+SEARCH_VECTOR_COLUMN: str = "search_vector"
+SEARCH_VECTOR_INDEX: str = "ix_messages_search_vector"
+MESSAGES_FTS_TABLE: str = "messages_fts"
+
+POSTGRES_SEARCH_VECTOR_DDL: str = (
+    f"ALTER TABLE messages ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR_COLUMN} tsvector "
+    f"GENERATED ALWAYS AS (to_tsvector('{TEXT_SEARCH_CONFIG}', content)) STORED"
+)
+POSTGRES_SEARCH_INDEX_DDL: str = (
+    f"CREATE INDEX IF NOT EXISTS {SEARCH_VECTOR_INDEX} ON messages USING gin ({SEARCH_VECTOR_COLUMN})"
+)
+
+# External-content FTS5 table: the text lives in messages only, the triggers keep the index in step
+SQLITE_FTS_DDL: list[str] = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {MESSAGES_FTS_TABLE} USING fts5("
+    "content, content='messages', content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages BEGIN "
+    f"INSERT INTO {MESSAGES_FTS_TABLE}(rowid, content) VALUES (new.id, new.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN "
+    f"INSERT INTO {MESSAGES_FTS_TABLE}({MESSAGES_FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS messages_fts_au AFTER UPDATE OF content ON messages BEGIN "
+    f"INSERT INTO {MESSAGES_FTS_TABLE}({MESSAGES_FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content); "
+    f"INSERT INTO {MESSAGES_FTS_TABLE}(rowid, content) VALUES (new.id, new.content); END",
+]
+SQLITE_FTS_REBUILD: str = f"INSERT INTO {MESSAGES_FTS_TABLE}({MESSAGES_FTS_TABLE}) VALUES ('rebuild')"
+SQLITE_FTS_DROP: list[str] = [
+    "DROP TRIGGER IF EXISTS messages_fts_au",
+    "DROP TRIGGER IF EXISTS messages_fts_ad",
+    "DROP TRIGGER IF EXISTS messages_fts_ai",
+    f"DROP TABLE IF EXISTS {MESSAGES_FTS_TABLE}",
+]
+
+_WORD: re.Pattern[str] = re.compile(r"\w+")
+
+
+def search_terms(text: str) -> list[str]:
+    """The words of free text, lowercased."""
+    return [w.lower() for w in _WORD.findall(text)]
+
+
+def fts5_query(text: str) -> str | None:
+    """
+    Quote every word of free text as an FTS5 string, so all words must match
+    like plainto_tsquery and operators or stray quotes cannot break the
+    MATCH syntax. None when the text has no words.
+    """
+    words: list[str] = search_terms(text)
+    return " ".join(f'"{w}"' for w in words) if words else None
+
+
+def install_message_search(messages: Table) -> None:
+    """Create the search index alongside the messages table in metadata.create_all()."""
+    for statement in (POSTGRES_SEARCH_VECTOR_DDL, POSTGRES_SEARCH_INDEX_DDL):
+        event.listen(messages, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    for statement in SQLITE_FTS_DDL:
+        event.listen(messages, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+    @event.listens_for(messages, "before_drop")
+    def _drop_fts(target: Table, connection: Connection, **kw: Any) -> None:  # pyright: ignore[reportUnusedFunction]
+        if connection.dialect.name == "sqlite":
+            for statement in SQLITE_FTS_DROP:
+                connection.exec_driver_sql(statement)
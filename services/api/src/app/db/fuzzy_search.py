@@ -0,0 +1,83 @@
+"""
+Typo-tolerant search over map names and descriptions.
+
+Postgres matches with pg_trgm's word similarity through a GIN trigram index
+on the concatenated text. Other backends have no trigram index, so the same
+similarity is computed in Python over the candidate rows; that fallback scans
+and is meant for tests and small single-node deployments.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+from sqlalchemy import DDL, Table, event
+
+# Word similarity a map must reach to match; below pg_trgm's 0.6 default so one typo in a short word still matches
+WORD_SIMILARITY_THRESHOLD: float = 0.4
+
+MAP_SEARCH_INDEX: str = "ix_maps_search_text_trgm"
+# Indexed expression; queries must repeat it verbatim for Postgres to use the index
+MAP_SEARCH_TEXT: str = "(name || ' ' || description)"
+
+PG_TRGM_EXTENSION_DDL: str = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+POSTGRES_MAP_SEARCH_INDEX_DDL: str = (
+    f"CREATE INDEX IF NOT EXISTS {MAP_SEARCH_INDEX} ON maps USING gin ({MAP_SEARCH_TEXT} gin_trgm_ops)"
+)
+
+_ALNUM_WORD: re.Pattern[str] = re.compile(r"[^\W_]+")
+
+
+@lru_cache(maxsize=65536)
+def _word_trigrams(word: str) -> tuple[str, ...]:
+    """Trigrams of one word in order, padded like pg_trgm: two spaces before, one after."""
+    padded: str = f"  {word} "
+    return tuple(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def word_similarity(query: str, text: str, floor: float = 0.0) -> float:
+    """
+    pg_trgm's word_similarity(query, text): the best trigram overlap between the
+    query and any continuous extent of text, from 0 to 1. Extents are any part
+    of one word, or runs of whole words no longer than the query; pg_trgm also
+    tries partial words at the edges of a run, so multi-word matches can score
+    slightly lower here. Returns 0 early when the score cannot reach floor.
+    """
+    query_words: list[str] = _ALNUM_WORD.findall(query.lower())
+    query_trigrams: set[str] = {t for word in query_words for t in _word_trigrams(word)}
+    words: list[tuple[str, ...]] = [_word_trigrams(w) for w in _ALNUM_WORD.findall(text.lower())]
+    # No extent can share more trigrams with the query than the whole text does
+    shared: int = len(query_trigrams.intersection(t for w in words for t in w))
+    if not shared or shared / len(query_trigrams) < floor:
+        return 0.0
+
+    def score(extent: set[str]) -> float:
+        return len(query_trigrams & extent) / len(query_trigrams | extent)
+
+    best: float = 0.0
+    for start, trigrams in enumerate(words):
+        if query_trigrams.isdisjoint(trigrams):
+            continue
+        # Parts of one word: only extents starting and ending on a query trigram can be best
+        for first, head in enumerate(trigrams):
+            if head not in query_trigrams:
+                continue
+            part: set[str] = set()
+            matched: int = 0
+            for t in trigrams[first:]:
+                if t in part:
+                    continue
+                part.add(t)
+                if t in query_trigrams:
+                    matched += 1
+                    best = max(best, matched / (len(query_trigrams) + len(part) - matched))
+        extent: set[str] = set(trigrams)
+        for end in range(start + 1, min(start + len(query_words), len(words))):
+            extent |= set(words[end])
+            best = max(best, score(extent))
+    return best
+
+def install_map_search(maps: Table) -> None:
+    """Create the trigram index alongside the maps table in metadata.create_all() on Postgres."""
+    event.listen(maps, "before_create", DDL(PG_TRGM_EXTENSION_DDL).execute_if(dialect="postgresql"))
+    event.listen(maps, "after_create", DDL(POSTGRES_MAP_SEARCH_INDEX_DDL).execute_if(dialect="postgresql"))
@@ -0,0 +1,97 @@
+"""
+Map state storage: JSON text in Python, JSONB with a GIN jsonb_path_ops index
+on Postgres so containment queries (@>) are answered from the index, and
+plain TEXT queried with the JSON1 functions elsewhere.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import DDL, Table, Text, cast, event, literal, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.elements import BindParameter, ColumnElement
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+MAP_STATE_INDEX: str = "ix_maps_state_path_ops"
+POSTGRES_MAP_STATE_INDEX_DDL: str = f"CREATE INDEX IF NOT EXISTS {MAP_STATE_INDEX} ON maps USING gin (state jsonb_path_ops)"
+
+
+def jsonb_literal(document: str) -> ColumnElement[Any]:
+    """A JSON document bound as text and cast to JSONB in Postgres, for comparisons with JSONB columns."""
+    return cast(literal(document, Text), JSONB)
+
+
+class json_text(FunctionElement[str]):
+    """
+    A JSON column read back as text. asyncpg decodes JSONB into Python objects,
+    which would make every read parse a possibly multi-megabyte document that
+    the API returns as a string anyway.
+    """
+
+    type = Text()
+    name = "json_text"
+    inherit_cache = True
+
+
+@compiles(json_text)
+def _compile_json_text(element: json_text, compiler: SQLCompiler, **kw: Any) -> str:
+    """Other dialects store the text itself."""
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(json_text, "postgresql")
+def _compile_json_text_postgresql(element: json_text, compiler: SQLCompiler, **kw: Any) -> str:
+    """Serialize JSONB in the database."""
+    return f"CAST({compiler.process(element.clauses, **kw)} AS TEXT)"
+
+
+class json_bind(FunctionElement[str]):
+    """A bound JSON document, sent to the database as text."""
+
+    type = Text()
+    name = "json_bind"
+    inherit_cache = True
+
+
+@compiles(json_bind)
+def _compile_json_bind(element: json_bind, compiler: SQLCompiler, **kw: Any) -> str:
+    """Other dialects store the text itself."""
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(json_bind, "postgresql")
+def _compile_json_bind_postgresql(element: json_bind, compiler: SQLCompiler, **kw: Any) -> str:
+    """
+    Bind the text, not JSONB: the driver's JSONB processing would serialize the
+    string again. Postgres parses the text into JSONB.
+    """
+    (bind,) = element.clauses
+    return compiler.process(cast(type_coerce(bind, Text), JSONB), **kw)
+
+
+class JSONDocument(TypeDecorator[str]):
+    """A JSON document handled as a string: JSONB on Postgres, TEXT elsewhere."""
+
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self: JSONDocument, dialect: Dialect) -> TypeEngine[Any]:
+        """JSONB on Postgres."""
+        return dialect.type_descriptor(JSONB() if dialect.name == "postgresql" else Text())
+
+    def bind_expression(self: JSONDocument, bindvalue: BindParameter[str]) -> ColumnElement[str]:
+        """Write the document as text."""
+        return json_bind(bindvalue)
+
+    def column_expression(self: JSONDocument, column: ColumnElement[Any]) -> ColumnElement[Any]:
+        """Read the document as text."""
+        return json_text(column)
+
+
+def install_map_state_index(maps: Table) -> None:
+    """Create the containment index alongside the maps table in metadata.create_all() on Postgres."""
+    event.listen(maps, "after_create", DDL(POSTGRES_MAP_STATE_INDEX_DDL).execute_if(dialect="postgresql"))
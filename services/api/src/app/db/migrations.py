@@ -1,27 +1,118 @@
 import asyncio
+import re
 
 from pathlib import Path
-from alembic.config import Config
-from alembic import command
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+from structlog import BoundLogger
 
+from app.core.logging import get_logger
 from app.core.settings import Settings, get_settings
 
-async def run_migrations_async() -> None:
-    """Run Alembic migrations programmatically on app startup."""
+log: BoundLogger = get_logger()
+
+# Session-level Postgres advisory lock key shared by every process migrating the same database
+MIGRATION_LOCK_ID: int = 0x6D69_6772_6174_65  # "migrate"
+
+_REVISION_RE = re.compile(r"^revision\s*(?::\s*str\s*)?=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+_DOWN_REVISION_RE = re.compile(r"^down_revision\s*(?::[^=]+)?=\s*(.+)$", re.MULTILINE)
+_QUOTED_RE = re.compile(r"['\"]([^'\"]+)['\"]")
+
+
+def script_heads(versions_dir: Path) -> set[str]:
+    """Head revisions of the migration scripts, parsed from the files without importing Alembic."""
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for path in versions_dir.glob("*.py"):
+        source: str = path.read_text()
+        revision: re.Match[str] | None = _REVISION_RE.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down_revision: re.Match[str] | None = _DOWN_REVISION_RE.search(source)
+        if down_revision is not None:
+            parents.update(_QUOTED_RE.findall(down_revision.group(1)))
+    return revisions - parents
+
+
+async def current_revisions(conn: AsyncConnection) -> set[str]:
+    """Revisions stamped in alembic_version, empty when the table does not exist yet."""
+    try:
+        result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        return {row[0] for row in result}
+    except DBAPIError:
+        # Clear the aborted transaction so the connection stays usable
+        await conn.rollback()
+        return set()
+
+
+async def _is_current(conn: AsyncConnection, heads: set[str]) -> bool:
+    """Whether the database is already stamped at exactly the script heads."""
+    return bool(heads) and await current_revisions(conn) == heads
+
+
+def _upgrade(settings: Settings, alembic_ini: Path, url: str) -> None:
+    """Run alembic upgrade head; Alembic is only imported when an upgrade is needed."""
+    from alembic import command
+    from alembic.config import Config
+
+    alembic_cfg = Config(str(alembic_ini))
+
+    # Override migration script location dynamically
+    alembic_cfg.set_main_option("script_location", str(settings.system.project_root / "migrations"))
+    alembic_cfg.set_main_option("sqlalchemy.url", url)
+
+    command.upgrade(alembic_cfg, "head")
+
+
+async def run_migrations_async(url: str | None = None) -> None:
+    """
+    Run Alembic migrations programmatically on app startup, against url when given.
+    Skips Alembic entirely when alembic_version already matches the script heads.
+    On Postgres a single process upgrades under an advisory lock while the others
+    wait and then re-check.
+    """
     settings: Settings = get_settings()
+    url = url or str(settings.database.url)
 
     alembic_ini: Path = settings.system.project_root / "alembic.ini"
     if not alembic_ini.exists():
         raise FileNotFoundError(f"Could not find alembic.ini at {alembic_ini}")
 
-    # Run synchronously inside async function
-    def sync_run() -> None:
-        alembic_cfg = Config(str(alembic_ini))
+    heads: set[str] = script_heads(settings.system.project_root / "migrations" / "versions")
+    engine: AsyncEngine = create_async_engine(url, poolclass=NullPool)
+    try:
+        async with engine.connect() as conn:
+            if await _is_current(conn, heads):
+                log.info("✅ Database schema is current", heads=sorted(heads))
+                return
 
-        # Override migration script location dynamically
-        alembic_cfg.set_main_option("script_location", str(settings.system.project_root / "migrations"))
-        alembic_cfg.set_main_option("sqlalchemy.url", str(settings.database.url))
+            if conn.dialect.name != "postgresql":
+                await conn.rollback()
+                await asyncio.to_thread(_upgrade, settings, alembic_ini, url)
+                return
 
-        command.upgrade(alembic_cfg, "head")
+            await conn.rollback()
+            locked: bool = (
+                await conn.execute(text("SELECT pg_try_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            ).scalar_one()
+            if not locked:
+                log.info("⏳ Waiting for another process to finish migrations")
+                await conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            await conn.commit()
 
-    await asyncio.to_thread(sync_run)
+            try:
+                # Another process may have upgraded while this one waited for the lock
+                if await _is_current(conn, heads):
+                    log.info("✅ Database schema is current", heads=sorted(heads))
+                    return
+                await conn.rollback()
+                await asyncio.to_thread(_upgrade, settings, alembic_ini, url)
+            finally:
+                await conn.rollback()
+                await conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+                await conn.commit()
+    finally:
+        await engine.dispose()
@@ -0,0 +1,241 @@
+"""
+Lock-safe helpers for Alembic revisions that touch large tables.
+
+Call these from a revision's upgrade()/downgrade() instead of the plain op.*
+equivalents. Index builds and backfills commit as they go (they run in an
+autocommit block), so env.py runs each revision in its own transaction.
+"""
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, replace
+from time import perf_counter
+from typing import Any, TypeVar
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import exc
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import ColumnElement
+from structlog import BoundLogger
+
+from app.core.logging import get_logger
+
+log: BoundLogger = get_logger()
+
+T = TypeVar("T")
+
+# Postgres SQLSTATE raised when lock_timeout expires
+LOCK_NOT_AVAILABLE_SQLSTATE: str = "55P03"
+
+
+def is_lock_timeout(err: exc.DBAPIError) -> bool:
+    """Whether a database error was raised by lock_timeout."""
+    return getattr(err.orig, "sqlstate", None) == LOCK_NOT_AVAILABLE_SQLSTATE
+
+
+def _retry_on_lock_timeout(
+    label: str,
+    attempt: Callable[[], T],
+    *,
+    retries: int,
+    backoff_seconds: float,
+) -> T:
+    """Run attempt, retrying with exponential backoff while it fails on lock_timeout."""
+    for retry in range(retries + 1):
+        try:
+            return attempt()
+        except exc.DBAPIError as err:
+            if not is_lock_timeout(err) or retry == retries:
+                raise
+            delay: float = backoff_seconds * 2**retry
+            log.warning("🔒 Lock timeout, retrying", operation=label, retry=retry + 1, retries=retries, delay=delay)
+            time.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def run_with_lock_timeout(
+    operation: Callable[[], T],
+    *,
+    timeout_ms: int = 2000,
+    retries: int = 5,
+    backoff_seconds: float = 1.0,
+) -> T:
+    """
+    Run a DDL operation that needs a table lock without queueing behind long
+    transactions. On Postgres each attempt runs in a savepoint with a short
+    lock_timeout, so a blocked attempt gives up quickly instead of stalling
+    every query queued behind its lock request.
+    """
+    bind: Connection = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return operation()
+
+    def attempt() -> T:
+        with bind.begin_nested():
+            bind.execute(sa.text(f"SET LOCAL lock_timeout = {int(timeout_ms)}"))
+            return operation()
+
+    return _retry_on_lock_timeout(
+        getattr(operation, "__name__", "operation"),
+        attempt,
+        retries=retries,
+        backoff_seconds=backoff_seconds,
+    )
+
+
+def create_index_concurrently(
+    index_name: str,
+    table_name: str,
+    columns: Sequence[str | ColumnElement[Any]],
+    *,
+    unique: bool = False,
+    where: ColumnElement[bool] | sa.TextClause | None = None,
+    using: str | None = None,
+    lock_timeout_ms: int = 2000,
+    retries: int = 5,
+    backoff_seconds: float = 1.0,
+) -> None:
+    """
+    Build an index without blocking writes. On Postgres this is CREATE INDEX
+    CONCURRENTLY outside the migration transaction; an invalid index left by an
+    earlier failed build is dropped first; using selects the access method
+    (e.g. "gin"). Other dialects create it normally.
+    """
+    bind: Connection = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        op.create_index(index_name, table_name, list(columns), unique=unique, sqlite_where=where, if_not_exists=True)
+        return
+
+    with op.get_context().autocommit_block():
+        invalid: bool = bool(
+            op.get_bind().execute(
+                sa.text(
+                    "SELECT NOT i.indisvalid FROM pg_index i "
+                    "JOIN pg_class c ON c.oid = i.indexrelid "
+                    "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+                ),
+                {"name": index_name},
+            ).scalar()
+        )
+        if invalid:
+            log.warning("🧹 Dropping invalid index from a failed build", index=index_name)
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
+
+        def attempt() -> None:
+            conn: Connection = op.get_bind()
+            conn.execute(sa.text(f"SET lock_timeout = {int(lock_timeout_ms)}"))
+            try:
+                op.create_index(
+                    index_name,
+                    table_name,
+                    list(columns),
+                    unique=unique,
+                    postgresql_concurrently=True,
+                    postgresql_where=where,
+                    postgresql_using=using,
+                    if_not_exists=True,
+                )
+            finally:
+                conn.execute(sa.text("RESET lock_timeout"))
+
+        _retry_on_lock_timeout(f"create index {index_name}", attempt, retries=retries, backoff_seconds=backoff_seconds)
+
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    """Drop an index without blocking reads or writes on Postgres."""
+    if op.get_bind().dialect.name != "postgresql":
+        op.drop_index(index_name, table_name=table_name, if_exists=True)
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
+
+
+@dataclass
+class BackfillProgress:
+    """Running totals reported after each backfill batch."""
+
+    table: str
+    rows_updated: int
+    batches: int
+    last_key: int
+    max_key: int
+    elapsed_seconds: float
+
+    @property
+    def percent(self: BackfillProgress) -> float:
+        """Share of the key range covered so far."""
+        return 100.0 if self.max_key <= 0 else min(100.0, 100.0 * self.last_key / self.max_key)
+
+    @property
+    def rows_per_second(self: BackfillProgress) -> float:
+        """Average update throughput."""
+        return self.rows_updated / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+def backfill_in_batches(
+    table_name: str,
+    values: Mapping[str, Any],
+    *,
+    where: ColumnElement[bool] | sa.TextClause | None = None,
+    key: str = "id",
+    batch_size: int = 1000,
+    pause_seconds: float = 0.1,
+    progress: Callable[[BackfillProgress], None] | None = None,
+    log_interval_seconds: float = 5.0,
+) -> BackfillProgress:
+    """
+    Fill columns on an existing table in short, separately committed batches.
+    Batches walk the integer key in ranges of batch_size so each UPDATE locks
+    a bounded set of rows, and sleep pause_seconds in between to leave
+    headroom for live traffic. Progress goes to the progress callback after
+    every batch and to the log at most every log_interval_seconds.
+    """
+    table = sa.table(table_name, sa.column(key), *(sa.column(name) for name in values))
+    key_column = table.c[key]
+
+    with op.get_context().autocommit_block():
+        conn: Connection = op.get_bind()
+        min_key, max_key = conn.execute(sa.select(sa.func.min(key_column), sa.func.max(key_column))).one()
+        state = BackfillProgress(table_name, 0, 0, 0, max_key or 0, 0.0)
+        if min_key is None:
+            return state
+
+        start: float = perf_counter()
+        logged_at: float = start
+        low: int = min_key
+        while low <= max_key:
+            high: int = low + batch_size
+            statement = (
+                sa.update(table)
+                .where(key_column >= low, key_column < high)
+                .values(dict(values))
+            )
+            if where is not None:
+                statement = statement.where(where)
+            state.rows_updated += conn.execute(statement).rowcount
+            state.batches += 1
+            state.last_key = min(high - 1, max_key)
+            now: float = perf_counter()
+            state.elapsed_seconds = now - start
+
+            if now - logged_at >= log_interval_seconds or state.last_key >= max_key:
+                logged_at = now
+                log.info(
+                    "🧱 Backfill progress",
+                    table=table_name,
+                    rows_updated=state.rows_updated,
+                    batches=state.batches,
+                    percent=round(state.percent, 1),
+                    rows_per_second=round(state.rows_per_second, 1),
+                )
+            if progress is not None:
+                progress(replace(state))
+
+            low = high
+            if pause_seconds > 0 and low <= max_key:
+                time.sleep(pause_seconds)
+
+    return state
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class stored_timestamp(FunctionElement[datetime]):
+    """
+    A bound timestamp rendered in the format server-generated timestamps are
+    stored in, so keyset comparisons against them are exact. SQLite keeps
+    CURRENT_TIMESTAMP as 'YYYY-MM-DD HH:MM:SS' text while SQLAlchemy binds
+    datetimes with microseconds, which would sort every tie as "before".
+    """
+
+    type = DateTime(timezone=True)
+    name = "stored_timestamp"
+    inherit_cache = True
+
+
+@compiles(stored_timestamp)
+def _compile_stored_timestamp(element: stored_timestamp, compiler: SQLCompiler, **kw: Any) -> str:
+    """Other dialects compare native timestamps directly."""
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(stored_timestamp, "sqlite")
+def _compile_stored_timestamp_sqlite(element: stored_timestamp, compiler: SQLCompiler, **kw: Any) -> str:
+    """Normalize the bound value with SQLite's datetime()."""
+    return f"datetime({compiler.process(element.clauses, **kw)})"
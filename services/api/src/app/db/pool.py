@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from time import monotonic, perf_counter
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, Pool, PoolProxiedConnection, QueuePool
+
+
+@dataclass
+class PoolStats:
+    """Running counters for connection checkouts and connection lifetimes."""
+
+    checkouts: int = 0
+    checkout_timeouts: int = 0
+    checkout_wait_total: float = 0.0
+    checkout_wait_max: float = 0.0
+    connections_opened: int = 0
+    connections_closed: int = 0
+    opened_at: dict[int, float] = field(default_factory=dict[int, float])
+
+    def record_checkout(self: PoolStats, wait: float) -> None:
+        """Record how long a single checkout waited for a connection."""
+        self.checkouts += 1
+        self.checkout_wait_total += wait
+        self.checkout_wait_max = max(self.checkout_wait_max, wait)
+
+    def record_open(self: PoolStats, key: int) -> None:
+        """Record a newly opened DBAPI connection."""
+        self.connections_opened += 1
+        self.opened_at[key] = monotonic()
+
+    def record_close(self: PoolStats, key: int) -> None:
+        """Record a DBAPI connection being closed."""
+        if self.opened_at.pop(key, None) is not None:
+            self.connections_closed += 1
+
+    def snapshot(self: PoolStats) -> dict[str, Any]:
+        """Return a JSON-friendly view of the counters."""
+        now: float = monotonic()
+        ages: list[float] = [now - opened for opened in self.opened_at.values()]
+        return {
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "checkout_wait_avg_ms": (self.checkout_wait_total / self.checkouts * 1000) if self.checkouts else 0.0,
+            "checkout_wait_max_ms": self.checkout_wait_max * 1000,
+            "connections_opened": self.connections_opened,
+            "connections_closed": self.connections_closed,
+            "connections_open": len(ages),
+            "connection_age_max_s": max(ages, default=0.0),
+            "connection_age_avg_s": (sum(ages) / len(ages)) if ages else 0.0,
+        }
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times how long each checkout waits for a connection."""
+
+    stats: PoolStats | None = None
+
+    def connect(self: InstrumentedAsyncAdaptedQueuePool) -> PoolProxiedConnection:
+        """Check out a connection, recording the wait in the attached PoolStats."""
+        start: float = perf_counter()
+        try:
+            connection: PoolProxiedConnection = super().connect()
+        except exc.TimeoutError:
+            if self.stats is not None:
+                self.stats.checkout_timeouts += 1
+            raise
+        if self.stats is not None:
+            self.stats.record_checkout(perf_counter() - start)
+        return connection
+
+    def recreate(self: InstrumentedAsyncAdaptedQueuePool) -> QueuePool:
+        """Recreate the pool (e.g. on dispose) without losing the attached stats."""
+        pool: QueuePool = super().recreate()
+        if isinstance(pool, InstrumentedAsyncAdaptedQueuePool):
+            pool.stats = self.stats
+        return pool
+
+
+_engine_stats: WeakKeyDictionary[Engine, PoolStats] = WeakKeyDictionary()
+
+
+def attach_pool_stats(engine: AsyncEngine) -> PoolStats:
+    """Attach a PoolStats collector to the engine's pool and return it."""
+    sync_engine: Engine = engine.sync_engine
+    existing: PoolStats | None = _engine_stats.get(sync_engine)
+    if existing is not None:
+        return existing
+
+    stats = PoolStats()
+    _engine_stats[sync_engine] = stats
+
+    pool: Pool = sync_engine.pool
+    if isinstance(pool, InstrumentedAsyncAdaptedQueuePool):
+        pool.stats = stats
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:  # pyright: ignore[reportUnusedFunction]
+        stats.record_open(id(dbapi_connection))
+
+    @event.listens_for(sync_engine, "close")
+    def _on_close(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:  # pyright: ignore[reportUnusedFunction]
+        stats.record_close(id(dbapi_connection))
+
+    @event.listens_for(sync_engine, "close_detached")
+    def _on_close_detached(dbapi_connection: Any) -> None:  # pyright: ignore[reportUnusedFunction]
+        stats.record_close(id(dbapi_connection))
+
+    return stats
+
+
+def get_pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    """Return pool sizing and checkout/connection-age statistics for an engine."""
+    pool: Pool = engine.sync_engine.pool
+    stats: PoolStats = _engine_stats.get(engine.sync_engine) or PoolStats()
+    summary: dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        summary.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    summary.update(stats.snapshot())
+    return summary
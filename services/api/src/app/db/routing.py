@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import random
+from time import monotonic
+from typing import Any, Sequence
+
+from sqlalchemy import Delete, Insert, Update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ClauseElement
+from starlette.requests import Request
+
+
+class ReadYourWritesTracker:
+    """Remembers which callers committed recently so their reads can stay on the primary."""
+
+    # Expired entries are pruned once the tracker grows past this many keys
+    max_keys: int = 10_000
+
+    def __init__(self: ReadYourWritesTracker, window: float) -> None:
+        """Initialize the tracker with a stickiness window in seconds."""
+        self.window: float = window
+        self._deadlines: dict[str, float] = {}
+
+    def mark(self: ReadYourWritesTracker, key: str) -> None:
+        """Record a commit by the given caller."""
+        if self.window <= 0:
+            return
+        now: float = monotonic()
+        if len(self._deadlines) >= self.max_keys:
+            self._deadlines = {k: d for k, d in self._deadlines.items() if d > now}
+        self._deadlines[key] = now + self.window
+
+    def is_recent(self: ReadYourWritesTracker, key: str | None) -> bool:
+        """Whether the caller committed within the window."""
+        if key is None:
+            return False
+        deadline: float | None = self._deadlines.get(key)
+        if deadline is None:
+            return False
+        if deadline <= monotonic():
+            del self._deadlines[key]
+            return False
+        return True
+
+
+def read_your_writes_key(request: Request) -> str | None:
+    """
+    Identify the authenticated caller of a request for read-your-writes
+    stickiness, or None for anonymous callers. Client addresses are shared
+    behind NAT and proxies, so they would pin unrelated callers to the primary.
+    """
+    user: Any = request.scope.get("user")
+    if isinstance(user, dict) and user.get("sub"):  # pyright: ignore[reportUnknownMemberType]
+        return str(user["sub"])  # pyright: ignore[reportUnknownArgumentType]
+    remote_user: str | None = request.headers.get("x-remote-user")
+    return remote_user or None
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to a replica and writes to the primary.
+    Once a session flushes or executes DML it stays on the primary for the
+    rest of its lifetime, and a commit marks the caller in the tracker.
+    """
+
+    def __init__(
+        self: RoutingSession,
+        *args: Any,
+        primary: AsyncEngine,
+        replicas: Sequence[AsyncEngine],
+        tracker: ReadYourWritesTracker,
+        sticky_key: str | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the session with primary and replica engines."""
+        super().__init__(*args, **kwargs)
+        self.primary: Engine = primary.sync_engine
+        self.replica: Engine | None = random.choice(replicas).sync_engine if replicas else None
+        self.tracker: ReadYourWritesTracker = tracker
+        self.sticky_key: str | None = sticky_key
+        self.use_primary: bool = tracker.is_recent(sticky_key)
+        self.wrote: bool = False
+
+    def get_bind(
+        self: RoutingSession,
+        mapper: Any = None,
+        *,
+        clause: ClauseElement | None = None,
+        **kw: Any,
+    ) -> Engine | Connection:
+        """Pick the primary for writes and sticky sessions, otherwise the replica."""
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.wrote = True
+            self.use_primary = True
+        if self.use_primary or self.replica is None:
+            return self.primary
+        if getattr(clause, "_for_update_arg", None) is not None:
+            return self.primary
+        return self.replica
+
+    def commit(self: RoutingSession) -> None:
+        """Commit and open the read-your-writes window for this caller."""
+        super().commit()
+        if self.wrote and self.sticky_key is not None:
+            self.tracker.mark(self.sticky_key)
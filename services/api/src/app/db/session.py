@@ -1,18 +1,38 @@
 from collections.abc import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from starlette.requests import Request
 from app.core.settings import Settings, get_settings
+from app.db.engine import build_engine, build_replica_engines, build_shard_engines
+from app.db.routing import ReadYourWritesTracker, RoutingSession, read_your_writes_key
+from app.db.sharding import ShardRouter
+from app.db.sqlite import build_sqlite_engines
 
 # Project settings for database configuration
 settings: Settings = get_settings()
 
-# Create an asynchronous database engine
-engine: AsyncEngine = create_async_engine(
-    str(settings.database.url),
-    future=True,
-    echo=settings.debug,
-    poolclass=NullPool,  # safer for SQLite / testing
-)
+engine: AsyncEngine
+replica_engines: list[AsyncEngine]
+read_your_writes: ReadYourWritesTracker
+
+if settings.database.sqlite_wal:
+    # Single-node SQLite: one serialized writer, reads fan out over read-only connections.
+    # WAL readers see commits immediately, so no read-your-writes window is needed.
+    writer, reader = build_sqlite_engines(settings.database, echo=settings.debug)
+    engine, replica_engines = writer, [reader]
+    read_your_writes = ReadYourWritesTracker(0)
+else:
+    # Create an asynchronous database engine using the configured pool profile
+    engine = build_engine(settings.database, echo=settings.debug)
+
+    # Read replica engines (empty unless DATABASE_REPLICA_URLS is set)
+    replica_engines = build_replica_engines(settings.database, echo=settings.debug)
+
+    # Tracks recent committers so their follow-up reads stay on the primary
+    read_your_writes = ReadYourWritesTracker(settings.database.read_your_writes_window)
+
+# Shard engines for maps and messages (empty unless DATABASE_SHARD_URLS is set)
+shard_engines: list[AsyncEngine] = build_shard_engines(settings.database, echo=settings.debug)
+shard_router: ShardRouter | None = ShardRouter(shard_engines) if shard_engines else None
 
 # Create an asynchronous session maker
 async_session: async_sessionmaker[AsyncSession] = async_sessionmaker(
@@ -21,7 +41,22 @@
     expire_on_commit=False,
 )
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to get a database session."""
-    async with async_session() as session:
+# Session maker that routes reads to replicas and writes to the primary
+routing_session: async_sessionmaker[AsyncSession] = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+    primary=engine,
+    replicas=replica_engines,
+    tracker=read_your_writes,
+)
+
+async def get_async_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get a database session, routed across replicas when configured."""
+    if not replica_engines:
+        async with async_session() as session:
+            yield session
+        return
+
+    async with routing_session(sticky_key=read_your_writes_key(request)) as session:
         yield session
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections.abc import Awaitable, Callable, Sequence
+from types import TracebackType
+from typing import TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+T = TypeVar("T")
+
+
+class ShardRouter:
+    """
+    Maps user_ids to shards and row IDs to (shard, local ID) pairs.
+    Global IDs interleave shards as local_id * shard_count + shard, so the
+    shard of any row is recoverable from its ID alone. Changing the shard
+    count therefore requires re-keying existing rows.
+    """
+
+    def __init__(self: ShardRouter, engines: Sequence[AsyncEngine]) -> None:
+        """Initialize the router with one engine per shard."""
+        if not engines:
+            raise ValueError("ShardRouter needs at least one shard engine")
+        self.engines: list[AsyncEngine] = list(engines)
+        self.factories: list[async_sessionmaker[AsyncSession]] = [
+            async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+            for engine in self.engines
+        ]
+
+    @property
+    def shard_count(self: ShardRouter) -> int:
+        """Number of configured shards."""
+        return len(self.engines)
+
+    def shard_for(self: ShardRouter, user_id: str) -> int:
+        """Stable shard index for a user_id."""
+        digest: bytes = hashlib.blake2b(user_id.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % self.shard_count
+
+    def global_id(self: ShardRouter, shard: int, local_id: int) -> int:
+        """Encode a shard-local row ID as a global ID."""
+        return local_id * self.shard_count + shard
+
+    def locate(self: ShardRouter, global_id: int) -> tuple[int, int]:
+        """Decode a global ID into (shard, local ID)."""
+        return global_id % self.shard_count, global_id // self.shard_count
+
+    def local_bound(self: ShardRouter, shard: int, global_id: int) -> int:
+        """Smallest local ID on a shard whose global ID is not below global_id."""
+        return -(-(global_id - shard) // self.shard_count)
+
+    def unit_of_work(self: ShardRouter) -> ShardedUnitOfWork:
+        """Start a request-scoped unit of work spanning the shards."""
+        return ShardedUnitOfWork(self)
+
+
+class ShardedUnitOfWork:
+    """
+    Request-scoped unit of work that lazily opens one session per shard touched
+    and commits each of them at the end of the request. Per-user writes touch a
+    single shard; commits spanning several shards are not atomic.
+    """
+
+    def __init__(self: ShardedUnitOfWork, router: ShardRouter) -> None:
+        """Initialize the unit of work for a shard router."""
+        self.router: ShardRouter = router
+        self.sessions: dict[int, AsyncSession] = {}
+        self.session_hooks: list[Callable[[AsyncSession], None]] = []
+        self.commit_hooks: list[Callable[[], None]] = []
+        self.rollback_hooks: list[Callable[[], None]] = []
+
+    def session(self: ShardedUnitOfWork, shard: int) -> AsyncSession:
+        """Return the session for a shard, opening it on first use."""
+        if shard not in self.sessions:
+            session: AsyncSession = self.router.factories[shard]()
+            for hook in self.session_hooks:
+                hook(session)
+            self.sessions[shard] = session
+        return self.sessions[shard]
+
+    def on_session(self: ShardedUnitOfWork, hook: Callable[[AsyncSession], None]) -> None:
+        """Register a callback configuring every shard session, those already open and those opened later."""
+        self.session_hooks.append(hook)
+        for session in self.sessions.values():
+            hook(session)
+
+    def on_commit(self: ShardedUnitOfWork, hook: Callable[[], None]) -> None:
+        """Register a callback to run once every touched shard has committed."""
+        self.commit_hooks.append(hook)
+
+    def on_rollback(self: ShardedUnitOfWork, hook: Callable[[], None]) -> None:
+        """Register a callback to run if the request fails or any shard fails to commit."""
+        self.rollback_hooks.append(hook)
+
+    async def scatter(
+        self: ShardedUnitOfWork,
+        fn: Callable[[int, AsyncSession], Awaitable[T]],
+    ) -> list[T]:
+        """Run fn concurrently against every shard and gather the results in shard order."""
+        return list(
+            await asyncio.gather(*(fn(shard, self.session(shard)) for shard in range(self.router.shard_count)))
+        )
+
+    async def __aenter__(self: ShardedUnitOfWork) -> ShardedUnitOfWork:
+        """Enter the unit of work."""
+        return self
+
+    async def __aexit__(
+        self: ShardedUnitOfWork,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Commit every touched shard on success, roll back on error, close, then run the matching hooks."""
+        committed: bool = False
+        try:
+            for session in self.sessions.values():
+                if not session.in_transaction():
+                    continue
+                if exc_type is None:
+                    await session.commit()
+                else:
+                    await session.rollback()
+            committed = exc_type is None
+        finally:
+            await asyncio.gather(*(session.close() for session in self.sessions.values()))
+            hooks: list[Callable[[], None]] = self.commit_hooks if committed else self.rollback_hooks
+            self.commit_hooks, self.rollback_hooks = [], []
+            for hook in hooks:
+                hook()
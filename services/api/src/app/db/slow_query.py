@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from structlog import BoundLogger
+from structlog.contextvars import get_contextvars
+
+from app.core.logging import get_logger
+from app.core.settings import DatabaseSettings
+
+log: BoundLogger = get_logger()
+
+# Longest statement text included in a slow query log entry
+MAX_STATEMENT_LENGTH: int = 2000
+
+
+def parameters_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Describe bound parameters by type only, never by value."""
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        rows: list[Any] | tuple[Any, ...] = parameters  # pyright: ignore[reportUnknownVariableType]
+        return {"rows": len(rows), "row": parameters_shape(rows[0])}
+    if isinstance(parameters, dict):
+        return {str(k): type(v).__name__ for k, v in parameters.items()}  # pyright: ignore[reportUnknownVariableType]
+    if isinstance(parameters, (list, tuple)):
+        return [type(v).__name__ for v in parameters]  # pyright: ignore[reportUnknownVariableType]
+    return type(parameters).__name__
+
+
+def _is_explainable(statement: str) -> bool:
+    """Only plain reads are re-run, since EXPLAIN ANALYZE executes the statement."""
+    head: str = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return head == "SELECT"
+
+
+def capture_explain(
+    conn: Connection,
+    statement: str,
+    parameters: Any,
+    directory: Path,
+) -> Path:
+    """Run EXPLAIN (ANALYZE, BUFFERS) for a slow SELECT and write the plan to disk."""
+    cursor: Any = conn.connection.dbapi_connection.cursor()  # pyright: ignore[reportOptionalMemberAccess]
+    try:
+        # A savepoint keeps a failed EXPLAIN from aborting the caller's transaction
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+            plan: Any = cursor.fetchall()
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        cursor.close()
+
+    directory.mkdir(parents=True, exist_ok=True)
+    digest: str = hashlib.sha1(statement.encode()).hexdigest()[:12]
+    stamp: str = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    path: Path = directory / f"{stamp}-{digest}.json"
+    path.write_text(
+        json.dumps(
+            {"statement": statement, "context": get_contextvars(), "plan": plan},
+            indent=2,
+            default=str,
+        )
+    )
+    return path
+
+
+def attach_slow_query_log(engine: AsyncEngine, database: DatabaseSettings) -> None:
+    """Time every statement on the engine and log those over the configured threshold."""
+    if database.slow_query_ms <= 0:
+        return
+
+    threshold: float = database.slow_query_ms / 1000
+    sync_engine: Engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_timer(  # pyright: ignore[reportUnusedFunction]
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        conn.info.setdefault("query_start_time", []).append(perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _log_slow_query(  # pyright: ignore[reportUnusedFunction]
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        elapsed: float = perf_counter() - conn.info["query_start_time"].pop()
+        if elapsed < threshold:
+            return
+
+        request_context: dict[str, Any] = get_contextvars()
+        log.warning(
+            "🐢 Slow query",
+            duration_ms=round(elapsed * 1000, 2),
+            threshold_ms=database.slow_query_ms,
+            route=request_context.get("path"),
+            correlation_id=request_context.get("correlation_id"),
+            statement=statement[:MAX_STATEMENT_LENGTH],
+            parameters=parameters_shape(parameters, executemany),
+            executemany=executemany,
+        )
+
+        if (
+            conn.dialect.name == "postgresql"
+            and not executemany
+            and _is_explainable(statement)
+            and random.random() < database.slow_query_explain_rate
+        ):
+            try:
+                path: Path = capture_explain(conn, statement, parameters, database.slow_query_explain_dir)
+                log.info("🧾 Captured EXPLAIN plan", path=str(path))
+            except Exception as err:
+                log.warning("⚠️ EXPLAIN capture failed", error=str(err))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import ConnectionPoolEntry
+
+from app.core.settings import DatabaseSettings
+from app.db.engine import build_engine
+
+
+def sqlite_pragmas(database: DatabaseSettings, *, read_only: bool = False) -> list[str]:
+    """PRAGMA statements applied to every connection in single-node production mode."""
+    pragmas: list[str] = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={database.sqlite_busy_timeout_ms}",
+        f"PRAGMA cache_size=-{database.sqlite_cache_size_kib}",
+        f"PRAGMA mmap_size={database.sqlite_mmap_size}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def attach_sqlite_pragmas(engine: AsyncEngine, database: DatabaseSettings, *, writer: bool) -> None:
+    """
+    Apply the production pragmas on connect. The writer opens its transactions
+    with BEGIN IMMEDIATE so concurrent processes queue on busy_timeout instead
+    of failing on lock upgrade.
+    """
+    pragmas: list[str] = sqlite_pragmas(database, read_only=not writer)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:  # pyright: ignore[reportUnusedFunction]
+        # Let SQLAlchemy emit BEGIN itself instead of the driver's implicit transactions
+        dbapi_connection.isolation_level = None
+        cursor: Any = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(conn: Connection) -> None:  # pyright: ignore[reportUnusedFunction]
+        conn.exec_driver_sql("BEGIN IMMEDIATE" if writer else "BEGIN")
+
+
+def build_sqlite_engines(database: DatabaseSettings, *, echo: bool = False) -> tuple[AsyncEngine, AsyncEngine]:
+    """
+    Build the writer and reader engines for single-node SQLite mode.
+    All writes are serialized through one pooled writer connection while
+    reads fan out across a pool of read-only connections.
+    """
+    if not database.is_sqlite or database.is_memory:
+        raise ValueError("SQLite WAL mode requires a file-backed SQLite database")
+
+    writer: AsyncEngine = build_engine(
+        database.model_copy(
+            update={
+                "pool_profile": "queue",
+                "pool_size": 1,
+                "pool_max_overflow": 0,
+                "pool_timeout": max(database.pool_timeout, database.sqlite_busy_timeout_ms / 1000),
+            }
+        ),
+        echo=echo,
+    )
+    reader: AsyncEngine = build_engine(
+        database.model_copy(
+            update={
+                "pool_profile": "queue",
+                "pool_size": database.sqlite_reader_pool_size,
+            }
+        ),
+        echo=echo,
+    )
+    attach_sqlite_pragmas(writer, database, writer=True)
+    attach_sqlite_pragmas(reader, database, writer=False)
+    return writer, reader
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Callable
+from types import TracebackType
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_session, shard_router
+from app.db.sharding import ShardedUnitOfWork
+
+
+class UnitOfWork:
+    """
+    Request-scoped unit of work shared by every service handling a request.
+    DAOs only flush; the unit of work issues the single commit when the
+    request succeeds and rolls back when it fails.
+    """
+
+    def __init__(self: UnitOfWork, session: AsyncSession) -> None:
+        """Initialize the unit of work around an async session."""
+        self.session: AsyncSession = session
+        self.commit_hooks: list[Callable[[], None]] = []
+        self.rollback_hooks: list[Callable[[], None]] = []
+
+    async def __aenter__(self: UnitOfWork) -> UnitOfWork:
+        """Enter the unit of work."""
+        return self
+
+    async def __aexit__(
+        self: UnitOfWork,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Commit on success, roll back on error."""
+        if exc_type is None:
+            try:
+                await self.commit()
+            except BaseException:
+                await self.rollback()
+                raise
+        else:
+            await self.rollback()
+
+    async def flush(self: UnitOfWork) -> None:
+        """Send pending changes to the database without committing."""
+        await self.session.flush()
+
+    async def commit(self: UnitOfWork) -> None:
+        """Commit the current transaction, if one was started, then run the commit hooks."""
+        if self.session.in_transaction():
+            await self.session.commit()
+        hooks, self.commit_hooks = self.commit_hooks, []
+        self.rollback_hooks.clear()
+        for hook in hooks:
+            hook()
+
+    async def rollback(self: UnitOfWork) -> None:
+        """Roll back the current transaction, if one was started, then run the rollback hooks."""
+        try:
+            if self.session.in_transaction():
+                await self.session.rollback()
+        finally:
+            hooks, self.rollback_hooks = self.rollback_hooks, []
+            self.commit_hooks.clear()
+            for hook in hooks:
+                hook()
+
+    def on_commit(self: UnitOfWork, hook: Callable[[], None]) -> None:
+        """Register a callback publishing in-process side effects once the request commits."""
+        self.commit_hooks.append(hook)
+
+    def on_rollback(self: UnitOfWork, hook: Callable[[], None]) -> None:
+        """Register a callback that undoes in-process side effects if the request rolls back."""
+        self.rollback_hooks.append(hook)
+
+
+async def get_unit_of_work(
+    session: AsyncSession = Depends(get_async_session),
+) -> AsyncGenerator[UnitOfWork, None]:
+    """Dependency providing the request's unit of work; commits once at the end."""
+    async with UnitOfWork(session) as uow:
+        yield uow
+
+
+async def get_sharded_unit_of_work() -> AsyncGenerator[ShardedUnitOfWork | None, None]:
+    """Dependency providing the request's shard-spanning unit of work, or None when unsharded."""
+    if shard_router is None:
+        yield None
+        return
+
+    async with shard_router.unit_of_work() as uow:
+        yield uow
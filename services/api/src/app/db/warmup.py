@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from time import perf_counter
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.core.settings import DatabaseSettings
+import app.db.entities  # noqa: F401  # register all mapped classes before configuring
+
+
+@dataclass
+class WarmupReport:
+    """Outcome of a startup warm-up run."""
+
+    connections: int
+    mappers_seconds: float
+    connections_seconds: float
+
+    @property
+    def total_seconds(self: WarmupReport) -> float:
+        """Total time spent warming up."""
+        return self.mappers_seconds + self.connections_seconds
+
+
+def warmup_connection_count(database: DatabaseSettings) -> int:
+    """How many connections to pre-open for the configured pool profile."""
+    if database.pool_warmup_connections == 0:
+        return 0
+    if database.sqlite_wal:
+        return database.pool_warmup_connections
+    if database.resolved_pool_profile == "queue":
+        return min(database.pool_warmup_connections, database.pool_size)
+    # Null and static pools do not retain extra connections; validate a single one
+    return 1
+
+
+async def _open_and_validate(engine: AsyncEngine) -> AsyncConnection:
+    """Check out a connection and run a validation query on it."""
+    conn: AsyncConnection = await engine.connect()
+    try:
+        await conn.execute(text("SELECT 1"))
+    except Exception:
+        await conn.close()
+        raise
+    return conn
+
+
+async def warm_up(engine: AsyncEngine, connections: int) -> WarmupReport:
+    """
+    Configure all ORM mappers and pre-open validated connections so the
+    first requests to a fresh worker do not pay for either.
+    """
+    start: float = perf_counter()
+    configure_mappers()
+    mappers_seconds: float = perf_counter() - start
+
+    pool: Pool = engine.sync_engine.pool
+    if isinstance(pool, QueuePool):
+        # Never ask for more simultaneous connections than the pool keeps
+        connections = min(connections, pool.size())
+
+    start = perf_counter()
+    if connections > 0:
+        # Hold every connection open at once so the pool creates distinct ones
+        results = await asyncio.gather(
+            *(_open_and_validate(engine) for _ in range(connections)),
+            return_exceptions=True,
+        )
+        opened: list[AsyncConnection] = [r for r in results if isinstance(r, AsyncConnection)]
+        await asyncio.gather(*(conn.close() for conn in opened))
+        failures: list[BaseException] = [r for r in results if isinstance(r, BaseException)]
+        if failures:
+            raise failures[0]
+
+    return WarmupReport(
+        connections=connections,
+        mappers_seconds=mappers_seconds,
+        connections_seconds=perf_counter() - start,
+    )
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, Mapping, Sequence
+
+from .models import BoundingBox, DatasetInfo, DatasetSlice
+
+
+class DatasetRepository(ABC):
+    """Abstract repository for large tabular/geospatial datasets attached to maps."""
+
+    @abstractmethod
+    async def write(
+        self: DatasetRepository,
+        map_id: int,
+        name: str,
+        columns: Mapping[str, Sequence[Any]],
+        x: str | None = None,
+        y: str | None = None,
+    ) -> DatasetInfo:
+        """Store a dataset, replacing any existing one with the same name."""
+        ...
+
+    @abstractmethod
+    async def info(self: DatasetRepository, map_id: int, name: str) -> DatasetInfo | None:
+        """Describe a dataset."""
+        ...
+
+    @abstractmethod
+    async def read_rows(
+        self: DatasetRepository,
+        map_id: int,
+        name: str,
+        start: int,
+        stop: int,
+        columns: Sequence[str] | None = None,
+    ) -> DatasetSlice | None:
+        """Read the half-open row range [start, stop)."""
+        ...
+
+    @abstractmethod
+    async def read_bbox(
+        self: DatasetRepository,
+        map_id: int,
+        name: str,
+        bbox: BoundingBox,
+        columns: Sequence[str] | None = None,
+    ) -> DatasetSlice | None:
+        """Read the rows whose x/y fall inside a bounding box."""
+        ...
+
+    @abstractmethod
+    async def delete(self: DatasetRepository, map_id: int, name: str) -> bool:
+        """Delete a dataset."""
+        ...
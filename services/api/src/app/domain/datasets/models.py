@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel, model_validator
+
+
+class BoundingBox(BaseModel):
+    """Inclusive axis-aligned box over a dataset's x/y columns."""
+
+    min_x: float
+    min_y: float
+    max_x: float
+    max_y: float
+
+    @model_validator(mode="after")
+    def check_order(self: BoundingBox) -> BoundingBox:
+        """Reject boxes whose minimum exceeds their maximum."""
+        if self.min_x > self.max_x or self.min_y > self.max_y:
+            raise ValueError("Bounding box minimum must not exceed its maximum")
+        return self
+
+
+class DatasetInfo(BaseModel):
+    """Shape of a stored dataset."""
+
+    map_id: int
+    name: str
+    rows: int
+    columns: dict[str, str]  # column name -> dtype
+    x: str | None = None
+    y: str | None = None
+
+    @property
+    def is_spatial(self: DatasetInfo) -> bool:
+        """Whether the dataset supports bounding-box reads."""
+        return self.x is not None and self.y is not None
+
+
+class DatasetSlice(BaseModel):
+    """Rows read from a dataset, column-oriented, with their row numbers."""
+
+    map_id: int
+    name: str
+    row_ids: list[int]
+    columns: dict[str, list[Any]]
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+
+class NotOwnerError(Exception):
+    """
+    A write restricted to an owner matched a row that belongs to someone else.
+    Repositories raise it so callers can tell forbidden apart from not found,
+    which stays a None result.
+    """
+
+    def __init__(self: NotOwnerError, id: int) -> None:
+        super().__init__(f"Row {id} belongs to another user")
+        self.id: int = id
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any
+
+# Where a saved kepler.gl map keeps its layers
+LAYERS_PATH: tuple[str, ...] = ("config", "visState", "layers")
+
+
+def _nest(path: tuple[str, ...], value: Any) -> Any:
+    """Wrap value in one object per path key, outermost first."""
+    for key in reversed(path):
+        value = {key: value}
+    return value
+
+
+def contains(document: Any, fragment: Any) -> bool:
+    """
+    JSONB containment (document @> fragment): objects contain a subset of
+    their keys with contained values, arrays contain every fragment element
+    somewhere, scalars must be equal.
+    """
+    if isinstance(fragment, dict):
+        return isinstance(document, dict) and all(
+            key in document and contains(document[key], value) for key, value in fragment.items()
+        )
+    if isinstance(fragment, list):
+        return isinstance(document, list) and all(any(contains(d, f) for d in document) for f in fragment)
+    if isinstance(document, bool) or isinstance(fragment, bool):
+        return document is fragment
+    return document == fragment
+
+
+@dataclass(frozen=True)
+class StateFilter:
+    """
+    Criteria on a map's saved state; a map matches when every given criterion
+    holds. Each criterion is a set of JSON fragments, one of which the state
+    must contain, so databases answer it with containment queries.
+    """
+
+    layer_type: str | None = None
+    dataset_id: str | None = None
+    config: dict[str, Any] | None = None
+
+    def __bool__(self: StateFilter) -> bool:
+        """Whether any criterion is set."""
+        return any(c is not None for c in (self.layer_type, self.dataset_id, self.config))
+
+    def criteria(self: StateFilter) -> list[list[Any]]:
+        """The alternatives of fragments for every criterion set."""
+        criteria: list[list[Any]] = []
+        if self.layer_type is not None:
+            criteria.append([_nest(LAYERS_PATH, [{"type": self.layer_type}])])
+        if self.dataset_id is not None:
+            criteria.append(
+                [
+                    _nest(LAYERS_PATH, [{"config": {"dataId": self.dataset_id}}]),
+                    {"datasets": [{"data": {"id": self.dataset_id}}]},
+                ]
+            )
+        if self.config is not None:
+            criteria.append([{"config": self.config}])
+        return criteria
+
+    def matches(self: StateFilter, state: str) -> bool:
+        """Evaluate the filter on a state document in Python; invalid JSON never matches."""
+        try:
+            document: Any = json.loads(state)
+        except ValueError:
+            return False
+        return all(any(contains(document, f) for f in alternatives) for alternatives in self.criteria())
@@ -3,7 +3,11 @@
 from abc import ABC, abstractmethod
 from typing import Sequence
 
-from .models import MapDomain
+from app.domain.pagination import Cursor, RankCursor, Ranked
+
+from .filters import StateFilter
+from .models import MapDomain, MapFragmentsDomain, MapSummaryDomain
+from .paths import StatePath
 
 
 class MapRepository(ABC):
@@ -26,13 +30,76 @@ async def get(self: MapRepository, id: int) -> MapDomain | None:
         ...
 
     @abstractmethod
-    async def list(self: MapRepository) -> Sequence[MapDomain]:
-        """List all maps (admin only)."""
+    async def get_many(self: MapRepository, ids: Sequence[int]) -> list[MapDomain | None]:
+        """Get maps by ID in the order given; None marks a missing map."""
+        ...
+
+    @abstractmethod
+    async def get_fragments(self: MapRepository, id: int, paths: Sequence[StatePath]) -> MapFragmentsDomain | None:
+        """Retrieve the values at paths of a map's state; paths with no value are left out."""
+        ...
+
+    @abstractmethod
+    async def list(
+        self: MapRepository,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[MapDomain]:
+        """List maps newest first by (updated_at, id); all of them, or up to limit after a cursor."""
+        ...
+
+    @abstractmethod
+    async def list_by_user(
+        self: MapRepository,
+        user_id: str,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[MapDomain]:
+        """List the maps of a specific user, ordered and paged like list()."""
+        ...
+
+    @abstractmethod
+    async def list_summaries(
+        self: MapRepository,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[MapSummaryDomain]:
+        """List maps without their state, optionally only one user's, ordered and paged like list()."""
+        ...
+
+    @abstractmethod
+    async def list_matching(
+        self: MapRepository,
+        state: StateFilter,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[MapSummaryDomain]:
+        """List maps whose state matches a filter without their state, ordered and paged like list()."""
         ...
 
     @abstractmethod
-    async def list_by_user(self: MapRepository, user_id: str) -> Sequence[MapDomain]:
-        """List all maps belonging to a specific user."""
+    async def search(
+        self: MapRepository,
+        query: str,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: RankCursor | None = None,
+    ) -> list[Ranked[MapSummaryDomain]]:
+        """Maps whose name or description fuzzily matches query, optionally only one user's, best first."""
+        ...
+
+    @abstractmethod
+    async def upsert(
+        self: MapRepository,
+        id: int | None,
+        user_id: str,
+        name: str,
+        description: str,
+        state: str,
+    ) -> tuple[MapDomain, bool] | None:
+        """Create a map, or update it when it exists and user_id owns it; None when someone else does."""
         ...
 
     @abstractmethod
@@ -42,8 +109,22 @@ async def update(
         name: str,
         description: str,
         state: str,
+        owner: str | None = None,
     ) -> MapDomain | None:
-        """Update a map by ID."""
+        """
+        Update a map by ID; None when it does not exist. With an owner, only
+        that user's map is updated and NotOwnerError is raised for anyone else's.
+        """
+        ...
+
+    @abstractmethod
+    async def remove(self: MapRepository, id: int, owner: str | None = None) -> MapDomain | None:
+        """Delete a map by ID and return it; None when missing, NotOwnerError when owner is someone else."""
+        ...
+
+    @abstractmethod
+    async def remove_many(self: MapRepository, ids: list[int], owner: str | None = None) -> list[MapDomain]:
+        """Delete maps by ID and return those deleted; with an owner, other users' maps are skipped."""
         ...
 
     @abstractmethod
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import BaseModel
 
@@ -37,3 +37,43 @@ def from_entity(cls: type[MapDomain], db_obj: Map) -> MapDomain:
     model_config = {
         "from_attributes": True,  # Enables .model_validate from SQLAlchemy object
     }
+
+
+class MapSummaryDomain(BaseModel):
+    """Domain model for a map without its state, for listings that only show metadata."""
+
+    id: int
+    user_id: str
+    name: str
+    description: str
+    user: Optional[OIDCUser] = None
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_entity(cls: type[MapSummaryDomain], db_obj: Map | MapDomain) -> MapSummaryDomain:
+        """Create a summary from a DB entity loaded without its state, or from a full map."""
+        return cls(
+            id=db_obj.id,
+            user_id=db_obj.user_id,
+            name=db_obj.name,
+            description=db_obj.description,
+            user=None,
+            created_at=db_obj.created_at,
+            updated_at=db_obj.updated_at,
+        )
+
+    model_config = {
+        "from_attributes": True,
+    }
+
+
+class MapFragmentsDomain(BaseModel):
+    """Domain model for parts of a map's state, keyed by the path they were read from."""
+
+    id: int
+    user_id: str
+    fragments: dict[str, Any]
+    user: Optional[OIDCUser] = None
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any
+
+# Longest path accepted; kepler.gl states nest a handful of levels deep
+MAX_PATH_SEGMENTS: int = 32
+
+_KEY: str = r'[^.\[\]"\\]+'
+_STATE_PATH: re.Pattern[str] = re.compile(rf"{_KEY}(?:\.{_KEY}|\[\d+\])*")
+_SEGMENT: re.Pattern[str] = re.compile(rf"({_KEY})|\[(\d+)\]")
+
+
+@dataclass(frozen=True)
+class StatePath:
+    """
+    A path into a map's saved state: object keys joined by dots, array indexes
+    in brackets, e.g. config.visState.layers[0].config. Keys cannot contain
+    dots, brackets, quotes or backslashes.
+    """
+
+    text: str
+    segments: tuple[str | int, ...]
+
+    @classmethod
+    def parse(cls: type[StatePath], text: str) -> StatePath:
+        """Parse a path; raises ValueError when it is malformed or too long."""
+        if not _STATE_PATH.fullmatch(text):
+            raise ValueError(f"Invalid state path: {text!r}")
+        segments: tuple[str | int, ...] = tuple(
+            key if key else int(index) for key, index in _SEGMENT.findall(text)
+        )
+        if len(segments) > MAX_PATH_SEGMENTS:
+            raise ValueError(f"State path longer than {MAX_PATH_SEGMENTS} segments: {text!r}")
+        return cls(text=text, segments=segments)
+
+    def extract(self: StatePath, document: Any) -> Any:
+        """The value at this path of a parsed document; raises LookupError when there is none."""
+        for segment in self.segments:
+            if isinstance(segment, int) and isinstance(document, list) and segment < len(document):
+                document = document[segment]
+            elif isinstance(segment, str) and isinstance(document, dict) and segment in document:
+                document = document[segment]
+            else:
+                raise LookupError(self.text)
+        return document
@@ -3,6 +3,8 @@
 from abc import ABC, abstractmethod
 from typing import Sequence
 
+from app.domain.pagination import Cursor, RankCursor, Ranked
+
 from .models import MessageDomain
 
 class MessageRepository(ABC):
@@ -10,17 +12,64 @@ class MessageRepository(ABC):
     @abstractmethod
     async def create(self: MessageRepository, user_id: str, content: str) -> MessageDomain: ...
 
+    @abstractmethod
+    async def create_many(self: MessageRepository, user_id: str, contents: Sequence[str]) -> list[MessageDomain]:
+        """Create many messages for one user, returned in the order given."""
+        ...
+
     @abstractmethod
     async def get(self: MessageRepository, id: int) -> MessageDomain | None: ...
 
     @abstractmethod
-    async def list(self: MessageRepository) -> Sequence[MessageDomain]: ...
+    async def get_many(self: MessageRepository, ids: Sequence[int]) -> list[MessageDomain | None]:
+        """Get messages by ID in the order given; None marks a missing message."""
+        ...
+
+    @abstractmethod
+    async def list(
+        self: MessageRepository,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[MessageDomain]: ...
+
+    @abstractmethod
+    async def search(
+        self: MessageRepository,
+        query: str,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: RankCursor | None = None,
+    ) -> list[Ranked[MessageDomain]]:
+        """Messages containing every word of query, optionally only one user's, best match first."""
+        ...
+
+    @abstractmethod
+    async def update(
+        self: MessageRepository,
+        id: int,
+        content: str,
+        owner: str | None = None,
+    ) -> MessageDomain | None:
+        """Update a message by ID; with an owner, raises NotOwnerError for anyone else's message."""
+        ...
+
+    @abstractmethod
+    async def remove(self: MessageRepository, id: int, owner: str | None = None) -> MessageDomain | None:
+        """Delete a message by ID and return it; None when missing, NotOwnerError when owner is someone else."""
+        ...
 
     @abstractmethod
-    async def update(self: MessageRepository, id: int, content: str) -> MessageDomain | None: ...
+    async def remove_many(self: MessageRepository, ids: list[int], owner: str | None = None) -> list[MessageDomain]:
+        """Delete messages by ID and return those deleted; with an owner, other users' messages are skipped."""
+        ...
 
     @abstractmethod
     async def delete(self: MessageRepository, id: int) -> bool: ...
 
     @abstractmethod
-    async def list_by_user(self: MessageRepository, user_id: str) -> Sequence[MessageDomain]: ...
+    async def list_by_user(
+        self: MessageRepository,
+        user_id: str,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[MessageDomain]: ...
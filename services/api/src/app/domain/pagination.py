@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Generic, Protocol, Sequence, TypeVar
+
+
+class Keyed(Protocol):
+    """Anything listed in (updated_at, id) order."""
+
+    @property
+    def id(self: Keyed) -> int: ...
+
+    @property
+    def updated_at(self: Keyed) -> datetime: ...
+
+
+K = TypeVar("K", bound=Keyed)
+
+
+def as_utc(value: datetime) -> datetime:
+    """An aware UTC timestamp; naive ones are taken as UTC, which is how SQLite stores them."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """
+    Keyset position in a listing ordered by (updated_at, id) descending.
+    The next page holds the rows strictly after it, so its cost does not
+    grow with the page number the way OFFSET does.
+    """
+
+    updated_at: datetime
+    id: int
+
+    @classmethod
+    def after(cls: type[Cursor], row: Keyed) -> Cursor:
+        """Cursor positioned after a listed row."""
+        return cls(updated_at=row.updated_at, id=row.id)
+
+    def encode(self: Cursor) -> str:
+        """Opaque URL-safe token for API clients."""
+        raw: bytes = json.dumps([self.updated_at.isoformat(), self.id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls: type[Cursor], token: str) -> Cursor:
+        """Parse a token produced by encode(), with its timestamp in UTC; raises ValueError when malformed."""
+        try:
+            updated_at, id = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            return cls(updated_at=as_utc(datetime.fromisoformat(updated_at)), id=int(id))
+        except (binascii.Error, TypeError, ValueError) as err:
+            raise ValueError("Invalid pagination cursor") from err
+
+
+@dataclass
+class Page(Generic[K]):
+    """One page of a listing and the cursor of the next one, if any."""
+
+    items: list[K]
+    next: Cursor | None = None
+
+
+def to_page(rows: Sequence[K], limit: int) -> Page[K]:
+    """Build a page from up to limit + 1 rows; the extra row only signals that another page exists."""
+    items: list[K] = list(rows[:limit])
+    return Page(items=items, next=Cursor.after(items[-1]) if len(rows) > limit else None)
+
+
+@dataclass(frozen=True)
+class RankCursor:
+    """Keyset position in a ranked listing ordered by (rank, id) descending, such as search results."""
+
+    rank: float
+    id: int
+
+    def encode(self: RankCursor) -> str:
+        """Opaque URL-safe token for API clients; floats round-trip exactly through JSON."""
+        raw: bytes = json.dumps([self.rank, self.id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls: type[RankCursor], token: str) -> RankCursor:
+        """Parse a token produced by encode(); raises ValueError when malformed."""
+        try:
+            rank, id = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            if not isinstance(rank, (int, float)) or isinstance(rank, bool):
+                raise TypeError(rank)
+            return cls(rank=float(rank), id=int(id))
+        except (binascii.Error, TypeError, ValueError) as err:
+            raise ValueError("Invalid pagination cursor") from err
+
+
+@dataclass
+class Ranked(Generic[K]):
+    """A row with its relevance; higher ranks first."""
+
+    item: K
+    rank: float
+
+
+@dataclass
+class RankedPage(Generic[K]):
+    """One page of ranked rows and the cursor of the next one, if any."""
+
+    items: list[Ranked[K]]
+    next: RankCursor | None = None
+
+
+def to_ranked_page(rows: Sequence[Ranked[K]], limit: int) -> RankedPage[K]:
+    """Build a ranked page from up to limit + 1 rows; the extra row only signals that another page exists."""
+    items: list[Ranked[K]] = list(rows[:limit])
+    if len(rows) <= limit:
+        return RankedPage(items=items)
+    return RankedPage(items=items, next=RankCursor(rank=items[-1].rank, id=items[-1].item.id))
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Mapping, Sequence
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+BatchFn = Callable[[list[K]], Awaitable[Mapping[K, V]]]
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    Request-scoped loader that coalesces every load() issued in the same
+    event-loop tick into one call of the batch function (one `WHERE id IN
+    (...)` query) and memoizes the result, including misses, for the rest of
+    its lifetime. Batches run one at a time because they share a session;
+    a batch nobody waits for any more is cancelled, and the last caller to
+    leave waits for it to stop so the session is free again.
+    """
+
+    def __init__(self: BatchLoader[K, V], batch_fn: BatchFn[K, V], max_batch_size: int = 500) -> None:
+        """Initialize the loader with a function resolving a list of keys to the values found."""
+        self.batch_fn: BatchFn[K, V] = batch_fn
+        self.max_batch_size: int = max_batch_size
+        self.cache: dict[K, asyncio.Future[V | None]] = {}
+        self.queue: list[K] = []
+        self.lock: asyncio.Lock = asyncio.Lock()
+        self.tasks: set[asyncio.Task[None]] = set()
+        # Callers awaiting each pending future, and the batch task resolving it
+        self.waiters: dict[asyncio.Future[V | None], int] = {}
+        self.batches: dict[asyncio.Future[V | None], asyncio.Task[None]] = {}
+
+    async def load(self: BatchLoader[K, V], key: K) -> V | None:
+        """Return the value for a key, or None when the batch function did not find it."""
+        future: asyncio.Future[V | None] | None = self.cache.get(key)
+        if future is None:
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            future = self.cache[key] = loop.create_future()
+            self.queue.append(key)
+            if len(self.queue) == 1:
+                loop.call_soon(self._dispatch)
+        self.waiters[future] = self.waiters.get(future, 0) + 1
+        try:
+            # Shield the shared future so one cancelled caller does not fail the others
+            return await asyncio.shield(future)
+        finally:
+            self.waiters[future] -= 1
+            if not self.waiters[future]:
+                del self.waiters[future]
+            if not future.done():
+                await self._abandon(future)
+
+    async def load_many(self: BatchLoader[K, V], keys: Sequence[K]) -> list[V | None]:
+        """Return the values for several keys in key order, loaded in a single batch."""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self: BatchLoader[K, V], key: K, value: V | None) -> None:
+        """Record a known value (None for a deleted row) so later loads skip the query."""
+        future: asyncio.Future[V | None] = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self.cache[key] = future
+
+    def clear(self: BatchLoader[K, V], key: K | None = None) -> None:
+        """Forget one memoized key, or every key."""
+        if key is None:
+            self.cache = {k: f for k, f in self.cache.items() if not f.done()}
+        elif key in self.cache and self.cache[key].done():
+            del self.cache[key]
+
+    def _dispatch(self: BatchLoader[K, V]) -> None:
+        """Start loading every key queued during the tick."""
+        keys, self.queue = self.queue, []
+        futures: dict[K, asyncio.Future[V | None]] = {key: self.cache[key] for key in keys}
+        task: asyncio.Task[None] = asyncio.create_task(self._run(keys, futures))
+        self.tasks.add(task)
+        for future in futures.values():
+            self.batches[future] = task
+
+        def finished(task: asyncio.Task[None]) -> None:
+            """Stop tracking the batch once it settled, forgetting keys it left unresolved."""
+            self.tasks.discard(task)
+            for future in futures.values():
+                self.batches.pop(future, None)
+            self._forget(futures)
+
+        task.add_done_callback(finished)
+
+    async def _abandon(self: BatchLoader[K, V], future: asyncio.Future[V | None]) -> None:
+        """Cancel the batch resolving a future once none of its futures has a waiter, and wait for it to stop."""
+        task: asyncio.Task[None] | None = self.batches.get(future)
+        if task is None or any(self.batches.get(f) is task for f in self.waiters):
+            return
+        task.cancel()
+        await asyncio.wait({task})
+
+    def _forget(self: BatchLoader[K, V], futures: Mapping[K, asyncio.Future[V | None]]) -> None:
+        """Cancel unresolved futures and unmemoize their keys so later loads query again."""
+        for key, future in futures.items():
+            if future.done():
+                continue
+            if self.cache.get(key) is future:
+                del self.cache[key]
+            future.cancel()
+
+    async def _run(self: BatchLoader[K, V], keys: list[K], futures: dict[K, asyncio.Future[V | None]]) -> None:
+        """Resolve queued keys in chunks of max_batch_size; failed or cancelled keys are not memoized."""
+        async with self.lock:
+            for start in range(0, len(keys), self.max_batch_size):
+                chunk: list[K] = keys[start:start + self.max_batch_size]
+                try:
+                    found: Mapping[K, V] = await self.batch_fn(chunk)
+                except Exception as err:
+                    for key in chunk:
+                        if self.cache.get(key) is futures[key]:
+                            del self.cache[key]
+                        if not futures[key].done():
+                            futures[key].set_exception(err)
+                    continue
+                for key in chunk:
+                    if not futures[key].done():
+                        futures[key].set_result(found.get(key))
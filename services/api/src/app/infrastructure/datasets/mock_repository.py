@@ -0,0 +1,101 @@
+from __future__ import annotations
+from typing import Any, Mapping, Sequence
+
+from app.domain.datasets.interfaces import DatasetRepository
+from app.domain.datasets.models import BoundingBox, DatasetInfo, DatasetSlice
+
+class MockDatasetRepository(DatasetRepository):
+    """In-memory implementation of DatasetRepository for testing purposes."""
+
+    def __init__(self: MockDatasetRepository) -> None:
+        """Initialize an empty mock dataset repository."""
+        self.datasets: dict[tuple[int, str], tuple[DatasetInfo, dict[str, list[Any]]]] = {}
+
+    async def write(
+        self: MockDatasetRepository,
+        map_id: int,
+        name: str,
+        columns: Mapping[str, Sequence[Any]],
+        x: str | None = None,
+        y: str | None = None,
+    ) -> DatasetInfo:
+        """Store a dataset in memory."""
+        lengths: set[int] = {len(values) for values in columns.values()}
+        if len(lengths) != 1 or 0 in lengths:
+            raise ValueError("Dataset columns must be non-empty and of equal length")
+        info = DatasetInfo(
+            map_id=map_id,
+            name=name,
+            rows=lengths.pop(),
+            columns={c: type(values[0]).__name__ for c, values in columns.items()},
+            x=x,
+            y=y,
+        )
+        self.datasets[(map_id, name)] = (info, {c: list(values) for c, values in columns.items()})
+        return info
+
+    async def info(self: MockDatasetRepository, map_id: int, name: str) -> DatasetInfo | None:
+        """Describe a stored dataset."""
+        stored = self.datasets.get((map_id, name))
+        return stored[0] if stored else None
+
+    async def read_rows(
+        self: MockDatasetRepository,
+        map_id: int,
+        name: str,
+        start: int,
+        stop: int,
+        columns: Sequence[str] | None = None,
+    ) -> DatasetSlice | None:
+        """Slice a row range."""
+        stored = self.datasets.get((map_id, name))
+        if stored is None:
+            return None
+        info, data = stored
+        row_ids: list[int] = list(range(max(start, 0), min(stop, info.rows)))
+        return self._slice(map_id, name, data, row_ids, columns)
+
+    async def read_bbox(
+        self: MockDatasetRepository,
+        map_id: int,
+        name: str,
+        bbox: BoundingBox,
+        columns: Sequence[str] | None = None,
+    ) -> DatasetSlice | None:
+        """Filter rows by bounding box with a linear scan."""
+        stored = self.datasets.get((map_id, name))
+        if stored is None:
+            return None
+        info, data = stored
+        if info.x is None or info.y is None:
+            raise ValueError("Dataset has no x/y columns")
+        xs, ys = data[info.x], data[info.y]
+        row_ids: list[int] = [
+            i for i in range(info.rows)
+            if bbox.min_x <= xs[i] <= bbox.max_x and bbox.min_y <= ys[i] <= bbox.max_y
+        ]
+        return self._slice(map_id, name, data, row_ids, columns)
+
+    async def delete(self: MockDatasetRepository, map_id: int, name: str) -> bool:
+        """Delete a stored dataset."""
+        return self.datasets.pop((map_id, name), None) is not None
+
+    def _slice(
+        self: MockDatasetRepository,
+        map_id: int,
+        name: str,
+        data: dict[str, list[Any]],
+        row_ids: list[int],
+        columns: Sequence[str] | None,
+    ) -> DatasetSlice:
+        """Project the selected rows and columns."""
+        selected: list[str] = list(columns) if columns else list(data)
+        unknown: list[str] = [c for c in selected if c not in data]
+        if unknown:
+            raise ValueError(f"Unknown dataset columns: {', '.join(unknown)}")
+        return DatasetSlice(
+            map_id=map_id,
+            name=name,
+            row_ids=row_ids,
+            columns={c: [data[c][i] for i in row_ids] for c in selected},
+        )
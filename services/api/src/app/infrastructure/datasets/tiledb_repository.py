@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+import tiledb
+
+from app.domain.datasets.interfaces import DatasetRepository
+from app.domain.datasets.models import BoundingBox, DatasetInfo, DatasetSlice
+
+# Dimension of the dense rows array and attribute of the sparse points array holding the row number
+ROW_KEY: str = "_row"
+# Dimensions of the sparse points array; reserved so they never clash with a column name
+X_KEY: str = "_x"
+Y_KEY: str = "_y"
+RESERVED_COLUMNS: frozenset[str] = frozenset({ROW_KEY, X_KEY, Y_KEY})
+ROWS_ARRAY: str = "rows"
+POINTS_ARRAY: str = "points"
+
+
+def _to_array(values: Sequence[Any]) -> np.ndarray:
+    """Convert a column to a numpy array; anything non-numeric is stored as UTF-8 text."""
+    array: np.ndarray = np.asarray(values)
+    if array.dtype.kind not in "biuf" and array.ndim == 1:
+        return np.asarray([str(v) for v in values], dtype=object)
+    return array
+
+
+def _dtype_name(array: np.ndarray) -> str:
+    """Name recorded for a column's type in the dataset metadata."""
+    return "str" if array.dtype == object else array.dtype.name
+
+
+def _attr(name: str, array: np.ndarray, filters: tiledb.FilterList) -> tiledb.Attr:
+    """TileDB attribute for a column."""
+    if array.dtype == object:
+        return tiledb.Attr(name=name, dtype=str, var=True, filters=filters)
+    return tiledb.Attr(name=name, dtype=array.dtype, filters=filters)
+
+
+def _bounds(values: np.ndarray) -> tuple[float, float]:
+    """Float dimension domain covering every value."""
+    low, high = float(values.min()), float(values.max())
+    return (low, high) if high > low else (low, low + 1.0)
+
+
+class TileDBDatasetRepository(DatasetRepository):
+    """
+    DatasetRepository storing each map dataset as TileDB arrays under a root URI.
+    A dense 1-D array keyed by row number serves row-range slices; spatial
+    datasets also get a sparse 2-D array over x/y in Hilbert order, so
+    bounding-box reads only touch the tiles that intersect the box.
+    TileDB calls block, so they run in worker threads.
+    """
+
+    def __init__(
+        self: TileDBDatasetRepository,
+        root_uri: str,
+        tile_rows: int = 65536,
+        ctx: tiledb.Ctx | None = None,
+    ) -> None:
+        """Initialize the repository under a local path or object store URI."""
+        self.root_uri: str = root_uri.rstrip("/")
+        self.tile_rows: int = tile_rows
+        self.ctx: tiledb.Ctx = ctx or tiledb.default_ctx()
+        self.filters: tiledb.FilterList = tiledb.FilterList([tiledb.ZstdFilter(level=3)])
+
+    def _uri(self: TileDBDatasetRepository, map_id: int, name: str) -> str:
+        """Group URI of one dataset."""
+        return f"{self.root_uri}/map-{map_id}/{name}"
+
+    async def write(
+        self: TileDBDatasetRepository,
+        map_id: int,
+        name: str,
+        columns: Mapping[str, Sequence[Any]],
+        x: str | None = None,
+        y: str | None = None,
+    ) -> DatasetInfo:
+        """Store a dataset, replacing any existing one with the same name."""
+        return await asyncio.to_thread(self._write, map_id, name, columns, x, y)
+
+    async def info(self: TileDBDatasetRepository, map_id: int, name: str) -> DatasetInfo | None:
+        """Describe a dataset from its array schema and metadata."""
+        return await asyncio.to_thread(self._info, map_id, name)
+
+    async def read_rows(
+        self: TileDBDatasetRepository,
+        map_id: int,
+        name: str,
+        start: int,
+        stop: int,
+        columns: Sequence[str] | None = None,
+    ) -> DatasetSlice | None:
+        """Read the half-open row range [start, stop) from the dense array."""
+        return await asyncio.to_thread(self._read_rows, map_id, name, start, stop, columns)
+
+    async def read_bbox(
+        self: TileDBDatasetRepository,
+        map_id: int,
+        name: str,
+        bbox: BoundingBox,
+        columns: Sequence[str] | None = None,
+    ) -> DatasetSlice | None:
+        """Read the rows inside a bounding box from the sparse array, in row order."""
+        return await asyncio.to_thread(self._read_bbox, map_id, name, bbox, columns)
+
+    async def delete(self: TileDBDatasetRepository, map_id: int, name: str) -> bool:
+        """Delete a dataset and all of its arrays."""
+        return await asyncio.to_thread(self._remove, self._uri(map_id, name))
+
+    def _write(
+        self: TileDBDatasetRepository,
+        map_id: int,
+        name: str,
+        columns: Mapping[str, Sequence[Any]],
+        x: str | None,
+        y: str | None,
+    ) -> DatasetInfo:
+        """Create the dataset arrays and write every column."""
+        arrays: dict[str, np.ndarray] = {column: _to_array(values) for column, values in columns.items()}
+        flat: list[str] = [column for column, array in arrays.items() if array.ndim != 1]
+        if flat:
+            raise ValueError(f"Dataset columns must be one-dimensional: {', '.join(flat)}")
+        lengths: set[int] = {len(array) for array in arrays.values()}
+        if len(lengths) != 1 or 0 in lengths:
+            raise ValueError("Dataset columns must be non-empty and of equal length")
+        reserved: list[str] = sorted(RESERVED_COLUMNS.intersection(arrays))
+        if reserved:
+            raise ValueError(f"Column names are reserved: {', '.join(reserved)}")
+        if (x is None) != (y is None):
+            raise ValueError("x and y columns must be given together")
+        for axis in (x, y):
+            if axis is not None and (axis not in arrays or arrays[axis].dtype.kind not in "iuf"):
+                raise ValueError(f"Spatial column {axis!r} must be an existing numeric column")
+
+        rows: int = lengths.pop()
+        uri: str = self._uri(map_id, name)
+        self._remove(uri)
+        if "://" not in self.root_uri:
+            Path(uri).parent.mkdir(parents=True, exist_ok=True)
+        tiledb.group_create(uri, ctx=self.ctx)
+
+        dtypes: dict[str, str] = {column: _dtype_name(array) for column, array in arrays.items()}
+        rows_uri: str = f"{uri}/{ROWS_ARRAY}"
+        tiledb.Array.create(
+            rows_uri,
+            tiledb.ArraySchema(
+                domain=tiledb.Domain(
+                    tiledb.Dim(name=ROW_KEY, domain=(0, rows - 1), tile=min(self.tile_rows, rows), dtype=np.uint64)
+                ),
+                attrs=[_attr(column, array, self.filters) for column, array in arrays.items()],
+                sparse=False,
+            ),
+            ctx=self.ctx,
+        )
+        with tiledb.open(rows_uri, "w", ctx=self.ctx) as array:
+            array[:] = arrays
+            array.meta["columns"] = json.dumps(dtypes)
+            array.meta["x"] = x or ""
+            array.meta["y"] = y or ""
+
+        if x is not None and y is not None:
+            xs: np.ndarray = arrays[x].astype(np.float64)
+            ys: np.ndarray = arrays[y].astype(np.float64)
+            others: dict[str, np.ndarray] = {c: a for c, a in arrays.items() if c not in (x, y)}
+            points_uri: str = f"{uri}/{POINTS_ARRAY}"
+            tiledb.Array.create(
+                points_uri,
+                tiledb.ArraySchema(
+                    domain=tiledb.Domain(
+                        tiledb.Dim(name=X_KEY, domain=_bounds(xs), dtype=np.float64),
+                        tiledb.Dim(name=Y_KEY, domain=_bounds(ys), dtype=np.float64),
+                    ),
+                    attrs=[
+                        tiledb.Attr(name=ROW_KEY, dtype=np.uint64, filters=self.filters),
+                        *(_attr(column, array, self.filters) for column, array in others.items()),
+                    ],
+                    sparse=True,
+                    cell_order="hilbert",
+                    capacity=self.tile_rows,
+                    allows_duplicates=True,
+                ),
+                ctx=self.ctx,
+            )
+            with tiledb.open(points_uri, "w", ctx=self.ctx) as array:
+                array[xs, ys] = {ROW_KEY: np.arange(rows, dtype=np.uint64), **others}
+
+        return DatasetInfo(map_id=map_id, name=name, rows=rows, columns=dtypes, x=x, y=y)
+
+    def _info(self: TileDBDatasetRepository, map_id: int, name: str) -> DatasetInfo | None:
+        """Read the dataset shape from the rows array."""
+        rows_uri: str = f"{self._uri(map_id, name)}/{ROWS_ARRAY}"
+        if tiledb.object_type(rows_uri, ctx=self.ctx) != "array":
+            return None
+        with tiledb.open(rows_uri, ctx=self.ctx) as array:
+            return DatasetInfo(
+                map_id=map_id,
+                name=name,
+                rows=int(array.schema.domain.dim(0).domain[1]) + 1,
+                columns=json.loads(array.meta["columns"]),
+                x=array.meta["x"] or None,
+                y=array.meta["y"] or None,
+            )
+
+    def _columns(self: TileDBDatasetRepository, info: DatasetInfo, columns: Sequence[str] | None) -> list[str]:
+        """Requested columns, defaulting to all of them."""
+        selected: list[str] = list(columns) if columns else list(info.columns)
+        unknown: list[str] = [column for column in selected if column not in info.columns]
+        if unknown:
+            raise ValueError(f"Unknown dataset columns: {', '.join(unknown)}")
+        return selected
+
+    def _read_rows(
+        self: TileDBDatasetRepository,
+        map_id: int,
+        name: str,
+        start: int,
+        stop: int,
+        columns: Sequence[str] | None,
+    ) -> DatasetSlice | None:
+        """Slice the dense rows array."""
+        info: DatasetInfo | None = self._info(map_id, name)
+        if info is None:
+            return None
+        selected: list[str] = self._columns(info, columns)
+        start, stop = max(start, 0), min(stop, info.rows)
+        if start >= stop:
+            return DatasetSlice(map_id=map_id, name=name, row_ids=[], columns={c: [] for c in selected})
+
+        with tiledb.open(f"{self._uri(map_id, name)}/{ROWS_ARRAY}", ctx=self.ctx) as array:
+            data: dict[str, np.ndarray] = array.query(attrs=selected)[start:stop]
+        return DatasetSlice(
+            map_id=map_id,
+            name=name,
+            row_ids=list(range(start, stop)),
+            columns={column: data[column].tolist() for column in selected},
+        )
+
+    def _read_bbox(
+        self: TileDBDatasetRepository,
+        map_id: int,
+        name: str,
+        bbox: BoundingBox,
+        columns: Sequence[str] | None,
+    ) -> DatasetSlice | None:
+        """Query the sparse points array with an inclusive x/y range."""
+        info: DatasetInfo | None = self._info(map_id, name)
+        if info is None:
+            return None
+        if not info.is_spatial:
+            raise ValueError("Dataset has no x/y columns")
+        selected: list[str] = self._columns(info, columns)
+
+        with tiledb.open(f"{self._uri(map_id, name)}/{POINTS_ARRAY}", ctx=self.ctx) as array:
+            # Datasets written before X_KEY/Y_KEY were reserved name their dimensions "x"/"y"
+            dims: list[str] = [array.schema.domain.dim(i).name for i in range(2)]
+            axes: dict[str | None, str] = {info.x: dims[0], info.y: dims[1]}
+            attrs: list[str] = [ROW_KEY, *(column for column in selected if column not in axes)]
+            data: dict[str, np.ndarray] = array.query(attrs=attrs, dims=dims).multi_index[
+                bbox.min_x:bbox.max_x, bbox.min_y:bbox.max_y
+            ]
+
+        order: np.ndarray = np.argsort(data[ROW_KEY], kind="stable")
+        result: dict[str, list[Any]] = {}
+        for column in selected:
+            values: np.ndarray = data[axes.get(column, column)][order]
+            if column in axes:
+                values = values.astype(info.columns[column])
+            result[column] = values.tolist()
+        return DatasetSlice(
+            map_id=map_id,
+            name=name,
+            row_ids=data[ROW_KEY][order].tolist(),
+            columns=result,
+        )
+
+    def _remove(self: TileDBDatasetRepository, uri: str) -> bool:
+        """Remove a dataset group and its arrays, if present."""
+        if tiledb.object_type(uri, ctx=self.ctx) is None:
+            return False
+        tiledb.VFS(ctx=self.ctx).remove_dir(uri)
+        return True
@@ -1,22 +1,315 @@
 from __future__ import annotations
 
-from typing import Sequence, Tuple
+import json
+from typing import Any, Mapping, Sequence, Tuple
 
-from sqlalchemy import Result, Select
+from sqlalchemy import (
+    ColumnElement,
+    Delete,
+    Float,
+    Insert,
+    Result,
+    Row,
+    Select,
+    StatementLambdaElement,
+    Text,
+    Update,
+    and_,
+    cast,
+    exists,
+    false,
+    func,
+    lambda_stmt,
+    literal,
+    literal_column,
+    null,
+    or_,
+    delete,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.engine import ScalarResult
 from sqlalchemy.future import select
+from sqlalchemy.orm import load_only
 
 from app.db.entities.map import Map
+from app.db.fuzzy_search import MAP_SEARCH_TEXT, WORD_SIMILARITY_THRESHOLD, word_similarity
+from app.db.json_state import jsonb_literal
+from app.db.pagination import stored_timestamp
+from app.domain.errors import NotOwnerError
+from app.domain.maps.filters import StateFilter
+from app.domain.maps.paths import StatePath
+from app.domain.pagination import Cursor, RankCursor, Ranked
+from app.infrastructure.batch_loader import BatchLoader
 from app.schemas.maps import MapCreate, MapUpdate
 
 
+def paginate_maps(
+    stmt: StatementLambdaElement,
+    limit: int | None = None,
+    after: Cursor | None = None,
+) -> StatementLambdaElement:
+    """Order a map listing newest first and apply the keyset cursor and limit."""
+    if after is not None:
+        updated_at, id = after.updated_at, after.id
+        stmt += lambda s: s.where(tuple_(Map.updated_at, Map.id) < tuple_(stored_timestamp(updated_at), id))
+    stmt += lambda s: s.order_by(Map.updated_at.desc(), Map.id.desc())
+    if limit is not None:
+        stmt += lambda s: s.limit(limit)
+    return stmt
+
+
+def list_maps_stmt(limit: int | None = None, after: Cursor | None = None) -> StatementLambdaElement:
+    """Cached statement selecting maps newest first, optionally one keyset page."""
+    return paginate_maps(lambda_stmt(lambda: select(Map)), limit, after)
+
+
+def list_map_summaries_stmt(
+    user_id: str | None = None,
+    limit: int | None = None,
+    after: Cursor | None = None,
+) -> StatementLambdaElement:
+    """
+    Cached statement listing maps without their state, optionally for one user.
+    The state column is left out of the SELECT and raises if accessed, so a
+    listing never reads or ships the multi-megabyte blob by accident.
+    """
+    stmt: StatementLambdaElement = lambda_stmt(
+        lambda: select(Map).options(
+            load_only(
+                Map.id,
+                Map.user_id,
+                Map.name,
+                Map.description,
+                Map.created_at,
+                Map.updated_at,
+                raiseload=True,
+            )
+        )
+    )
+    if user_id is not None:
+        stmt += lambda s: s.where(Map.user_id == user_id)
+    return paginate_maps(stmt, limit, after)
+
+
+def _sqlite_scalar_equals(json_type: ColumnElement[str], value: ColumnElement[Any], fragment: Any) -> ColumnElement[bool]:
+    """A JSON scalar, given its json_type() and SQL value, equals fragment."""
+    if fragment is None:
+        return json_type == "null"
+    if isinstance(fragment, bool):
+        return json_type == ("true" if fragment else "false")
+    if isinstance(fragment, (int, float)):
+        return and_(json_type.in_(["integer", "real"]), value == fragment)
+    return and_(json_type == "text", value == fragment)
+
+
+def _sqlite_contains(document: ColumnElement[Any], path: str, fragment: Any) -> ColumnElement[bool]:
+    """JSONB containment (@>) of fragment at a path of a JSON document, in SQLite's JSON1 functions."""
+    if isinstance(fragment, dict):
+        if any('"' in key for key in fragment):
+            return false()  # Not addressable in a JSON path
+        return and_(
+            func.json_type(document, path) == "object",
+            *(_sqlite_contains(document, f'{path}."{key}"', value) for key, value in fragment.items()),
+        )
+    if isinstance(fragment, list):
+        clauses: list[ColumnElement[bool]] = [func.json_type(document, path) == "array"]
+        for element in fragment:
+            item = func.json_each(document, path).table_valued("value", "type", "atom")
+            matches: ColumnElement[bool] = (
+                _sqlite_contains(item.c.value, "$", element)
+                if isinstance(element, (dict, list))
+                else _sqlite_scalar_equals(item.c.type, item.c.atom, element)
+            )
+            clauses.append(exists(select(1).select_from(item).where(matches)))
+        return and_(*clauses)
+    return _sqlite_scalar_equals(func.json_type(document, path), func.json_extract(document, path), fragment)
+
+
+def state_filter_clause(dialect: str, state: StateFilter) -> ColumnElement[bool]:
+    """
+    WHERE clause for a state filter. Postgres answers each fragment with a
+    JSONB containment (@>) served by the jsonb_path_ops GIN index; SQLite
+    evaluates the same containment with json_each()/json_extract().
+    """
+
+    def contained(fragment: Any) -> ColumnElement[bool]:
+        if dialect == "postgresql":
+            return Map.state.op("@>")(jsonb_literal(json.dumps(fragment)))
+        return _sqlite_contains(Map.state, "$", fragment)
+
+    return and_(*(or_(*(contained(f) for f in alternatives)) for alternatives in state.criteria()))
+
+
+def list_maps_matching_stmt(
+    dialect: str,
+    state: StateFilter,
+    user_id: str | None = None,
+    limit: int | None = None,
+    after: Cursor | None = None,
+) -> Select[Tuple[Map]]:
+    """Select maps whose state matches a filter, newest first with their state deferred, optionally one keyset page."""
+    stmt = (
+        select(Map)
+        .options(
+            load_only(Map.id, Map.user_id, Map.name, Map.description, Map.created_at, Map.updated_at, raiseload=True)
+        )
+        .where(state_filter_clause(dialect, state))
+    )
+    if user_id is not None:
+        stmt = stmt.where(Map.user_id == user_id)
+    if after is not None:
+        stmt = stmt.where(tuple_(Map.updated_at, Map.id) < tuple_(stored_timestamp(after.updated_at), after.id))
+    stmt = stmt.order_by(Map.updated_at.desc(), Map.id.desc())
+    return stmt.limit(limit) if limit is not None else stmt
+
+
+def state_fragment(dialect: str, path: StatePath) -> ColumnElement[str | None]:
+    """The JSON text at a path of a map's state, NULL when there is none, extracted in the database."""
+    if dialect == "postgresql":
+        # Cast in SQL so asyncpg never decodes the fragment
+        return cast(Map.state.op("#>")(literal([str(s) for s in path.segments], postgresql.ARRAY(Text))), Text)
+    json_path: str = "$" + "".join(f"[{s}]" if isinstance(s, int) else f'."{s}"' for s in path.segments)
+    # -> (SQLite 3.38+) returns JSON text, keeping true/false/null that json_extract turns into SQL values
+    return Map.state.op("->", return_type=Text)(literal(json_path, Text))
+
+
+def get_state_fragments_stmt(dialect: str, id: int, paths: Sequence[StatePath]) -> Select[Any]:
+    """Select a map's owner and timestamps with the fragments of its state at paths, never the whole state."""
+    return (
+        select(Map, *(state_fragment(dialect, p).label(f"fragment_{i}") for i, p in enumerate(paths)))
+        .options(load_only(Map.id, Map.user_id, Map.created_at, Map.updated_at, raiseload=True))
+        .where(Map.id == id)
+    )
+
+
+def search_maps_stmt(
+    query: str,
+    user_id: str | None = None,
+    limit: int | None = None,
+    after: RankCursor | None = None,
+) -> Select[Tuple[Map, float]]:
+    """
+    Postgres statement selecting map summaries whose name and description
+    fuzzily contain query, by pg_trgm word similarity, best first. The <%
+    filter is served by the GIN trigram index on the same expression and
+    honours pg_trgm.word_similarity_threshold.
+    """
+    text: ColumnElement[str] = literal_column(MAP_SEARCH_TEXT)
+    rank: ColumnElement[float] = func.word_similarity(query, text, type_=Float)
+    stmt = (
+        select(Map, rank.label("search_rank"))
+        .options(
+            load_only(Map.id, Map.user_id, Map.name, Map.description, Map.created_at, Map.updated_at, raiseload=True)
+        )
+        .where(literal(query).op("<%")(text))
+    )
+    if user_id is not None:
+        stmt = stmt.where(Map.user_id == user_id)
+    if after is not None:
+        stmt = stmt.where(tuple_(rank, Map.id) < tuple_(after.rank, after.id))
+    stmt = stmt.order_by(literal_column("search_rank").desc(), Map.id.desc())
+    return stmt.limit(limit) if limit is not None else stmt
+
+
+def get_maps_stmt(ids: list[int]) -> StatementLambdaElement:
+    """Cached statement selecting maps by ID; the list is bound as an expanding IN parameter."""
+    return lambda_stmt(lambda: select(Map).where(Map.id.in_(ids)))
+
+
+def upsert_map_stmt(
+    dialect: str,
+    id: int,
+    user_id: str,
+    payload: MapCreate,
+    existing_id: int | None = None,
+) -> Insert:
+    """
+    INSERT ... ON CONFLICT (id) DO UPDATE ... WHERE maps.user_id = :owner RETURNING.
+    An ID that does not exist yet gets a fresh one from the sequence rather than
+    the client's value, so the sequence never collides with client-chosen IDs.
+    Returns no row when the map exists but belongs to someone else. The second
+    column tells inserts from updates: xmax on Postgres; on SQLite, whose
+    RETURNING only sees the new row, the caller selects existing_id first and
+    the statement targets exactly that, so it inserted when existing_id is None.
+    """
+    if dialect == "postgresql":
+        insert = postgresql.insert
+        target_id: ColumnElement[int] = func.coalesce(
+            select(Map.id).where(Map.id == id).scalar_subquery(),
+            func.nextval(func.pg_get_serial_sequence(Map.__tablename__, "id")),
+        )
+        inserted: ColumnElement[bool] = literal_column("xmax = 0")
+    else:
+        insert = sqlite.insert
+        # NULL lets INTEGER PRIMARY KEY assign the next rowid
+        target_id = literal(existing_id) if existing_id is not None else null()
+        inserted = true() if existing_id is None else false()
+
+    stmt = insert(Map).values(
+        id=target_id,
+        user_id=user_id,
+        name=payload.name,
+        description=payload.description,
+        state=payload.state,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[Map.id],
+        set_={
+            "name": stmt.excluded.name,
+            "description": stmt.excluded.description,
+            "state": stmt.excluded.state,
+            "updated_at": func.now(),
+        },
+        where=Map.user_id == stmt.excluded.user_id,
+    ).returning(Map, inserted.label("inserted"))
+
+
+def update_map_stmt(id: int, payload: MapUpdate, owner: str | None = None) -> Update:
+    """UPDATE ... WHERE id = :id [AND user_id = :owner] RETURNING the updated map."""
+    stmt = update(Map).where(Map.id == id)
+    if owner is not None:
+        stmt = stmt.where(Map.user_id == owner)
+    return stmt.values(name=payload.name, description=payload.description, state=payload.state).returning(Map)
+
+
+def delete_maps_stmt(ids: list[int], owner: str | None = None) -> Delete:
+    """DELETE ... WHERE id IN :ids [AND user_id = :owner] RETURNING the deleted maps."""
+    stmt = delete(Map).where(Map.id.in_(ids))
+    if owner is not None:
+        stmt = stmt.where(Map.user_id == owner)
+    return stmt.returning(Map)
+
+
+def list_maps_by_user_stmt(
+    user_id: str,
+    limit: int | None = None,
+    after: Cursor | None = None,
+) -> StatementLambdaElement:
+    """Cached statement selecting the maps of one user newest first; user_id is bound per call."""
+    return paginate_maps(lambda_stmt(lambda: select(Map).where(Map.user_id == user_id)), limit, after)
+
+
 class MapDAO:
-    """Data Access Object (DAO) for the Map entity."""
+    """
+    Data Access Object (DAO) for the Map entity.
+    Writes are flushed but never committed; the request's UnitOfWork owns the commit.
+    Lookups by ID go through a BatchLoader, so gets issued together share one
+    query and a row is read at most once per DAO (i.e. per request).
+    """
 
     def __init__(self: MapDAO, session: AsyncSession) -> None:
         """Initialize the MapDAO with an async session."""
         self.session: AsyncSession = session
+        self.loader: BatchLoader[int, Map] = BatchLoader(self._load)
+
+    async def _load(self: MapDAO, ids: list[int]) -> Mapping[int, Map]:
+        """Fetch a batch of maps by ID."""
+        result: Result[Tuple[Map]] = await self.session.execute(get_maps_stmt(ids))
+        return {m.id: m for m in result.scalars()}
 
     async def create(self: MapDAO, user_id: str, payload: MapCreate) -> Map:
         """Insert a new map record into the database."""
@@ -27,49 +320,165 @@ async def create(self: MapDAO, user_id: str, payload: MapCreate) -> Map:
             state=payload.state,
         )
         self.session.add(db_obj)
-        await self.session.flush()       # ensures ID is generated
-        await self.session.commit()      # commit the transaction
-        await self.session.refresh(db_obj)  # rebind and hydrate from DB
+        await self.session.flush()  # INSERT ... RETURNING hydrates id and timestamps
+        self.loader.prime(db_obj.id, db_obj)
         return db_obj
 
     async def get(self: MapDAO, id: int) -> Map | None:
-        """Get a map by ID."""
-        return await self.session.get(Map, id)
+        """Get a map by ID, batched with concurrent gets and memoized for the request."""
+        return await self.loader.load(id)
+
+    async def get_many(self: MapDAO, ids: Sequence[int]) -> list[Map | None]:
+        """Get maps by ID with one IN query, in the order given; None marks a missing map."""
+        return await self.loader.load_many(ids)
+
+    async def get_state_fragments(
+        self: MapDAO,
+        id: int,
+        paths: Sequence[StatePath],
+    ) -> tuple[Map, list[str | None]] | None:
+        """
+        Get a map with its state deferred, and the JSON text at each path of
+        the state (None where there is none), or None when the map is missing.
+        """
+        dialect: str = self.session.get_bind().dialect.name
+        result: Result[Any] = await self.session.execute(get_state_fragments_stmt(dialect, id, paths))
+        row: Row[Any] | None = result.first()
+        return (row[0], list(row[1:])) if row is not None else None
 
-    async def list(self: MapDAO) -> Sequence[Map]:
-        """Return all maps in the database."""
-        stmt: Select[Tuple[Map]] = select(Map)
-        result: Result[Tuple[Map]] = await self.session.execute(stmt)
+    async def list(self: MapDAO, limit: int | None = None, after: Cursor | None = None) -> Sequence[Map]:
+        """Return maps newest first: all of them, or up to limit after a cursor."""
+        result: Result[Tuple[Map]] = await self.session.execute(list_maps_stmt(limit, after))
         scalars: ScalarResult[Map] = result.scalars()
         return scalars.all()
 
-    async def list_by_user(self: MapDAO, user_id: str) -> Sequence[Map]:
-        """Return all maps belonging to a specific user."""
-        stmt: Select[Tuple[Map]] = select(Map).where(Map.user_id == user_id)
-        result: Result[Tuple[Map]] = await self.session.execute(stmt)
+    async def list_by_user(
+        self: MapDAO,
+        user_id: str,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[Map]:
+        """Return the maps of a specific user newest first, optionally one keyset page."""
+        result: Result[Tuple[Map]] = await self.session.execute(list_maps_by_user_stmt(user_id, limit, after))
         scalars: ScalarResult[Map] = result.scalars()
         return scalars.all()
 
-    async def update(self: MapDAO, id: int, payload: MapUpdate) -> Map | None:
-        """Update a map by ID."""
-        db_obj: Map | None = await self.get(id)
-        if not db_obj:
-            return None
+    async def list_summaries(
+        self: MapDAO,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[Map]:
+        """Return maps newest first with their state deferred, optionally only one user's."""
+        result: Result[Tuple[Map]] = await self.session.execute(list_map_summaries_stmt(user_id, limit, after))
+        return result.scalars().all()
+
+    async def list_matching(
+        self: MapDAO,
+        state: StateFilter,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[Map]:
+        """Return maps whose state matches a filter newest first, with the state deferred, optionally one user's."""
+        dialect: str = self.session.get_bind().dialect.name
+        result: Result[Tuple[Map]] = await self.session.execute(
+            list_maps_matching_stmt(dialect, state, user_id, limit, after)
+        )
+        return result.scalars().all()
+
+    async def search(
+        self: MapDAO,
+        query: str,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: RankCursor | None = None,
+    ) -> list[Ranked[Map]]:
+        """
+        Typo-tolerant search over map names and descriptions, best match first,
+        returning maps with their state deferred. Postgres answers from the
+        trigram index; other backends score every candidate summary in Python.
+        """
+        if self.session.get_bind().dialect.name == "postgresql":
+            await self.session.execute(
+                select(func.set_config("pg_trgm.word_similarity_threshold", str(WORD_SIMILARITY_THRESHOLD), True))
+            )
+            result: Result[Tuple[Map, float]] = await self.session.execute(
+                search_maps_stmt(query, user_id, limit, after)
+            )
+            return [Ranked(item=m, rank=rank) for m, rank in result.tuples()]
 
-        db_obj.name = payload.name
-        db_obj.description = payload.description
-        db_obj.state = payload.state
+        hits: list[Ranked[Map]] = []
+        for m in await self.list_summaries(user_id):
+            rank: float = word_similarity(query, f"{m.name} {m.description}", WORD_SIMILARITY_THRESHOLD)
+            if rank < WORD_SIMILARITY_THRESHOLD:
+                continue
+            if after is None or (rank, m.id) < (after.rank, after.id):
+                hits.append(Ranked(item=m, rank=rank))
+        hits.sort(key=lambda h: (h.rank, h.item.id), reverse=True)
+        return hits[:limit] if limit is not None else hits
+
+    async def upsert(self: MapDAO, id: int | None, user_id: str, payload: MapCreate) -> tuple[Map, bool] | None:
+        """
+        Create or update a map in one atomic statement, updating only the owner's row.
+        Returns the map and whether it was created, or None when another user owns the ID.
+        """
+        if id is None:
+            return await self.create(user_id, payload), True
+
+        dialect: str = self.session.get_bind().dialect.name
+        existing_id: int | None = None
+        if dialect != "postgresql":
+            existing_id = await self.session.scalar(select(Map.id).where(Map.id == id))
+        stmt: Insert = upsert_map_stmt(dialect, id, user_id, payload, existing_id)
+        # populate_existing refreshes a copy of the row already in the identity map
+        result: Result[Tuple[Map, bool]] = await self.session.execute(stmt, execution_options={"populate_existing": True})
+        row: Row[Tuple[Map, bool]] | None = result.one_or_none()
+        if row is None:
+            return None
+        db_obj, inserted = row
+        self.loader.prime(db_obj.id, db_obj)
+        return db_obj, bool(inserted)
 
-        await self.session.commit()
-        await self.session.refresh(db_obj)
+    async def update(self: MapDAO, id: int, payload: MapUpdate, owner: str | None = None) -> Map | None:
+        """
+        Update a map by ID in one UPDATE ... RETURNING, restricted to owner's row when given.
+        Returns None when the map does not exist and raises NotOwnerError when it
+        belongs to someone else; only that failure path reads the row again.
+        """
+        result: Result[Tuple[Map]] = await self.session.execute(
+            update_map_stmt(id, payload, owner),
+            execution_options={"populate_existing": True},
+        )
+        db_obj: Map | None = result.scalars().one_or_none()
+        if db_obj is None:
+            if owner is not None and await self.get(id) is not None:
+                raise NotOwnerError(id)
+            return None
+        self.loader.prime(id, db_obj)
         return db_obj
 
-    async def delete(self, id: int) -> bool:
-        """Delete a map by ID."""
-        db_obj: Map | None = await self.get(id)
-        if not db_obj:
-            return False
+    async def remove(self: MapDAO, id: int, owner: str | None = None) -> Map | None:
+        """
+        Delete a map with one DELETE ... RETURNING and return the deleted row,
+        restricted to owner's map when given. Returns None when the map does not
+        exist and raises NotOwnerError when it belongs to someone else.
+        """
+        removed: Sequence[Map] = await self.remove_many([id], owner)
+        if not removed:
+            if owner is not None and await self.get(id) is not None:
+                raise NotOwnerError(id)
+            return None
+        return removed[0]
+
+    async def remove_many(self: MapDAO, ids: list[int], owner: str | None = None) -> Sequence[Map]:
+        """Delete maps by ID in one statement and return the deleted rows; others' maps are skipped."""
+        result: Result[Tuple[Map]] = await self.session.execute(delete_maps_stmt(ids, owner))
+        removed: Sequence[Map] = result.scalars().all()
+        for db_obj in removed:
+            self.loader.prime(db_obj.id, None)
+        return removed
 
-        await self.session.delete(db_obj)
-        await self.session.commit()
-        return True
+    async def delete(self: MapDAO, id: int) -> bool:
+        """Delete a map by ID."""
+        return await self.remove(id) is not None
@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+from app.db.fuzzy_search import WORD_SIMILARITY_THRESHOLD, word_similarity
+from app.domain.errors import NotOwnerError
+from app.domain.maps.filters import StateFilter
+from app.domain.maps.interfaces import MapRepository
+from app.domain.maps.models import MapDomain, MapFragmentsDomain, MapSummaryDomain
+from app.domain.maps.paths import StatePath
+from app.domain.pagination import Cursor, RankCursor, Ranked
+from app.infrastructure.memory_store import InMemoryStore, PendingWrites, TransactionHook
+
+
+def state_fragments(map_: MapDomain, paths: Sequence[StatePath]) -> MapFragmentsDomain:
+    """Extract values at paths from a loaded map's state; a state that isn't JSON has none."""
+    try:
+        document: Any = json.loads(map_.state)
+    except ValueError:
+        document = None
+    fragments: dict[str, Any] = {}
+    for path in paths:
+        try:
+            fragments[path.text] = path.extract(document)
+        except LookupError:
+            pass
+    return MapFragmentsDomain(
+        id=map_.id,
+        user_id=map_.user_id,
+        fragments=fragments,
+        created_at=map_.created_at,
+        updated_at=map_.updated_at,
+    )
+
+
+class InMemoryMapRepository(MapRepository):
+    """Standalone in-memory implementation of MapRepository, for demo stacks and fast tests."""
+
+    def __init__(self: InMemoryMapRepository, store: InMemoryStore[MapDomain] | None = None) -> None:
+        """Initialize the repository on a shared store, or a private one."""
+        self.store: InMemoryStore[MapDomain] = store if store is not None else InMemoryStore()
+
+    async def create(
+        self: InMemoryMapRepository,
+        user_id: str,
+        name: str,
+        description: str,
+        state: str,
+    ) -> MapDomain:
+        """Create a new map in memory."""
+        now: datetime = datetime.now(timezone.utc)
+        map_ = MapDomain(
+            id=self.store.next_id(),
+            user_id=user_id,
+            name=name,
+            description=description,
+            state=state,
+            created_at=now,
+            updated_at=now,
+        )
+        self.store.put(map_)
+        return map_
+
+    async def get(self: InMemoryMapRepository, id: int) -> MapDomain | None:
+        """Retrieve a map by its ID."""
+        return self.store.get(id)
+
+    async def get_fragments(
+        self: InMemoryMapRepository,
+        id: int,
+        paths: Sequence[StatePath],
+    ) -> MapFragmentsDomain | None:
+        """Retrieve values at paths of a map's state."""
+        map_: MapDomain | None = self.store.get(id)
+        return state_fragments(map_, paths) if map_ is not None else None
+
+    async def get_many(self: InMemoryMapRepository, ids: Sequence[int]) -> list[MapDomain | None]:
+        """Retrieve maps by ID in the order given."""
+        return [self.store.get(id) for id in ids]
+
+    async def list(
+        self: InMemoryMapRepository,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MapDomain]:
+        """Return maps, most recently updated first."""
+        return self.store.list(limit, after)
+
+    async def list_by_user(
+        self: InMemoryMapRepository,
+        user_id: str,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MapDomain]:
+        """Return maps for a specific user, most recently updated first."""
+        return self.store.list_by_user(user_id, limit, after)
+
+    async def list_summaries(
+        self: InMemoryMapRepository,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MapSummaryDomain]:
+        """Return map summaries, most recently updated first."""
+        maps: list[MapDomain] = await (self.list(limit, after) if user_id is None else self.list_by_user(user_id, limit, after))
+        return [MapSummaryDomain.from_entity(m) for m in maps]
+
+    async def list_matching(
+        self: InMemoryMapRepository,
+        state: StateFilter,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MapSummaryDomain]:
+        """Scan for maps whose state matches a filter, most recently updated first."""
+        maps: list[MapDomain] = await (self.list(None, after) if user_id is None else self.list_by_user(user_id, None, after))
+        matching: list[MapSummaryDomain] = [MapSummaryDomain.from_entity(m) for m in maps if state.matches(m.state)]
+        return matching[:limit] if limit is not None else matching
+
+    async def search(
+        self: InMemoryMapRepository,
+        query: str,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: RankCursor | None = None,
+    ) -> list[Ranked[MapSummaryDomain]]:
+        """Scan for maps whose name or description fuzzily matches query, by trigram word similarity."""
+        hits: list[Ranked[MapSummaryDomain]] = []
+        for map_ in await (self.list() if user_id is None else self.list_by_user(user_id)):
+            rank: float = word_similarity(query, f"{map_.name} {map_.description}", WORD_SIMILARITY_THRESHOLD)
+            if rank >= WORD_SIMILARITY_THRESHOLD and (after is None or (rank, map_.id) < (after.rank, after.id)):
+                hits.append(Ranked(item=MapSummaryDomain.from_entity(map_), rank=rank))
+        hits.sort(key=lambda h: (h.rank, h.item.id), reverse=True)
+        return hits[:limit] if limit is not None else hits
+
+    async def upsert(
+        self: InMemoryMapRepository,
+        id: int | None,
+        user_id: str,
+        name: str,
+        description: str,
+        state: str,
+    ) -> tuple[MapDomain, bool] | None:
+        """Create a map, or update the caller's own one; None when another user owns the ID."""
+        existing: MapDomain | None = self.store.get(id) if id is not None else None
+        if existing is None:
+            return await self.create(user_id, name, description, state), True
+        if existing.user_id != user_id:
+            return None
+        updated: MapDomain | None = await self.update(existing.id, name, description, state)
+        return (updated, False) if updated is not None else None
+
+    async def update(
+        self: InMemoryMapRepository,
+        id: int,
+        name: str,
+        description: str,
+        state: str,
+        owner: str | None = None,
+    ) -> MapDomain | None:
+        """Update a map's fields by ID, restricted to owner's map when given."""
+        existing: MapDomain | None = self.store.get(id)
+        if existing is None:
+            return None
+        if owner is not None and existing.user_id != owner:
+            raise NotOwnerError(id)
+        updated: MapDomain = existing.model_copy(
+            update={
+                "name": name,
+                "description": description,
+                "state": state,
+                "updated_at": datetime.now(timezone.utc),
+            }
+        )
+        self.store.put(updated)
+        return updated
+
+    async def remove(self: InMemoryMapRepository, id: int, owner: str | None = None) -> MapDomain | None:
+        """Delete a map by ID and return it, restricted to owner's map when given."""
+        existing: MapDomain | None = self.store.get(id)
+        if existing is None:
+            return None
+        if owner is not None and existing.user_id != owner:
+            raise NotOwnerError(id)
+        return self.store.remove(id)
+
+    async def remove_many(
+        self: InMemoryMapRepository,
+        ids: list[int],
+        owner: str | None = None,
+    ) -> list[MapDomain]:
+        """Delete maps by ID and return those deleted; with an owner, other users' maps are skipped."""
+        removed: list[MapDomain] = []
+        for id in ids:
+            existing: MapDomain | None = self.store.get(id)
+            if existing is not None and (owner is None or existing.user_id == owner):
+                self.store.remove(id)
+                removed.append(existing)
+        return removed
+
+    async def delete(self: InMemoryMapRepository, id: int) -> bool:
+        """Delete a map by ID."""
+        return self.store.remove(id) is not None
+
+
+class WriteThroughMapRepository(MapRepository):
+    """
+    In-memory front for another MapRepository, usually the SQL one.
+    Writes go to the backend first and reach the store once the unit of
+    work commits; until then only this front sees them, and listings skip
+    the store. Reads are served from the store and fall through to the
+    backend on a miss. The store is process-local, so this only stays
+    coherent when a single process writes to the database.
+    """
+
+    def __init__(
+        self: WriteThroughMapRepository,
+        backend: MapRepository,
+        store: InMemoryStore[MapDomain],
+        on_commit: TransactionHook | None = None,
+        on_rollback: TransactionHook | None = None,
+    ) -> None:
+        """Initialize the front with its backend, shared store and the unit of work's hooks."""
+        self.backend: MapRepository = backend
+        self.store: InMemoryStore[MapDomain] = store
+        self.pending: PendingWrites[MapDomain] = PendingWrites(store, on_commit, on_rollback)
+
+    def _cached(self: WriteThroughMapRepository, id: int) -> MapDomain | None:
+        """This unit of work's own write of a map, else the stored copy."""
+        return self.pending.get(id) if id in self.pending else self.store.get(id)
+
+    def _mirror(self: WriteThroughMapRepository, maps: Sequence[MapDomain], since: int) -> list[MapDomain]:
+        """Fill the store with rows read from the backend since a version, leaving out pending writes."""
+        self.store.fill([item for item in maps if item.id not in self.pending], since)
+        return list(maps)
+
+    async def create(
+        self: WriteThroughMapRepository,
+        user_id: str,
+        name: str,
+        description: str,
+        state: str,
+    ) -> MapDomain:
+        """Create a map in the backend and mirror it."""
+        created: MapDomain = await self.backend.create(user_id, name, description, state)
+        self.pending.put(created)
+        return created
+
+    async def get(self: WriteThroughMapRepository, id: int) -> MapDomain | None:
+        """Retrieve a map from memory, loading it from the backend on a miss."""
+        if id in self.pending:
+            return self.pending.get(id)
+        cached: MapDomain | None = self.store.get(id)
+        if cached is not None:
+            return cached
+        with self.store.filling() as since:
+            loaded: MapDomain | None = await self.backend.get(id)
+            if loaded is not None:
+                self._mirror([loaded], since)
+        return loaded
+
+    async def get_fragments(
+        self: WriteThroughMapRepository,
+        id: int,
+        paths: Sequence[StatePath],
+    ) -> MapFragmentsDomain | None:
+        """Extract fragments from a cached map, else read only the fragments from the backend."""
+        if id in self.pending:
+            written: MapDomain | None = self.pending.get(id)
+            return state_fragments(written, paths) if written is not None else None
+        cached: MapDomain | None = self.store.get(id)
+        if cached is not None:
+            return state_fragments(cached, paths)
+        return await self.backend.get_fragments(id, paths)
+
+    async def get_many(self: WriteThroughMapRepository, ids: Sequence[int]) -> list[MapDomain | None]:
+        """Retrieve maps from memory, loading all misses from the backend in one call."""
+        found: dict[int, MapDomain] = {}
+        for id in ids:
+            cached: MapDomain | None = self._cached(id)
+            if cached is not None:
+                found[id] = cached
+        missing: list[int] = [id for id in ids if id not in found and id not in self.pending]
+        if missing:
+            with self.store.filling() as since:
+                loaded: list[MapDomain] = [item for item in await self.backend.get_many(missing) if item is not None]
+                self._mirror(loaded, since)
+            for item in loaded:
+                found[item.id] = item
+        return [found.get(id) for id in ids]
+
+    async def list(
+        self: WriteThroughMapRepository,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MapDomain]:
+        """Return maps, loading the whole table once; pages are read from the backend until then."""
+        if self.pending:
+            return list(await self.backend.list(limit, after))
+        if not self.store.complete:
+            with self.store.filling() as since:
+                if limit is not None or after is not None:
+                    return self._mirror(await self.backend.list(limit, after), since)
+                self._mirror(await self.backend.list(), since)
+                self.store.mark_complete(since)
+        return self.store.list(limit, after)
+
+    async def list_by_user(
+        self: WriteThroughMapRepository,
+        user_id: str,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MapDomain]:
+        """Return a user's maps, loading them once per user; pages are read from the backend until then."""
+        if self.pending:
+            return list(await self.backend.list_by_user(user_id, limit, after))
+        if not self.store.complete and user_id not in self.store.complete_users:
+            with self.store.filling() as since:
+                if limit is not None or after is not None:
+                    return self._mirror(await self.backend.list_by_user(user_id, limit, after), since)
+                self._mirror(await self.backend.list_by_user(user_id), since)
+                self.store.mark_complete(since, user_id)
+        return self.store.list_by_user(user_id, limit, after)
+
+    async def list_summaries(
+        self: WriteThroughMapRepository,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MapSummaryDomain]:
+        """Return summaries from memory once the listing is loaded, else from the backend without the state."""
+        loaded: bool = self.store.complete or (user_id is not None and user_id in self.store.complete_users)
+        if self.pending or not loaded:
+            return list(await self.backend.list_summaries(user_id, limit, after))
+        maps: list[MapDomain] = (
+            self.store.list(limit, after) if user_id is None else self.store.list_by_user(user_id, limit, after)
+        )
+        return [MapSummaryDomain.from_entity(m) for m in maps]
+
+    async def list_matching(
+        self: WriteThroughMapRepository,
+        state: StateFilter,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MapSummaryDomain]:
+        """Filter through the backend, whose containment index beats parsing every state in the store."""
+        return list(await self.backend.list_matching(state, user_id, limit, after))
+
+    async def search(
+        self: WriteThroughMapRepository,
+        query: str,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: RankCursor | None = None,
+    ) -> list[Ranked[MapSummaryDomain]]:
+        """Search through the backend, whose trigram index beats scanning the store."""
+        return await self.backend.search(query, user_id, limit, after)
+
+    async def upsert(
+        self: WriteThroughMapRepository,
+        id: int | None,
+        user_id: str,
+        name: str,
+        description: str,
+        state: str,
+    ) -> tuple[MapDomain, bool] | None:
+        """Upsert a map in the backend and mirror the result."""
+        saved: tuple[MapDomain, bool] | None = await self.backend.upsert(id, user_id, name, description, state)
+        if saved is None:
+            return None
+        self.pending.put(saved[0])
+        return saved
+
+    async def update(
+        self: WriteThroughMapRepository,
+        id: int,
+        name: str,
+        description: str,
+        state: str,
+        owner: str | None = None,
+    ) -> MapDomain | None:
+        """Update a map in the backend and mirror the result."""
+        updated: MapDomain | None = await self.backend.update(id, name, description, state, owner)
+        if updated is None:
+            self.store.invalidate(id)
+            return None
+        self.pending.put(updated)
+        return updated
+
+    async def remove(self: WriteThroughMapRepository, id: int, owner: str | None = None) -> MapDomain | None:
+        """Delete a map in the backend and evict it."""
+        removed: MapDomain | None = await self.backend.remove(id, owner)
+        if removed is None:
+            self.store.invalidate(id)
+            return None
+        self.pending.remove(id, removed.user_id)
+        return removed
+
+    async def remove_many(
+        self: WriteThroughMapRepository,
+        ids: list[int],
+        owner: str | None = None,
+    ) -> list[MapDomain]:
+        """Delete maps in the backend and evict those deleted."""
+        removed: list[MapDomain] = await self.backend.remove_many(ids, owner)
+        for item in removed:
+            self.pending.remove(item.id, item.user_id)
+        return removed
+
+    async def delete(self: WriteThroughMapRepository, id: int) -> bool:
+        """Delete a map in the backend and evict it."""
+        known: MapDomain | None = self._cached(id)
+        deleted: bool = await self.backend.delete(id)
+        if deleted and known is not None:
+            self.pending.remove(id, known.user_id)
+        return deleted
@@ -1,19 +1,24 @@
 from __future__ import annotations
+import json
 from typing import Sequence
 
 from app.db.entities.map import Map
-from app.domain.maps.models import MapDomain
+from app.domain.maps.filters import StateFilter
+from app.domain.maps.models import MapDomain, MapFragmentsDomain, MapSummaryDomain
+from app.domain.maps.paths import StatePath
 from app.domain.maps.interfaces import MapRepository
+from app.domain.pagination import Cursor, RankCursor, Ranked
 from app.infrastructure.maps.dao import MapDAO
+from app.infrastructure.maps.sharded_dao import ShardedMapDAO
 from app.schemas.maps import MapCreate, MapUpdate
 
 
 class SqlAlchemyMapRepository(MapRepository):
     """SQLAlchemy implementation of MapRepository."""
 
-    def __init__(self: SqlAlchemyMapRepository, dao: MapDAO) -> None:
-        """Initialize the repository with a MapDAO instance."""
-        self.dao: MapDAO = dao
+    def __init__(self: SqlAlchemyMapRepository, dao: MapDAO | ShardedMapDAO) -> None:
+        """Initialize the repository with a MapDAO or ShardedMapDAO instance."""
+        self.dao: MapDAO | ShardedMapDAO = dao
 
     async def create(
         self: SqlAlchemyMapRepository,
@@ -34,9 +39,84 @@ async def get(self: SqlAlchemyMapRepository, id: int) -> MapDomain | None:
         db_obj: Map | None = await self.dao.get(id)
         return MapDomain.from_entity(db_obj) if db_obj else None
 
-    async def list(self: SqlAlchemyMapRepository) -> list[MapDomain]:
-        """Return all maps."""
-        return [MapDomain.from_entity(m) for m in await self.dao.list()]
+    async def get_many(self: SqlAlchemyMapRepository, ids: Sequence[int]) -> list[MapDomain | None]:
+        """Get maps by ID with a single query, in the order given."""
+        return [MapDomain.from_entity(m) if m else None for m in await self.dao.get_many(ids)]
+
+    async def get_fragments(
+        self: SqlAlchemyMapRepository,
+        id: int,
+        paths: Sequence[StatePath],
+    ) -> MapFragmentsDomain | None:
+        """Retrieve values at paths of a map's state; only the fragments leave the database."""
+        found: tuple[Map, list[str | None]] | None = await self.dao.get_state_fragments(id, paths)
+        if found is None:
+            return None
+        db_obj, texts = found
+        return MapFragmentsDomain(
+            id=db_obj.id,
+            user_id=db_obj.user_id,
+            fragments={p.text: json.loads(t) for p, t in zip(paths, texts) if t is not None},
+            created_at=db_obj.created_at,
+            updated_at=db_obj.updated_at,
+        )
+
+    async def list(
+        self: SqlAlchemyMapRepository,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MapDomain]:
+        """Return maps newest first, optionally one keyset page."""
+        return [MapDomain.from_entity(m) for m in await self.dao.list(limit, after)]
+
+    async def list_summaries(
+        self: SqlAlchemyMapRepository,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MapSummaryDomain]:
+        """Return map summaries newest first; the state column is never selected."""
+        return [MapSummaryDomain.from_entity(m) for m in await self.dao.list_summaries(user_id, limit, after)]
+
+    async def list_matching(
+        self: SqlAlchemyMapRepository,
+        state: StateFilter,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MapSummaryDomain]:
+        """Return summaries of maps whose state matches a filter, evaluated in the database."""
+        return [MapSummaryDomain.from_entity(m) for m in await self.dao.list_matching(state, user_id, limit, after)]
+
+    async def search(
+        self: SqlAlchemyMapRepository,
+        query: str,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: RankCursor | None = None,
+    ) -> list[Ranked[MapSummaryDomain]]:
+        """Fuzzy search over names and descriptions; the state column is never selected."""
+        hits: list[Ranked[Map]] = await self.dao.search(query, user_id, limit, after)
+        return [Ranked(item=MapSummaryDomain.from_entity(h.item), rank=h.rank) for h in hits]
+
+    async def upsert(
+        self: SqlAlchemyMapRepository,
+        id: int | None,
+        user_id: str,
+        name: str,
+        description: str,
+        state: str,
+    ) -> tuple[MapDomain, bool] | None:
+        """Create or update a map in a single statement; None when another user owns the ID."""
+        saved: tuple[Map, bool] | None = await self.dao.upsert(
+            id,
+            user_id,
+            MapCreate(name=name, description=description, state=state),
+        )
+        if saved is None:
+            return None
+        db_obj, created = saved
+        return MapDomain.from_entity(db_obj), created
 
     async def update(
         self: SqlAlchemyMapRepository,
@@ -44,19 +124,39 @@ async def update(
         name: str,
         description: str,
         state: str,
+        owner: str | None = None,
     ) -> MapDomain | None:
-        """Update a map's fields by ID."""
+        """Update a map's fields by ID in a single statement, restricted to owner when given."""
         db_obj: Map | None = await self.dao.update(
             id,
             MapUpdate(name=name, description=description, state=state),
+            owner,
         )
         return MapDomain.from_entity(db_obj) if db_obj else None
 
+    async def remove(self: SqlAlchemyMapRepository, id: int, owner: str | None = None) -> MapDomain | None:
+        """Delete a map in a single statement and return it, restricted to owner when given."""
+        db_obj: Map | None = await self.dao.remove(id, owner)
+        return MapDomain.from_entity(db_obj) if db_obj else None
+
+    async def remove_many(
+        self: SqlAlchemyMapRepository,
+        ids: list[int],
+        owner: str | None = None,
+    ) -> list[MapDomain]:
+        """Delete maps by ID in a single statement and return those deleted."""
+        return [MapDomain.from_entity(m) for m in await self.dao.remove_many(ids, owner)]
+
     async def delete(self: SqlAlchemyMapRepository, id: int) -> bool:
         """Delete a map by ID."""
         return await self.dao.delete(id)
 
-    async def list_by_user(self: SqlAlchemyMapRepository, user_id: str) -> list[MapDomain]:
-        """Return all maps for a specific user."""
-        db_objs: Sequence[Map] = await self.dao.list_by_user(user_id)
+    async def list_by_user(
+        self: SqlAlchemyMapRepository,
+        user_id: str,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MapDomain]:
+        """Return the maps of a specific user newest first, optionally one keyset page."""
+        db_objs: Sequence[Map] = await self.dao.list_by_user(user_id, limit, after)
         return [MapDomain.from_entity(m) for m in db_objs]
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Sequence, Tuple
+
+from sqlalchemy import Result, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.entities.map import Map
+from app.db.sharding import ShardedUnitOfWork
+from app.domain.errors import NotOwnerError
+from app.domain.maps.filters import StateFilter
+from app.domain.maps.paths import StatePath
+from app.domain.pagination import Cursor, RankCursor, Ranked
+from app.infrastructure.maps.dao import MapDAO, list_map_summaries_stmt, list_maps_stmt
+from app.schemas.maps import MapCreate, MapUpdate
+
+
+class ShardedMapDAO:
+    """
+    MapDAO counterpart that partitions maps across shards by user_id.
+    Per-user calls hit a single shard, lookups by ID decode the shard from
+    the global ID, and list() scatter-gathers every shard concurrently.
+    Returned maps are detached copies carrying global IDs.
+    """
+
+    def __init__(self: ShardedMapDAO, uow: ShardedUnitOfWork) -> None:
+        """Initialize the ShardedMapDAO with a sharded unit of work."""
+        self.uow: ShardedUnitOfWork = uow
+        self.daos: dict[int, MapDAO] = {}
+
+    def _dao(self: ShardedMapDAO, shard: int) -> MapDAO:
+        """Shard-local DAO sharing the unit of work's session (and batch loader) for that shard."""
+        if shard not in self.daos:
+            self.daos[shard] = MapDAO(self.uow.session(shard))
+        return self.daos[shard]
+
+    def _local_after(self: ShardedMapDAO, shard: int, after: Cursor | None) -> Cursor | None:
+        """Translate a cursor on global IDs into the equivalent one on a shard's local IDs."""
+        if after is None:
+            return None
+        return Cursor(updated_at=after.updated_at, id=self.uow.router.local_bound(shard, after.id))
+
+    def _to_global(self: ShardedMapDAO, shard: int, db_obj: Map) -> Map:
+        """Copy a shard-local map, replacing its ID with the global one; deferred columns stay unset."""
+        unloaded: frozenset[str] = inspect(db_obj).unloaded
+        columns: dict[str, Any] = {
+            key: getattr(db_obj, key)
+            for key in ("user_id", "name", "description", "state", "created_at", "updated_at")
+            if key not in unloaded
+        }
+        return Map(id=self.uow.router.global_id(shard, db_obj.id), **columns)
+
+    async def create(self: ShardedMapDAO, user_id: str, payload: MapCreate) -> Map:
+        """Insert a new map on the user's shard."""
+        shard: int = self.uow.router.shard_for(user_id)
+        return self._to_global(shard, await self._dao(shard).create(user_id, payload))
+
+    async def get(self: ShardedMapDAO, id: int) -> Map | None:
+        """Get a map by global ID from the shard encoded in it."""
+        shard, local_id = self.uow.router.locate(id)
+        db_obj: Map | None = await self._dao(shard).get(local_id)
+        return self._to_global(shard, db_obj) if db_obj else None
+
+    async def get_state_fragments(
+        self: ShardedMapDAO,
+        id: int,
+        paths: Sequence[StatePath],
+    ) -> tuple[Map, list[str | None]] | None:
+        """Get a map by global ID with fragments of its state, from the shard encoded in it."""
+        shard, local_id = self.uow.router.locate(id)
+        found: tuple[Map, list[str | None]] | None = await self._dao(shard).get_state_fragments(local_id, paths)
+        return (self._to_global(shard, found[0]), found[1]) if found else None
+
+    async def get_many(self: ShardedMapDAO, ids: Sequence[int]) -> list[Map | None]:
+        """Get maps by global ID with one query per shard involved, run concurrently, in the order given."""
+        by_shard: dict[int, list[int]] = {}
+        for id in ids:
+            shard, local_id = self.uow.router.locate(id)
+            by_shard.setdefault(shard, []).append(local_id)
+
+        async def load(shard: int, local_ids: list[int]) -> dict[int, Map]:
+            loaded: list[Map | None] = await self._dao(shard).get_many(local_ids)
+            return {g.id: g for g in (self._to_global(shard, m) for m in loaded if m is not None)}
+
+        found: dict[int, Map] = {}
+        for shard_found in await asyncio.gather(*(load(s, local) for s, local in by_shard.items())):
+            found.update(shard_found)
+        return [found.get(id) for id in ids]
+
+    async def list(
+        self: ShardedMapDAO,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[Map]:
+        """Return maps newest first, merging the same page from every shard concurrently."""
+
+        async def fetch(shard: int, session: AsyncSession) -> list[Map]:
+            local_after: Cursor | None = self._local_after(shard, after)
+            result: Result[Tuple[Map]] = await session.execute(list_maps_stmt(limit, local_after))
+            return [self._to_global(shard, m) for m in result.scalars()]
+
+        shards: list[list[Map]] = await self.uow.scatter(fetch)
+        merged: list[Map] = sorted(
+            (m for maps in shards for m in maps),
+            key=lambda m: (m.updated_at, m.id),
+            reverse=True,
+        )
+        return merged[:limit] if limit is not None else merged
+
+    async def list_summaries(
+        self: ShardedMapDAO,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[Map]:
+        """Return maps newest first with their state deferred, from the user's shard or merged from all."""
+        if user_id is not None:
+            shard: int = self.uow.router.shard_for(user_id)
+            local: Sequence[Map] = await self._dao(shard).list_summaries(user_id, limit, self._local_after(shard, after))
+            return [self._to_global(shard, m) for m in local]
+
+        async def fetch(shard: int, session: AsyncSession) -> list[Map]:
+            local_after: Cursor | None = self._local_after(shard, after)
+            result: Result[Tuple[Map]] = await session.execute(list_map_summaries_stmt(None, limit, local_after))
+            return [self._to_global(shard, m) for m in result.scalars()]
+
+        shards: list[list[Map]] = await self.uow.scatter(fetch)
+        merged: list[Map] = sorted(
+            (m for maps in shards for m in maps),
+            key=lambda m: (m.updated_at, m.id),
+            reverse=True,
+        )
+        return merged[:limit] if limit is not None else merged
+
+    async def list_matching(
+        self: ShardedMapDAO,
+        state: StateFilter,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[Map]:
+        """Return maps whose state matches a filter newest first, from the user's shard or merged from all."""
+
+        async def fetch(shard: int, session: AsyncSession) -> list[Map]:
+            local: Sequence[Map] = await self._dao(shard).list_matching(
+                state, user_id, limit, self._local_after(shard, after)
+            )
+            return [self._to_global(shard, m) for m in local]
+
+        if user_id is not None:
+            shard: int = self.uow.router.shard_for(user_id)
+            return await fetch(shard, self.uow.session(shard))
+
+        shards: list[list[Map]] = await self.uow.scatter(fetch)
+        merged: list[Map] = sorted(
+            (m for maps in shards for m in maps),
+            key=lambda m: (m.updated_at, m.id),
+            reverse=True,
+        )
+        return merged[:limit] if limit is not None else merged
+
+    async def search(
+        self: ShardedMapDAO,
+        query: str,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: RankCursor | None = None,
+    ) -> list[Ranked[Map]]:
+        """Fuzzy search on the user's shard, or on every shard concurrently with the hits merged by rank."""
+
+        async def fetch(shard: int, session: AsyncSession) -> list[Ranked[Map]]:
+            local_after: RankCursor | None = (
+                RankCursor(rank=after.rank, id=self.uow.router.local_bound(shard, after.id)) if after else None
+            )
+            hits: list[Ranked[Map]] = await self._dao(shard).search(query, user_id, limit, local_after)
+            return [Ranked(item=self._to_global(shard, h.item), rank=h.rank) for h in hits]
+
+        if user_id is not None:
+            shard: int = self.uow.router.shard_for(user_id)
+            return await fetch(shard, self.uow.session(shard))
+
+        shards: list[list[Ranked[Map]]] = await self.uow.scatter(fetch)
+        merged: list[Ranked[Map]] = sorted(
+            (h for hits in shards for h in hits),
+            key=lambda h: (h.rank, h.item.id),
+            reverse=True,
+        )
+        return merged[:limit] if limit is not None else merged
+
+    async def list_by_user(
+        self: ShardedMapDAO,
+        user_id: str,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[Map]:
+        """Return the maps of a specific user newest first from their shard."""
+        shard: int = self.uow.router.shard_for(user_id)
+        local: Sequence[Map] = await self._dao(shard).list_by_user(user_id, limit, self._local_after(shard, after))
+        return [self._to_global(shard, m) for m in local]
+
+    async def upsert(self: ShardedMapDAO, id: int | None, user_id: str, payload: MapCreate) -> tuple[Map, bool] | None:
+        """
+        Upsert on the user's shard. An ID encoding another shard can only belong
+        to another user, so it is refused if it exists and created afresh otherwise.
+        """
+        shard: int = self.uow.router.shard_for(user_id)
+        if id is not None:
+            id_shard, local_id = self.uow.router.locate(id)
+            if id_shard != shard:
+                if await self._dao(id_shard).get(local_id) is not None:
+                    return None
+                id = None
+            else:
+                id = local_id
+        saved: tuple[Map, bool] | None = await self._dao(shard).upsert(id, user_id, payload)
+        if saved is None:
+            return None
+        return self._to_global(shard, saved[0]), saved[1]
+
+    async def update(self: ShardedMapDAO, id: int, payload: MapUpdate, owner: str | None = None) -> Map | None:
+        """Update a map by global ID, restricted to owner's row when given."""
+        shard, local_id = self.uow.router.locate(id)
+        try:
+            db_obj: Map | None = await self._dao(shard).update(local_id, payload, owner)
+        except NotOwnerError:
+            raise NotOwnerError(id) from None
+        return self._to_global(shard, db_obj) if db_obj else None
+
+    async def remove(self: ShardedMapDAO, id: int, owner: str | None = None) -> Map | None:
+        """Delete a map by global ID and return it, restricted to owner's map when given."""
+        shard, local_id = self.uow.router.locate(id)
+        try:
+            removed: Map | None = await self._dao(shard).remove(local_id, owner)
+        except NotOwnerError:
+            raise NotOwnerError(id) from None
+        return self._to_global(shard, removed) if removed else None
+
+    async def remove_many(self: ShardedMapDAO, ids: list[int], owner: str | None = None) -> list[Map]:
+        """Delete maps by global ID with one statement per shard involved, run concurrently."""
+        by_shard: dict[int, list[int]] = {}
+        for id in ids:
+            shard, local_id = self.uow.router.locate(id)
+            by_shard.setdefault(shard, []).append(local_id)
+
+        async def remove(shard: int, local_ids: list[int]) -> list[Map]:
+            return [self._to_global(shard, m) for m in await self._dao(shard).remove_many(local_ids, owner)]
+
+        removed: list[list[Map]] = await asyncio.gather(*(remove(s, local) for s, local in by_shard.items()))
+        return [m for shard_removed in removed for m in shard_removed]
+
+    async def delete(self: ShardedMapDAO, id: int) -> bool:
+        """Delete a map by global ID."""
+        return await self.remove(id) is not None
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections.abc import Callable, Iterable
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import count
+from typing import Generic, Iterator, TypeVar
+
+from app.domain.maps.models import MapDomain
+from app.domain.messages.models import MessageDomain
+from app.domain.pagination import Cursor, as_utc
+
+R = TypeVar("R", MapDomain, MessageDomain)
+
+# Registers a callback to run once the surrounding unit of work commits, or once it rolls back
+TransactionHook = Callable[[Callable[[], None]], None]
+
+# Sort key used by every index: most recently updated last (in UTC), ties broken by ID
+OrderKey = tuple[datetime, int]
+
+
+class InMemoryStore(Generic[R]):
+    """
+    Process-local store of domain records with a per-user secondary index.
+    Both the global and per-user indexes stay sorted by (updated_at, id), so
+    listings come out newest first without sorting on read. Records are
+    copied on the way in and out so callers can decorate results freely.
+
+    Read-through fronts fill the store with rows read from the backend. Every
+    write bumps a version, and while a fill is in flight the store remembers
+    which IDs changed at which version, so a row read before a committed
+    update or delete can never overwrite it.
+    """
+
+    def __init__(self: InMemoryStore[R]) -> None:
+        """Initialize an empty store."""
+        self.records: dict[int, R] = {}
+        self.order: list[OrderKey] = []
+        self.by_user: dict[str, list[OrderKey]] = {}
+        self.ids: Iterator[int] = count(1)
+        # Users (and the whole table) whose rows are all present, for read-through fronts
+        self.complete_users: set[str] = set()
+        self.complete: bool = False
+        # Write versions: the latest, per ID while fills are in flight, and of the last invalidation and clear
+        self.version: int = 0
+        self.changed: dict[int, int] = {}
+        self.invalidated: int = 0
+        self.cleared: int = 0
+        self.fills: int = 0
+
+    def __len__(self: InMemoryStore[R]) -> int:
+        """Number of stored records."""
+        return len(self.records)
+
+    def next_id(self: InMemoryStore[R]) -> int:
+        """Allocate an ID for a standalone insert."""
+        return next(self.ids)
+
+    def get(self: InMemoryStore[R], id: int) -> R | None:
+        """Return a copy of a record by ID."""
+        record: R | None = self.records.get(id)
+        return record.model_copy() if record is not None else None
+
+    def put(self: InMemoryStore[R], record: R) -> None:
+        """Insert or replace a record and reindex it."""
+        self._touch(record.id)
+        self._store(record)
+
+    @contextmanager
+    def filling(self: InMemoryStore[R]) -> Iterator[int]:
+        """Bracket a backend read and the fill() of its rows; yields the version the read started at."""
+        self.fills += 1
+        try:
+            yield self.version
+        finally:
+            self.fills -= 1
+            if not self.fills:
+                self.changed.clear()
+
+    def fill(self: InMemoryStore[R], records: Iterable[R], since: int) -> None:
+        """Store rows read from the backend, skipping those written, removed or invalidated after since."""
+        if self.cleared > since:
+            return
+        for record in records:
+            if self.changed.get(record.id, 0) <= since:
+                self._store(record)
+
+    def mark_complete(self: InMemoryStore[R], since: int, user_id: str | None = None) -> None:
+        """Mark the table, or one user's rows, fully loaded unless an invalidation raced the load."""
+        if self.invalidated > since:
+            return
+        if user_id is None:
+            self.complete = True
+        else:
+            self.complete_users.add(user_id)
+
+    def _touch(self: InMemoryStore[R], id: int) -> None:
+        """Record a write to an ID so fills that started earlier skip it."""
+        self.version += 1
+        if self.fills:
+            self.changed[id] = self.version
+
+    def _store(self: InMemoryStore[R], record: R) -> None:
+        """Insert or replace a copy of a record in the table and both indexes."""
+        self._unindex(record.id)
+        stored: R = record.model_copy()
+        key: OrderKey = (as_utc(stored.updated_at), stored.id)
+        self.records[stored.id] = stored
+        insort(self.order, key)
+        insort(self.by_user.setdefault(stored.user_id, []), key)
+
+    def remove(self: InMemoryStore[R], id: int) -> R | None:
+        """Remove a record by ID, returning it when present."""
+        self._touch(id)
+        return self._unindex(id)
+
+    def list(self: InMemoryStore[R], limit: int | None = None, after: Cursor | None = None) -> list[R]:
+        """All records most recently updated first, optionally one keyset page."""
+        return self._page(self.order, limit, after)
+
+    def list_by_user(
+        self: InMemoryStore[R],
+        user_id: str,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[R]:
+        """A user's records most recently updated first, optionally one keyset page."""
+        return self._page(self.by_user.get(user_id, []), limit, after)
+
+    def _page(self: InMemoryStore[R], keys: list[OrderKey], limit: int | None, after: Cursor | None) -> list[R]:
+        """Copy up to limit records from the end of an index, below the cursor when given."""
+        end: int = bisect_left(keys, (as_utc(after.updated_at), after.id)) if after is not None else len(keys)
+        start: int = max(end - limit, 0) if limit is not None else 0
+        return [self.records[id].model_copy() for _, id in reversed(keys[start:end])]
+
+    def invalidate(self: InMemoryStore[R], id: int | None = None, user_id: str | None = None) -> None:
+        """Drop a record and clear completeness marks so the next read goes to the backend."""
+        self.version += 1
+        self.invalidated = self.version
+        if id is not None:
+            self._touch(id)
+            self._unindex(id)
+        if user_id is not None:
+            self.complete_users.discard(user_id)
+        self.complete = False
+
+    def clear(self: InMemoryStore[R]) -> None:
+        """Remove every record; IDs keep counting up."""
+        self.version += 1
+        self.invalidated = self.cleared = self.version
+        self.records.clear()
+        self.order.clear()
+        self.by_user.clear()
+        self.complete_users.clear()
+        self.complete = False
+
+    def _unindex(self: InMemoryStore[R], id: int) -> R | None:
+        """Remove a record from the table and both indexes."""
+        record: R | None = self.records.pop(id, None)
+        if record is None:
+            return None
+        key: OrderKey = (as_utc(record.updated_at), record.id)
+        del self.order[bisect_left(self.order, key)]
+        user_keys: list[OrderKey] = self.by_user[record.user_id]
+        del user_keys[bisect_left(user_keys, key)]
+        if not user_keys:
+            del self.by_user[record.user_id]
+        return record
+
+
+class PendingWrites(Generic[R]):
+    """
+    Writes a write-through front made inside a unit of work, held back from
+    the shared store until the unit of work commits so other requests never
+    read rows that may still roll back. A rollback drops them and invalidates
+    their IDs instead. Without a commit hook writes reach the store at once.
+    """
+
+    def __init__(
+        self: PendingWrites[R],
+        store: InMemoryStore[R],
+        on_commit: TransactionHook | None = None,
+        on_rollback: TransactionHook | None = None,
+    ) -> None:
+        """Initialize the pending writes for a store and the unit of work's hooks."""
+        self.store: InMemoryStore[R] = store
+        self.on_commit: TransactionHook | None = on_commit
+        self.on_rollback: TransactionHook | None = on_rollback
+        # ID -> (owner, record written, or None when deleted)
+        self.records: dict[int, tuple[str, R | None]] = {}
+
+    def __bool__(self: PendingWrites[R]) -> bool:
+        """Whether any write is waiting for the commit."""
+        return bool(self.records)
+
+    def __contains__(self: PendingWrites[R], id: int) -> bool:
+        """Whether a record was written or deleted in this unit of work."""
+        return id in self.records
+
+    def get(self: PendingWrites[R], id: int) -> R | None:
+        """A copy of the pending record, or None when it was deleted."""
+        record: R | None = self.records[id][1]
+        return record.model_copy() if record is not None else None
+
+    def put(self: PendingWrites[R], record: R) -> None:
+        """Stage an inserted or updated record."""
+        self._stage(record.id, record.user_id, record.model_copy())
+
+    def remove(self: PendingWrites[R], id: int, user_id: str) -> None:
+        """Stage a deletion."""
+        self._stage(id, user_id, None)
+
+    def _stage(self: PendingWrites[R], id: int, user_id: str, record: R | None) -> None:
+        """Hold a write until commit, registering the hooks with the first one."""
+        if self.on_commit is None:
+            self.records[id] = (user_id, record)
+            self._apply()
+            return
+        if not self.records:
+            self.on_commit(self._apply)
+            if self.on_rollback is not None:
+                self.on_rollback(self._discard)
+        self.records[id] = (user_id, record)
+
+    def _apply(self: PendingWrites[R]) -> None:
+        """Copy the committed writes into the store."""
+        records, self.records = self.records, {}
+        for id, (_, record) in records.items():
+            if record is not None:
+                self.store.put(record)
+            else:
+                self.store.remove(id)
+
+    def _discard(self: PendingWrites[R]) -> None:
+        """Drop rolled back writes and invalidate what the store holds for them."""
+        records, self.records = self.records, {}
+        for id, (user_id, _) in records.items():
+            self.store.invalidate(id, user_id)
@@ -1,18 +1,139 @@
 from __future__ import annotations
-from typing import Sequence, Tuple, Union, overload
+from typing import Mapping, Sequence, Tuple, Union, overload
 
-from sqlalchemy import Result, Select
+from sqlalchemy import (
+    Delete,
+    Float,
+    Insert,
+    Result,
+    Select,
+    StatementLambdaElement,
+    TableClause,
+    Update,
+    column,
+    delete,
+    func,
+    insert,
+    lambda_stmt,
+    literal_column,
+    table,
+    tuple_,
+    update,
+)
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.engine import ScalarResult
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.db.entities.message import Message
+from app.db.full_text import MESSAGES_FTS_TABLE, SEARCH_VECTOR_COLUMN, TEXT_SEARCH_CONFIG, fts5_query
+from app.db.pagination import stored_timestamp
+from app.domain.errors import NotOwnerError
+from app.domain.pagination import Cursor, RankCursor, Ranked
+from app.infrastructure.batch_loader import BatchLoader
 from app.schemas.messages.messages import MessageCreate
 
+def paginate_messages(
+    stmt: StatementLambdaElement,
+    limit: int | None = None,
+    after: Cursor | None = None,
+) -> StatementLambdaElement:
+    """Order a message listing newest first and apply the keyset cursor and limit."""
+    if after is not None:
+        updated_at, id = after.updated_at, after.id
+        stmt += lambda s: s.where(tuple_(Message.updated_at, Message.id) < tuple_(stored_timestamp(updated_at), id))
+    stmt += lambda s: s.order_by(Message.updated_at.desc(), Message.id.desc())
+    if limit is not None:
+        stmt += lambda s: s.limit(limit)
+    return stmt
+
+def list_messages_stmt(limit: int | None = None, after: Cursor | None = None) -> StatementLambdaElement:
+    """Cached statement selecting messages newest first, optionally one keyset page."""
+    return paginate_messages(lambda_stmt(lambda: select(Message)), limit, after)
+
+def get_messages_stmt(ids: list[int]) -> StatementLambdaElement:
+    """Cached statement selecting messages by ID; the list is bound as an expanding IN parameter."""
+    return lambda_stmt(lambda: select(Message).where(Message.id.in_(ids)))
+
+def update_message_stmt(id: int, content: str, owner: str | None = None) -> Update:
+    """UPDATE ... WHERE id = :id [AND user_id = :owner] RETURNING the updated message."""
+    stmt = update(Message).where(Message.id == id)
+    if owner is not None:
+        stmt = stmt.where(Message.user_id == owner)
+    return stmt.values(content=content).returning(Message)
+
+def insert_messages_stmt() -> Insert:
+    """
+    Multi-row INSERT ... RETURNING. sort_by_parameter_order is left off:
+    SQLite can only honour it one row per statement, so callers order the
+    rows by their ascending IDs instead.
+    """
+    return insert(Message).returning(Message)
+
+def delete_messages_stmt(ids: list[int], owner: str | None = None) -> Delete:
+    """DELETE ... WHERE id IN :ids [AND user_id = :owner] RETURNING the deleted messages."""
+    stmt = delete(Message).where(Message.id.in_(ids))
+    if owner is not None:
+        stmt = stmt.where(Message.user_id == owner)
+    return stmt.returning(Message)
+
+def list_messages_by_user_stmt(
+    user_id: str,
+    limit: int | None = None,
+    after: Cursor | None = None,
+) -> StatementLambdaElement:
+    """Cached statement selecting the messages of one user newest first; user_id is bound per call."""
+    return paginate_messages(lambda_stmt(lambda: select(Message).where(Message.user_id == user_id)), limit, after)
+
+def search_messages_stmt(
+    dialect: str,
+    query: str,
+    user_id: str | None = None,
+    limit: int | None = None,
+    after: RankCursor | None = None,
+) -> Select[Tuple[Message, float]]:
+    """
+    Select messages matching every word of query with their rank, best first.
+    Postgres matches the GIN-indexed tsvector column and ranks with ts_rank;
+    SQLite joins the FTS5 table and ranks with -bm25() so higher is better there too.
+    """
+    rank: ColumnElement[float]
+    if dialect == "postgresql":
+        vector: ColumnElement[str] = literal_column(f"{Message.__tablename__}.{SEARCH_VECTOR_COLUMN}")
+        tsquery: ColumnElement[str] = func.plainto_tsquery(TEXT_SEARCH_CONFIG, query)
+        rank = func.ts_rank(vector, tsquery, type_=Float)
+        stmt = select(Message, rank.label("search_rank")).where(vector.op("@@")(tsquery))
+    else:
+        fts: TableClause = table(MESSAGES_FTS_TABLE, column("rowid"))
+        fts_row: ColumnElement[str] = literal_column(MESSAGES_FTS_TABLE)  # the hidden column named like the table
+        rank = -func.bm25(fts_row, type_=Float)
+        stmt = (
+            select(Message, rank.label("search_rank"))
+            .join_from(Message, fts, fts.c.rowid == Message.id)
+            .where(fts_row.op("MATCH")(fts5_query(query)))
+        )
+    if user_id is not None:
+        stmt = stmt.where(Message.user_id == user_id)
+    if after is not None:
+        stmt = stmt.where(tuple_(rank, Message.id) < tuple_(after.rank, after.id))
+    stmt = stmt.order_by(literal_column("search_rank").desc(), Message.id.desc())
+    return stmt.limit(limit) if limit is not None else stmt
+
 class MessageDAO:
-    """Data Access Object for Message entity."""
+    """
+    Data Access Object for Message entity.
+    Writes are flushed but never committed; the request's UnitOfWork owns the commit.
+    Lookups by ID are batched and memoized through a BatchLoader.
+    """
 
     def __init__(self: MessageDAO, session: AsyncSession) -> None:
         """Initialize with an async database session."""
         self.session: AsyncSession = session
+        self.loader: BatchLoader[int, Message] = BatchLoader(self._load)
+
+    async def _load(self: MessageDAO, ids: list[int]) -> Mapping[int, Message]:
+        """Fetch a batch of messages by ID."""
+        result: Result[Tuple[Message]] = await self.session.execute(get_messages_stmt(ids))
+        return {m.id: m for m in result.scalars()}
 
     @overload
     async def create(self: MessageDAO, user_id: str, content: str) -> Message:
@@ -37,41 +158,103 @@ async def create(
 
         msg = Message(user_id=user_id, content=content_value)
         self.session.add(msg)
-        await self.session.commit()
-        await self.session.refresh(msg)
+        await self.session.flush()  # INSERT ... RETURNING hydrates id and timestamps
+        self.loader.prime(msg.id, msg)
         return msg
 
+    async def create_many(self: MessageDAO, user_id: str, contents: Sequence[str]) -> Sequence[Message]:
+        """
+        Insert many messages of one user with multi-row INSERT ... RETURNING.
+        SQLAlchemy packs the rows into as few statements as the driver's
+        parameter limit allows, instead of one INSERT per message.
+        """
+        if not contents:
+            return []
+        result: ScalarResult[Message] = await self.session.scalars(
+            insert_messages_stmt(),
+            [{"user_id": user_id, "content": content} for content in contents],
+        )
+        msgs: list[Message] = sorted(result.all(), key=lambda m: m.id)  # IDs follow the VALUES order
+        for msg in msgs:
+            self.loader.prime(msg.id, msg)
+        return msgs
+
     async def get(self: MessageDAO, id: int) -> Message | None:
-        """Retrieve a message by its ID."""
-        result: Message | None = await self.session.get(Message, id)
-        return result
+        """Retrieve a message by its ID, batched with concurrent gets and memoized for the request."""
+        return await self.loader.load(id)
 
-    async def list(self: MessageDAO) -> Sequence[Message]:
-        """List all messages."""
-        result: Result[Tuple[Message]] = await self.session.execute(select(Message))
+    async def get_many(self: MessageDAO, ids: Sequence[int]) -> list[Message | None]:
+        """Get messages by ID with one IN query, in the order given; None marks a missing message."""
+        return await self.loader.load_many(ids)
+
+    async def list(self: MessageDAO, limit: int | None = None, after: Cursor | None = None) -> Sequence[Message]:
+        """List messages newest first: all of them, or up to limit after a cursor."""
+        result: Result[Tuple[Message]] = await self.session.execute(list_messages_stmt(limit, after))
         return result.scalars().all()
 
-    async def update(self: MessageDAO, id: int, content: str) -> Message | None:
-        """Update a message's content by its ID."""
-        msg: Message | None = await self.get(id)
+    async def search(
+        self: MessageDAO,
+        query: str,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: RankCursor | None = None,
+    ) -> list[Ranked[Message]]:
+        """Full-text search over message content through the database's index, best match first."""
+        if fts5_query(query) is None:
+            return []
+        dialect: str = self.session.get_bind().dialect.name
+        result: Result[Tuple[Message, float]] = await self.session.execute(
+            search_messages_stmt(dialect, query, user_id, limit, after)
+        )
+        return [Ranked(item=msg, rank=rank) for msg, rank in result.tuples()]
+
+    async def update(self: MessageDAO, id: int, content: str, owner: str | None = None) -> Message | None:
+        """
+        Update a message's content in one UPDATE ... RETURNING, restricted to owner's row when given.
+        Returns None when missing; raises NotOwnerError when the message belongs to someone else.
+        """
+        result: Result[Tuple[Message]] = await self.session.execute(
+            update_message_stmt(id, content, owner),
+            execution_options={"populate_existing": True},
+        )
+        msg: Message | None = result.scalars().one_or_none()
         if msg is None:
+            if owner is not None and await self.get(id) is not None:
+                raise NotOwnerError(id)
             return None
-        msg.content = content
-        await self.session.commit()
-        await self.session.refresh(msg)  # ✅ fixes the greenlet issue
+        self.loader.prime(id, msg)
         return msg
 
+    async def remove(self: MessageDAO, id: int, owner: str | None = None) -> Message | None:
+        """
+        Delete a message with one DELETE ... RETURNING and return the deleted row, restricted
+        to owner's message when given. None when missing; NotOwnerError when someone else's.
+        """
+        removed: Sequence[Message] = await self.remove_many([id], owner)
+        if not removed:
+            if owner is not None and await self.get(id) is not None:
+                raise NotOwnerError(id)
+            return None
+        return removed[0]
+
+    async def remove_many(self: MessageDAO, ids: list[int], owner: str | None = None) -> Sequence[Message]:
+        """Delete messages by ID in one statement and return the deleted rows; others' messages are skipped."""
+        result: Result[Tuple[Message]] = await self.session.execute(delete_messages_stmt(ids, owner))
+        removed: Sequence[Message] = result.scalars().all()
+        for msg in removed:
+            self.loader.prime(msg.id, None)
+        return removed
+
     async def delete(self: MessageDAO, id: int) -> bool:
         """Delete a message by its ID."""
-        msg: Message | None = await self.get(id)
-        if msg is None:
-            return False
-        await self.session.delete(msg)
-        await self.session.commit()
-        return True
-
-    async def list_by_user(self: MessageDAO, user_id: str) -> Sequence[Message]:
-        """List all messages for a given user ID."""
-        stmt: Select[Tuple[Message]] = select(Message).where(Message.user_id == user_id)
-        result: Result[Tuple[Message]] = await self.session.execute(stmt)
+        return await self.remove(id) is not None
+
+    async def list_by_user(
+        self: MessageDAO,
+        user_id: str,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[Message]:
+        """List the messages of a given user newest first, optionally one keyset page."""
+        result: Result[Tuple[Message]] = await self.session.execute(list_messages_by_user_stmt(user_id, limit, after))
         return result.scalars().all()
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime, timezone
+
+from app.db.full_text import search_terms
+from app.domain.errors import NotOwnerError
+from app.domain.messages.interfaces import MessageRepository
+from app.domain.messages.models import MessageDomain
+from app.domain.pagination import Cursor, RankCursor, Ranked
+from app.infrastructure.memory_store import InMemoryStore, PendingWrites, TransactionHook
+
+class InMemoryMessageRepository(MessageRepository):
+    """Standalone in-memory implementation of MessageRepository, for demo stacks and fast tests."""
+
+    def __init__(self: InMemoryMessageRepository, store: InMemoryStore[MessageDomain] | None = None) -> None:
+        """Initialize on a shared store, or a private one."""
+        self.store: InMemoryStore[MessageDomain] = store if store is not None else InMemoryStore()
+
+    async def create(self: InMemoryMessageRepository, user_id: str, content: str) -> MessageDomain:
+        """Create a new message in memory."""
+        now: datetime = datetime.now(timezone.utc)
+        message = MessageDomain(
+            id=self.store.next_id(),
+            user_id=user_id,
+            content=content,
+            created_at=now,
+            updated_at=now,
+        )
+        self.store.put(message)
+        return message
+
+    async def create_many(
+        self: InMemoryMessageRepository,
+        user_id: str,
+        contents: Sequence[str],
+    ) -> list[MessageDomain]:
+        """Create many messages in memory."""
+        return [await self.create(user_id, content) for content in contents]
+
+    async def get(self: InMemoryMessageRepository, id: int) -> MessageDomain | None:
+        """Retrieve a message by ID."""
+        return self.store.get(id)
+
+    async def get_many(self: InMemoryMessageRepository, ids: Sequence[int]) -> list[MessageDomain | None]:
+        """Retrieve messages by ID in the order given."""
+        return [self.store.get(id) for id in ids]
+
+    async def list(
+        self: InMemoryMessageRepository,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MessageDomain]:
+        """List messages, most recently updated first."""
+        return self.store.list(limit, after)
+
+    async def search(
+        self: InMemoryMessageRepository,
+        query: str,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: RankCursor | None = None,
+    ) -> list[Ranked[MessageDomain]]:
+        """Scan for messages containing every query word (exact words, no stemming), ranked by their share of the text."""
+        terms: set[str] = set(search_terms(query))
+        if not terms:
+            return []
+        hits: list[Ranked[MessageDomain]] = []
+        for message in self.store.list():
+            if user_id is not None and message.user_id != user_id:
+                continue
+            words: list[str] = search_terms(message.content)
+            if not terms <= set(words):
+                continue
+            hit = Ranked(item=message, rank=sum(w in terms for w in words) / len(words))
+            if after is None or (hit.rank, message.id) < (after.rank, after.id):
+                hits.append(hit)
+        hits.sort(key=lambda h: (h.rank, h.item.id), reverse=True)
+        return hits[:limit] if limit is not None else hits
+
+    async def update(
+        self: InMemoryMessageRepository,
+        id: int,
+        content: str,
+        owner: str | None = None,
+    ) -> MessageDomain | None:
+        """Update a message's content by ID, restricted to owner's message when given."""
+        existing: MessageDomain | None = self.store.get(id)
+        if existing is None:
+            return None
+        if owner is not None and existing.user_id != owner:
+            raise NotOwnerError(id)
+        updated: MessageDomain = existing.model_copy(
+            update={"content": content, "updated_at": datetime.now(timezone.utc)}
+        )
+        self.store.put(updated)
+        return updated
+
+    async def remove(self: InMemoryMessageRepository, id: int, owner: str | None = None) -> MessageDomain | None:
+        """Delete a message by ID and return it, restricted to owner's message when given."""
+        existing: MessageDomain | None = self.store.get(id)
+        if existing is None:
+            return None
+        if owner is not None and existing.user_id != owner:
+            raise NotOwnerError(id)
+        return self.store.remove(id)
+
+    async def remove_many(
+        self: InMemoryMessageRepository,
+        ids: list[int],
+        owner: str | None = None,
+    ) -> list[MessageDomain]:
+        """Delete messages by ID and return those deleted; with an owner, other users' messages are skipped."""
+        removed: list[MessageDomain] = []
+        for id in ids:
+            existing: MessageDomain | None = self.store.get(id)
+            if existing is not None and (owner is None or existing.user_id == owner):
+                self.store.remove(id)
+                removed.append(existing)
+        return removed
+
+    async def delete(self: InMemoryMessageRepository, id: int) -> bool:
+        """Delete a message by ID."""
+        return self.store.remove(id) is not None
+
+    async def list_by_user(
+        self: InMemoryMessageRepository,
+        user_id: str,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MessageDomain]:
+        """List messages created by a specific user, most recently updated first."""
+        return self.store.list_by_user(user_id, limit, after)
+
+
+class WriteThroughMessageRepository(MessageRepository):
+    """
+    In-memory front for another MessageRepository, usually the SQL one.
+    Writes go to the backend first and reach the store once the unit of
+    work commits; until then only this front sees them, and listings skip
+    the store. Reads are served from the store and fall through to the
+    backend on a miss. The store is process-local, so this only stays
+    coherent when a single process writes to the database.
+    """
+
+    def __init__(
+        self: WriteThroughMessageRepository,
+        backend: MessageRepository,
+        store: InMemoryStore[MessageDomain],
+        on_commit: TransactionHook | None = None,
+        on_rollback: TransactionHook | None = None,
+    ) -> None:
+        """Initialize the front with its backend, shared store and the unit of work's hooks."""
+        self.backend: MessageRepository = backend
+        self.store: InMemoryStore[MessageDomain] = store
+        self.pending: PendingWrites[MessageDomain] = PendingWrites(store, on_commit, on_rollback)
+
+    def _cached(self: WriteThroughMessageRepository, id: int) -> MessageDomain | None:
+        """This unit of work's own write of a message, else the stored copy."""
+        return self.pending.get(id) if id in self.pending else self.store.get(id)
+
+    def _mirror(self: WriteThroughMessageRepository, messages: Sequence[MessageDomain], since: int) -> list[MessageDomain]:
+        """Fill the store with rows read from the backend since a version, leaving out pending writes."""
+        self.store.fill([item for item in messages if item.id not in self.pending], since)
+        return list(messages)
+
+    async def create(self: WriteThroughMessageRepository, user_id: str, content: str) -> MessageDomain:
+        """Create a message in the backend and mirror it."""
+        created: MessageDomain = await self.backend.create(user_id, content)
+        self.pending.put(created)
+        return created
+
+    async def create_many(
+        self: WriteThroughMessageRepository,
+        user_id: str,
+        contents: Sequence[str],
+    ) -> list[MessageDomain]:
+        """Create many messages in the backend and mirror them."""
+        created: list[MessageDomain] = await self.backend.create_many(user_id, contents)
+        for msg in created:
+            self.pending.put(msg)
+        return created
+
+    async def get(self: WriteThroughMessageRepository, id: int) -> MessageDomain | None:
+        """Retrieve a message from memory, loading it from the backend on a miss."""
+        if id in self.pending:
+            return self.pending.get(id)
+        cached: MessageDomain | None = self.store.get(id)
+        if cached is not None:
+            return cached
+        with self.store.filling() as since:
+            loaded: MessageDomain | None = await self.backend.get(id)
+            if loaded is not None:
+                self._mirror([loaded], since)
+        return loaded
+
+    async def get_many(self: WriteThroughMessageRepository, ids: Sequence[int]) -> list[MessageDomain | None]:
+        """Retrieve messages from memory, loading all misses from the backend in one call."""
+        found: dict[int, MessageDomain] = {}
+        for id in ids:
+            cached: MessageDomain | None = self._cached(id)
+            if cached is not None:
+                found[id] = cached
+        missing: list[int] = [id for id in ids if id not in found and id not in self.pending]
+        if missing:
+            with self.store.filling() as since:
+                loaded: list[MessageDomain] = [item for item in await self.backend.get_many(missing) if item is not None]
+                self._mirror(loaded, since)
+            for item in loaded:
+                found[item.id] = item
+        return [found.get(id) for id in ids]
+
+    async def list(
+        self: WriteThroughMessageRepository,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MessageDomain]:
+        """List messages, loading the whole table once; pages are read from the backend until then."""
+        if self.pending:
+            return list(await self.backend.list(limit, after))
+        if not self.store.complete:
+            with self.store.filling() as since:
+                if limit is not None or after is not None:
+                    return self._mirror(await self.backend.list(limit, after), since)
+                self._mirror(await self.backend.list(), since)
+                self.store.mark_complete(since)
+        return self.store.list(limit, after)
+
+    async def search(
+        self: WriteThroughMessageRepository,
+        query: str,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: RankCursor | None = None,
+    ) -> list[Ranked[MessageDomain]]:
+        """Search through the backend's full-text index and mirror the hits."""
+        with self.store.filling() as since:
+            hits: list[Ranked[MessageDomain]] = await self.backend.search(query, user_id, limit, after)
+            self._mirror([h.item for h in hits], since)
+        return hits
+
+    async def update(
+        self: WriteThroughMessageRepository,
+        id: int,
+        content: str,
+        owner: str | None = None,
+    ) -> MessageDomain | None:
+        """Update a message in the backend and mirror the result."""
+        updated: MessageDomain | None = await self.backend.update(id, content, owner)
+        if updated is None:
+            self.store.invalidate(id)
+            return None
+        self.pending.put(updated)
+        return updated
+
+    async def remove(self: WriteThroughMessageRepository, id: int, owner: str | None = None) -> MessageDomain | None:
+        """Delete a message in the backend and evict it."""
+        removed: MessageDomain | None = await self.backend.remove(id, owner)
+        if removed is None:
+            self.store.invalidate(id)
+            return None
+        self.pending.remove(id, removed.user_id)
+        return removed
+
+    async def remove_many(
+        self: WriteThroughMessageRepository,
+        ids: list[int],
+        owner: str | None = None,
+    ) -> list[MessageDomain]:
+        """Delete messages in the backend and evict those deleted."""
+        removed: list[MessageDomain] = await self.backend.remove_many(ids, owner)
+        for item in removed:
+            self.pending.remove(item.id, item.user_id)
+        return removed
+
+    async def delete(self: WriteThroughMessageRepository, id: int) -> bool:
+        """Delete a message in the backend and evict it."""
+        known: MessageDomain | None = self._cached(id)
+        deleted: bool = await self.backend.delete(id)
+        if deleted and known is not None:
+            self.pending.remove(id, known.user_id)
+        return deleted
+
+    async def list_by_user(
+        self: WriteThroughMessageRepository,
+        user_id: str,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MessageDomain]:
+        """List a user's messages, loading them once per user; pages are read from the backend until then."""
+        if self.pending:
+            return list(await self.backend.list_by_user(user_id, limit, after))
+        if not self.store.complete and user_id not in self.store.complete_users:
+            with self.store.filling() as since:
+                if limit is not None or after is not None:
+                    return self._mirror(await self.backend.list_by_user(user_id, limit, after), since)
+                self._mirror(await self.backend.list_by_user(user_id), since)
+                self.store.mark_complete(since, user_id)
+        return self.store.list_by_user(user_id, limit, after)
@@ -4,39 +4,91 @@
 from app.db.entities.message import Message
 from app.domain.messages.models import MessageDomain
 from app.domain.messages.interfaces import MessageRepository
+from app.domain.pagination import Cursor, RankCursor, Ranked
 from app.infrastructure.messages.dao import MessageDAO
+from app.infrastructure.messages.sharded_dao import ShardedMessageDAO
 
 class SqlAlchemyMessageRepository(MessageRepository):
     """SQLAlchemy implementation of MessageRepository."""
 
-    def __init__(self: SqlAlchemyMessageRepository, dao: MessageDAO) -> None:
-        """Initialize with a MessageDAO instance."""
-        self.dao: MessageDAO = dao
+    def __init__(self: SqlAlchemyMessageRepository, dao: MessageDAO | ShardedMessageDAO) -> None:
+        """Initialize with a MessageDAO or ShardedMessageDAO instance."""
+        self.dao: MessageDAO | ShardedMessageDAO = dao
 
     async def create(self: SqlAlchemyMessageRepository, user_id: str, content: str) -> MessageDomain:
         """Create a new message."""
         db_obj: Message = await self.dao.create(user_id, content)
         return MessageDomain.from_entity(db_obj)
 
+    async def create_many(
+        self: SqlAlchemyMessageRepository,
+        user_id: str,
+        contents: Sequence[str],
+    ) -> list[MessageDomain]:
+        """Create many messages with multi-row INSERT ... RETURNING."""
+        return [MessageDomain.from_entity(m) for m in await self.dao.create_many(user_id, contents)]
+
     async def get(self: SqlAlchemyMessageRepository, id: int) -> MessageDomain | None:
         """Retrieve a message by ID."""
         db_obj: Message | None = await self.dao.get(id)
         return MessageDomain.from_entity(db_obj) if db_obj else None
 
-    async def list(self: SqlAlchemyMessageRepository) -> list[MessageDomain]:
-        """List all messages."""
-        return [MessageDomain.from_entity(m) for m in await self.dao.list()]
+    async def get_many(self: SqlAlchemyMessageRepository, ids: Sequence[int]) -> list[MessageDomain | None]:
+        """Get messages by ID with a single query, in the order given."""
+        return [MessageDomain.from_entity(m) if m else None for m in await self.dao.get_many(ids)]
+
+    async def list(
+        self: SqlAlchemyMessageRepository,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MessageDomain]:
+        """List messages newest first, optionally one keyset page."""
+        return [MessageDomain.from_entity(m) for m in await self.dao.list(limit, after)]
+
+    async def search(
+        self: SqlAlchemyMessageRepository,
+        query: str,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: RankCursor | None = None,
+    ) -> list[Ranked[MessageDomain]]:
+        """Full-text search through the database's index, best match first."""
+        hits: list[Ranked[Message]] = await self.dao.search(query, user_id, limit, after)
+        return [Ranked(item=MessageDomain.from_entity(h.item), rank=h.rank) for h in hits]
 
-    async def update(self: SqlAlchemyMessageRepository, id: int, content: str) -> MessageDomain | None:
-        """Update a message's content by ID."""
-        db_obj: Message | None = await self.dao.update(id, content)
+    async def update(
+        self: SqlAlchemyMessageRepository,
+        id: int,
+        content: str,
+        owner: str | None = None,
+    ) -> MessageDomain | None:
+        """Update a message's content by ID in a single statement, restricted to owner when given."""
+        db_obj: Message | None = await self.dao.update(id, content, owner)
         return MessageDomain.from_entity(db_obj) if db_obj else None
 
+    async def remove(self: SqlAlchemyMessageRepository, id: int, owner: str | None = None) -> MessageDomain | None:
+        """Delete a message in a single statement and return it, restricted to owner when given."""
+        db_obj: Message | None = await self.dao.remove(id, owner)
+        return MessageDomain.from_entity(db_obj) if db_obj else None
+
+    async def remove_many(
+        self: SqlAlchemyMessageRepository,
+        ids: list[int],
+        owner: str | None = None,
+    ) -> list[MessageDomain]:
+        """Delete messages by ID in a single statement and return those deleted."""
+        return [MessageDomain.from_entity(m) for m in await self.dao.remove_many(ids, owner)]
+
     async def delete(self: SqlAlchemyMessageRepository, id: int) -> bool:
         """Delete a message by ID."""
         return await self.dao.delete(id)
 
-    async def list_by_user(self: SqlAlchemyMessageRepository, user_id: str) -> list[MessageDomain]:
-        """List all messages created by a specific user."""
-        db_objs: Sequence[Message] = await self.dao.list_by_user(user_id)
+    async def list_by_user(
+        self: SqlAlchemyMessageRepository,
+        user_id: str,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MessageDomain]:
+        """List the messages of a specific user newest first, optionally one keyset page."""
+        db_objs: Sequence[Message] = await self.dao.list_by_user(user_id, limit, after)
         return [MessageDomain.from_entity(message) for message in db_objs]
@@ -0,0 +1,186 @@
+from __future__ import annotations
+import asyncio
+from typing import Sequence, Tuple, Union
+
+from sqlalchemy import Result
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.entities.message import Message
+from app.db.sharding import ShardedUnitOfWork
+from app.domain.errors import NotOwnerError
+from app.db.full_text import fts5_query
+from app.domain.pagination import Cursor, RankCursor, Ranked
+from app.infrastructure.messages.dao import MessageDAO, list_messages_stmt, search_messages_stmt
+from app.schemas.messages.messages import MessageCreate
+
+class ShardedMessageDAO:
+    """
+    MessageDAO counterpart that partitions messages across shards by user_id.
+    Per-user calls hit a single shard, lookups by ID decode the shard from
+    the global ID, and list() scatter-gathers every shard concurrently.
+    Returned messages are detached copies carrying global IDs.
+    """
+
+    def __init__(self: ShardedMessageDAO, uow: ShardedUnitOfWork) -> None:
+        """Initialize with a sharded unit of work."""
+        self.uow: ShardedUnitOfWork = uow
+        self.daos: dict[int, MessageDAO] = {}
+
+    def _dao(self: ShardedMessageDAO, shard: int) -> MessageDAO:
+        """Shard-local DAO sharing the unit of work's session (and batch loader) for that shard."""
+        if shard not in self.daos:
+            self.daos[shard] = MessageDAO(self.uow.session(shard))
+        return self.daos[shard]
+
+    def _local_after(self: ShardedMessageDAO, shard: int, after: Cursor | None) -> Cursor | None:
+        """Translate a cursor on global IDs into the equivalent one on a shard's local IDs."""
+        if after is None:
+            return None
+        return Cursor(updated_at=after.updated_at, id=self.uow.router.local_bound(shard, after.id))
+
+    def _to_global(self: ShardedMessageDAO, shard: int, msg: Message) -> Message:
+        """Copy a shard-local message, replacing its ID with the global one."""
+        return Message(
+            id=self.uow.router.global_id(shard, msg.id),
+            user_id=msg.user_id,
+            content=msg.content,
+            created_at=msg.created_at,
+            updated_at=msg.updated_at,
+        )
+
+    async def create(
+        self: ShardedMessageDAO,
+        user_id: str,
+        content: Union[str, MessageCreate],
+    ) -> Message:
+        """Create a message on the user's shard."""
+        shard: int = self.uow.router.shard_for(user_id)
+        return self._to_global(shard, await self._dao(shard).create(user_id, content))
+
+    async def create_many(self: ShardedMessageDAO, user_id: str, contents: Sequence[str]) -> list[Message]:
+        """Insert many messages of one user on their shard in multi-row statements."""
+        shard: int = self.uow.router.shard_for(user_id)
+        return [self._to_global(shard, m) for m in await self._dao(shard).create_many(user_id, contents)]
+
+    async def get(self: ShardedMessageDAO, id: int) -> Message | None:
+        """Retrieve a message by global ID from the shard encoded in it."""
+        shard, local_id = self.uow.router.locate(id)
+        msg: Message | None = await self._dao(shard).get(local_id)
+        return self._to_global(shard, msg) if msg else None
+
+    async def get_many(self: ShardedMessageDAO, ids: Sequence[int]) -> list[Message | None]:
+        """Get messages by global ID with one query per shard involved, run concurrently, in the order given."""
+        by_shard: dict[int, list[int]] = {}
+        for id in ids:
+            shard, local_id = self.uow.router.locate(id)
+            by_shard.setdefault(shard, []).append(local_id)
+
+        async def load(shard: int, local_ids: list[int]) -> dict[int, Message]:
+            loaded: list[Message | None] = await self._dao(shard).get_many(local_ids)
+            return {g.id: g for g in (self._to_global(shard, m) for m in loaded if m is not None)}
+
+        found: dict[int, Message] = {}
+        for shard_found in await asyncio.gather(*(load(s, local) for s, local in by_shard.items())):
+            found.update(shard_found)
+        return [found.get(id) for id in ids]
+
+    async def list(
+        self: ShardedMessageDAO,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[Message]:
+        """Return messages newest first, merging the same page from every shard concurrently."""
+
+        async def fetch(shard: int, session: AsyncSession) -> list[Message]:
+            local_after: Cursor | None = self._local_after(shard, after)
+            result: Result[Tuple[Message]] = await session.execute(list_messages_stmt(limit, local_after))
+            return [self._to_global(shard, m) for m in result.scalars()]
+
+        shards: list[list[Message]] = await self.uow.scatter(fetch)
+        merged: list[Message] = sorted(
+            (m for messages in shards for m in messages),
+            key=lambda m: (m.updated_at, m.id),
+            reverse=True,
+        )
+        return merged[:limit] if limit is not None else merged
+
+    async def search(
+        self: ShardedMessageDAO,
+        query: str,
+        user_id: str | None = None,
+        limit: int | None = None,
+        after: RankCursor | None = None,
+    ) -> list[Ranked[Message]]:
+        """Full-text search on the user's shard, or on every shard concurrently with the hits merged by rank."""
+
+        def local_after(shard: int) -> RankCursor | None:
+            if after is None:
+                return None
+            return RankCursor(rank=after.rank, id=self.uow.router.local_bound(shard, after.id))
+
+        def to_global(shard: int, hits: Sequence[Ranked[Message]]) -> list[Ranked[Message]]:
+            return [Ranked(item=self._to_global(shard, h.item), rank=h.rank) for h in hits]
+
+        if user_id is not None:
+            shard: int = self.uow.router.shard_for(user_id)
+            return to_global(shard, await self._dao(shard).search(query, user_id, limit, local_after(shard)))
+        if fts5_query(query) is None:
+            return []
+
+        async def fetch(shard: int, session: AsyncSession) -> list[Ranked[Message]]:
+            stmt = search_messages_stmt(session.get_bind().dialect.name, query, None, limit, local_after(shard))
+            result: Result[Tuple[Message, float]] = await session.execute(stmt)
+            return to_global(shard, [Ranked(item=m, rank=rank) for m, rank in result.tuples()])
+
+        shards: list[list[Ranked[Message]]] = await self.uow.scatter(fetch)
+        merged: list[Ranked[Message]] = sorted(
+            (h for hits in shards for h in hits),
+            key=lambda h: (h.rank, h.item.id),
+            reverse=True,
+        )
+        return merged[:limit] if limit is not None else merged
+
+    async def update(self: ShardedMessageDAO, id: int, content: str, owner: str | None = None) -> Message | None:
+        """Update a message's content by global ID, restricted to owner's message when given."""
+        shard, local_id = self.uow.router.locate(id)
+        try:
+            msg: Message | None = await self._dao(shard).update(local_id, content, owner)
+        except NotOwnerError:
+            raise NotOwnerError(id) from None
+        return self._to_global(shard, msg) if msg else None
+
+    async def remove(self: ShardedMessageDAO, id: int, owner: str | None = None) -> Message | None:
+        """Delete a message by global ID and return it, restricted to owner's message when given."""
+        shard, local_id = self.uow.router.locate(id)
+        try:
+            removed: Message | None = await self._dao(shard).remove(local_id, owner)
+        except NotOwnerError:
+            raise NotOwnerError(id) from None
+        return self._to_global(shard, removed) if removed else None
+
+    async def remove_many(self: ShardedMessageDAO, ids: list[int], owner: str | None = None) -> list[Message]:
+        """Delete messages by global ID with one statement per shard involved, run concurrently."""
+        by_shard: dict[int, list[int]] = {}
+        for id in ids:
+            shard, local_id = self.uow.router.locate(id)
+            by_shard.setdefault(shard, []).append(local_id)
+
+        async def remove(shard: int, local_ids: list[int]) -> list[Message]:
+            return [self._to_global(shard, m) for m in await self._dao(shard).remove_many(local_ids, owner)]
+
+        removed: list[list[Message]] = await asyncio.gather(*(remove(s, local) for s, local in by_shard.items()))
+        return [m for shard_removed in removed for m in shard_removed]
+
+    async def delete(self: ShardedMessageDAO, id: int) -> bool:
+        """Delete a message by global ID."""
+        return await self.remove(id) is not None
+
+    async def list_by_user(
+        self: ShardedMessageDAO,
+        user_id: str,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> Sequence[Message]:
+        """Return the messages of a specific user newest first from their shard."""
+        shard: int = self.uow.router.shard_for(user_id)
+        local: Sequence[Message] = await self._dao(shard).list_by_user(user_id, limit, self._local_after(shard, after))
+        return [self._to_global(shard, m) for m in local]
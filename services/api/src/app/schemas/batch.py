@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class BatchStatus(str, Enum):
+    """Outcome of one ID in a batch read."""
+
+    OK = "ok"
+    NOT_FOUND = "not_found"
+    FORBIDDEN = "forbidden"
+
+
+class BatchItem(BaseModel, Generic[T]):
+    """One requested ID of a batch read, in request order; item is null unless status is ok."""
+
+    id: int
+    status: BatchStatus
+    item: T | None = Field(default=None)
@@ -0,0 +1,8 @@
+from .datasets import DATASET_NAME_PATTERN, DatasetInfoRead, DatasetSliceRead, DatasetWrite
+
+__all__: list[str] = [
+    "DATASET_NAME_PATTERN",
+    "DatasetInfoRead",
+    "DatasetSliceRead",
+    "DatasetWrite",
+]
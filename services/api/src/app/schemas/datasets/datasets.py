@@ -0,0 +1,33 @@
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# Dataset names become storage path segments
+DATASET_NAME_PATTERN: str = r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$"
+
+class DatasetWrite(BaseModel):
+    """Column-oriented dataset upload."""
+    columns: dict[str, list[Any]] = Field(..., examples=[{"lon": [-71.06, -71.05], "lat": [42.36, 42.35], "name": ["a", "b"]}])
+    x: str | None = Field(default=None, examples=["lon"], description="Numeric column used as the x axis for bounding-box reads")
+    y: str | None = Field(default=None, examples=["lat"], description="Numeric column used as the y axis for bounding-box reads")
+
+class DatasetInfoRead(BaseModel):
+    """Shape of a stored dataset."""
+    map_id: int
+    name: str
+    rows: int
+    columns: dict[str, str]
+    x: str | None = None
+    y: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class DatasetSliceRead(BaseModel):
+    """Rows returned by a dataset read."""
+    map_id: int
+    name: str
+    row_ids: list[int]
+    columns: dict[str, list[Any]]
+    truncated: bool = False
+
+    model_config = ConfigDict(from_attributes=True)
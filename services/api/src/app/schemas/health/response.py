@@ -7,3 +7,20 @@ class HealthCheckResponse(BaseModel):
     status: HealthStatus
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     details: dict[str, str] = Field(default_factory=dict)
+
+class PoolStatsResponse(BaseModel):
+    """Response model for database connection pool statistics."""
+    pool: str
+    size: int | None = None
+    checked_in: int | None = None
+    checked_out: int | None = None
+    overflow: int | None = None
+    checkouts: int
+    checkout_timeouts: int
+    checkout_wait_avg_ms: float
+    checkout_wait_max_ms: float
+    connections_opened: int
+    connections_closed: int
+    connections_open: int
+    connection_age_max_s: float
+    connection_age_avg_s: float
@@ -1,3 +1,3 @@
-from .maps import MapCreate, MapUpdate, MapRead, MapSave
+from .maps import MapCreate, MapUpdate, MapRead, MapSave, MapSearchHit, MapStateFragments, MapSummary
 
-__all__: list[str] = ["MapCreate", "MapUpdate", "MapRead", "MapSave"]
+__all__: list[str] = ["MapCreate", "MapUpdate", "MapRead", "MapSave", "MapSummary", "MapSearchHit", "MapStateFragments"]
@@ -1,10 +1,42 @@
+import json
+import re
 from datetime import datetime
+from typing import Annotated, Any
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
 
 from app.auth.oidc_user import OIDCUser
 
 
+# A \u0000 escape not itself escaped; JSONB cannot store NUL characters
+_NUL_ESCAPE: re.Pattern[str] = re.compile(r"(?<!\\)(?:\\\\)*\\u0000")
+
+
+def _reject_constant(name: str) -> float:
+    """NaN and Infinity are not JSON, though Python's parser accepts them."""
+    raise ValueError(f"{name} is not valid JSON")
+
+
+def _json_document(value: str) -> str:
+    """Reject state that Postgres would not accept as JSONB."""
+    try:
+        document: Any = json.loads(value, parse_constant=_reject_constant)
+    except ValueError:
+        raise ValueError("state must be a JSON document")
+    if _NUL_ESCAPE.search(value):
+        raise ValueError("state must not contain \\u0000")
+    try:
+        # Unpaired surrogate escapes such as \ud800 decode, but are not Unicode text
+        json.dumps(document, ensure_ascii=False).encode("utf-8")
+    except UnicodeEncodeError:
+        raise ValueError("state must not contain unpaired surrogates")
+    return value
+
+
+# Map state as written by clients: kept as the string sent, but must parse as JSON
+JSONState = Annotated[str, AfterValidator(_json_document)]
+
+
 class MapBase(BaseModel):
     """Shared fields for creating or reading a map."""
 
@@ -15,14 +47,15 @@ class MapBase(BaseModel):
 
 class MapCreate(MapBase):
     """Schema for creating a new map."""
-    pass
+
+    state: JSONState = Field(..., examples=["{...}"])
 
 
 class MapUpdate(BaseModel):
     """Schema for updating a map."""
     name: str
     description: str
-    state: str
+    state: JSONState
 
 
 class MapRead(MapBase):
@@ -36,6 +69,41 @@ class MapRead(MapBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class MapSummary(BaseModel):
+    """Schema for listing a map without its state."""
+
+    id: int
+    user_id: str
+    user: OIDCUser
+    name: str
+    description: str
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class MapStateFragments(BaseModel):
+    """Schema for parts of a map's state read by JSON path."""
+
+    id: int
+    user_id: str
+    user: OIDCUser
+    fragments: dict[str, Any] = Field(
+        ...,
+        description="Value at each requested path that exists in the state",
+        examples=[{"config.mapState": {"latitude": 52.52, "longitude": 13.4, "zoom": 10}}],
+    )
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class MapSearchHit(MapSummary):
+    """Schema for a fuzzy map search result."""
+
+    rank: float = Field(..., description="Trigram word similarity from 0 to 1; higher is better")
+
 class MapSave(MapBase):
     """Model for creating or updating a map."""
     id: int | None = None
+    state: JSONState = Field(..., examples=["{...}"])
@@ -1,7 +1,10 @@
-from .messages import MessageCreate, MessageUpdate, MessageRead
+from .messages import MessageBulkError, MessageBulkRead, MessageCreate, MessageUpdate, MessageRead, MessageSearchHit
 
 __all__: list[str] = [
     "MessageCreate",
     "MessageUpdate",
     "MessageRead",
+    "MessageSearchHit",
+    "MessageBulkError",
+    "MessageBulkRead",
 ]
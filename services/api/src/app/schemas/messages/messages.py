@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Any
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.auth.oidc_user import OIDCUser
@@ -24,3 +25,18 @@ class MessageRead(MessageBase):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+class MessageSearchHit(MessageRead):
+    """Schema for a full-text search result."""
+
+    rank: float = Field(..., description="Relevance; higher is better, comparable within one search only")
+
+class MessageBulkError(BaseModel):
+    """A bulk item that was not created, with pydantic-style validation errors."""
+    index: int = Field(..., description="Position of the item in the request body")
+    detail: list[dict[str, Any]]
+
+class MessageBulkRead(BaseModel):
+    """Outcome of a bulk create: created messages in request order, and the items that were rejected."""
+    created: list[MessageRead]
+    errors: list[MessageBulkError]
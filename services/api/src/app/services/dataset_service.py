@@ -0,0 +1,68 @@
+from __future__ import annotations
+from typing import Sequence
+
+from app.domain.datasets.interfaces import DatasetRepository
+from app.domain.datasets.models import BoundingBox, DatasetInfo, DatasetSlice
+from app.schemas.datasets import DatasetSliceRead, DatasetWrite
+
+
+class DatasetService:
+    """Service layer for map datasets, capping how many rows one read returns."""
+
+    def __init__(self: DatasetService, repo: DatasetRepository, read_max_rows: int) -> None:
+        """Initialize the DatasetService with a repository and a per-read row cap."""
+        self.repo: DatasetRepository = repo
+        self.read_max_rows: int = read_max_rows
+
+    async def write(self: DatasetService, map_id: int, name: str, payload: DatasetWrite) -> DatasetInfo:
+        """Store a dataset for a map."""
+        return await self.repo.write(map_id, name, payload.columns, x=payload.x, y=payload.y)
+
+    async def info(self: DatasetService, map_id: int, name: str) -> DatasetInfo | None:
+        """Describe a dataset."""
+        return await self.repo.info(map_id, name)
+
+    async def read_rows(
+        self: DatasetService,
+        map_id: int,
+        name: str,
+        start: int,
+        stop: int | None,
+        columns: Sequence[str] | None = None,
+    ) -> DatasetSliceRead | None:
+        """Read a row range, clamped to read_max_rows."""
+        limit: int = start + self.read_max_rows
+        end: int = limit if stop is None else min(stop, limit)
+        data: DatasetSlice | None = await self.repo.read_rows(map_id, name, start, end, columns)
+        if data is None:
+            return None
+        truncated: bool = False
+        if (stop is None or stop > limit) and len(data.row_ids) == self.read_max_rows:
+            info: DatasetInfo | None = await self.repo.info(map_id, name)
+            truncated = info is not None and info.rows > end
+        return DatasetSliceRead(**data.model_dump(), truncated=truncated)
+
+    async def read_bbox(
+        self: DatasetService,
+        map_id: int,
+        name: str,
+        bbox: BoundingBox,
+        columns: Sequence[str] | None = None,
+    ) -> DatasetSliceRead | None:
+        """Read the rows inside a bounding box, keeping the first read_max_rows."""
+        data: DatasetSlice | None = await self.repo.read_bbox(map_id, name, bbox, columns)
+        if data is None:
+            return None
+        truncated: bool = len(data.row_ids) > self.read_max_rows
+        if truncated:
+            data = DatasetSlice(
+                map_id=data.map_id,
+                name=data.name,
+                row_ids=data.row_ids[: self.read_max_rows],
+                columns={c: values[: self.read_max_rows] for c, values in data.columns.items()},
+            )
+        return DatasetSliceRead(**data.model_dump(), truncated=truncated)
+
+    async def delete(self: DatasetService, map_id: int, name: str) -> bool:
+        """Delete a dataset."""
+        return await self.repo.delete(map_id, name)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 from typing import Sequence
 
+from app.domain.maps.filters import StateFilter
 from app.domain.maps.interfaces import MapRepository
-from app.domain.maps.models import MapDomain
+from app.domain.maps.models import MapDomain, MapFragmentsDomain, MapSummaryDomain
+from app.domain.maps.paths import StatePath
+from app.domain.pagination import Cursor, Page, RankCursor, RankedPage, to_page, to_ranked_page
 from app.schemas.maps import MapSave
 
 
@@ -22,10 +25,31 @@ async def create(self: MapService, user_id: str, payload: MapSave) -> MapDomain:
             state=payload.state,
         )
 
+    async def save(self: MapService, user_id: str, payload: MapSave) -> tuple[MapDomain, bool] | None:
+        """
+        Create the map, or update it if payload.id names one of the user's maps.
+        Returns the map and whether it was created, or None when another user owns it.
+        """
+        return await self.repo.upsert(
+            payload.id,
+            user_id,
+            payload.name,
+            payload.description,
+            payload.state,
+        )
+
     async def get(self: MapService, id: int) -> MapDomain | None:
         """Retrieve a single map by ID."""
         return await self.repo.get(id)
 
+    async def get_fragments(self: MapService, id: int, paths: Sequence[StatePath]) -> MapFragmentsDomain | None:
+        """Retrieve the values at paths of a map's state, without reading the rest of it where possible."""
+        return await self.repo.get_fragments(id, paths)
+
+    async def get_many(self: MapService, ids: Sequence[int]) -> Sequence[MapDomain | None]:
+        """Retrieve maps by ID with one query, in the order given; None marks a missing map."""
+        return await self.repo.get_many(ids)
+
     async def list(self: MapService) -> Sequence[MapDomain]:
         """List all maps (admin use only)."""
         return await self.repo.list()
@@ -34,12 +58,62 @@ async def list_by_user(self: MapService, user_id: str) -> Sequence[MapDomain]:
         """List all maps owned by a given user."""
         return await self.repo.list_by_user(user_id)
 
-    async def update(self: MapService, id: int, payload: MapSave) -> MapDomain | None:
-        """Update an existing map by ID."""
+    async def page(self: MapService, limit: int, after: Cursor | None = None) -> Page[MapDomain]:
+        """One page of all maps, newest first (admin use only)."""
+        return to_page(await self.repo.list(limit + 1, after), limit)
+
+    async def page_by_user(
+        self: MapService,
+        user_id: str,
+        limit: int,
+        after: Cursor | None = None,
+    ) -> Page[MapDomain]:
+        """One page of a user's maps, newest first."""
+        return to_page(await self.repo.list_by_user(user_id, limit + 1, after), limit)
+
+    async def page_summaries(
+        self: MapService,
+        user_id: str | None,
+        limit: int,
+        after: Cursor | None = None,
+    ) -> Page[MapSummaryDomain]:
+        """One page of map summaries (no state), newest first: a user's, or all maps when user_id is None."""
+        return to_page(await self.repo.list_summaries(user_id, limit + 1, after), limit)
+
+    async def page_matching(
+        self: MapService,
+        state: StateFilter,
+        user_id: str | None,
+        limit: int,
+        after: Cursor | None = None,
+    ) -> Page[MapSummaryDomain]:
+        """One page of summaries of maps whose state matches a filter, newest first: a user's, or all maps."""
+        return to_page(await self.repo.list_matching(state, user_id, limit + 1, after), limit)
+
+    async def search(
+        self: MapService,
+        query: str,
+        owner: str | None,
+        limit: int,
+        after: RankCursor | None = None,
+    ) -> RankedPage[MapSummaryDomain]:
+        """One page of map summaries fuzzily matching query, best first: owner's only, or all when owner is None."""
+        return to_ranked_page(await self.repo.search(query, owner, limit + 1, after), limit)
+
+    async def update(self: MapService, id: int, payload: MapSave, owner: str | None = None) -> MapDomain | None:
+        """Update an existing map by ID; with an owner, raises NotOwnerError for anyone else's map."""
         return await self.repo.update(
-            id, payload.name, payload.description, payload.state
+            id, payload.name, payload.description, payload.state, owner
         )
 
+    async def remove(self: MapService, id: int, owner: str | None = None) -> MapDomain | None:
+        """Delete a map and return it; with an owner, raises NotOwnerError for anyone else's map."""
+        return await self.repo.remove(id, owner)
+
+    async def remove_many(self: MapService, ids: list[int], owner: str | None = None) -> list[MapDomain]:
+        """Delete maps by ID and return those deleted; with an owner, other users' maps are skipped."""
+        return await self.repo.remove_many(ids, owner)
+
     async def delete(self: MapService, id: int) -> bool:
         """Delete a map by ID."""
         return await self.repo.delete(id)
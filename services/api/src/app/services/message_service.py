@@ -4,6 +4,7 @@
 from app.domain.messages.interfaces import MessageRepository
 from app.schemas.messages import MessageCreate, MessageUpdate
 from app.domain.messages.models import MessageDomain
+from app.domain.pagination import Cursor, Page, RankCursor, RankedPage, to_page, to_ranked_page
 
 
 class MessageService:
@@ -17,10 +18,18 @@ async def create(self, user_id: str, payload: MessageCreate) -> MessageDomain:
         """Create a new message."""
         return await self.repo.create(user_id, payload.content)
 
+    async def create_many(self, user_id: str, payloads: Sequence[MessageCreate]) -> Sequence[MessageDomain]:
+        """Create many messages for one user, returned in the order given."""
+        return await self.repo.create_many(user_id, [payload.content for payload in payloads])
+
     async def get(self, id: int) -> MessageDomain | None:
         """Get a message by ID."""
         return await self.repo.get(id)
 
+    async def get_many(self, ids: Sequence[int]) -> Sequence[MessageDomain | None]:
+        """Get messages by ID with one query, in the order given; None marks a missing message."""
+        return await self.repo.get_many(ids)
+
     async def list(self) -> Sequence[MessageDomain]:
         """List all messages."""
         return await self.repo.list()
@@ -29,9 +38,35 @@ async def list_by_user(self, user_id: str) -> Sequence[MessageDomain]:
         """List all messages created by a specific user."""
         return await self.repo.list_by_user(user_id)
 
-    async def update(self, id: int, payload: MessageUpdate) -> MessageDomain | None:
-        """Update a message by ID."""
-        return await self.repo.update(id, payload.content)
+    async def page(self, limit: int, after: Cursor | None = None) -> Page[MessageDomain]:
+        """One page of all messages, newest first."""
+        return to_page(await self.repo.list(limit + 1, after), limit)
+
+    async def page_by_user(self, user_id: str, limit: int, after: Cursor | None = None) -> Page[MessageDomain]:
+        """One page of a user's messages, newest first."""
+        return to_page(await self.repo.list_by_user(user_id, limit + 1, after), limit)
+
+    async def search(
+        self,
+        query: str,
+        owner: str | None,
+        limit: int,
+        after: RankCursor | None = None,
+    ) -> RankedPage[MessageDomain]:
+        """One page of messages matching query, best first: owner's only, or everyone's when owner is None."""
+        return to_ranked_page(await self.repo.search(query, owner, limit + 1, after), limit)
+
+    async def update(self, id: int, payload: MessageUpdate, owner: str | None = None) -> MessageDomain | None:
+        """Update a message by ID; with an owner, raises NotOwnerError for anyone else's message."""
+        return await self.repo.update(id, payload.content, owner)
+
+    async def remove(self, id: int, owner: str | None = None) -> MessageDomain | None:
+        """Delete a message and return it; with an owner, raises NotOwnerError for anyone else's message."""
+        return await self.repo.remove(id, owner)
+
+    async def remove_many(self, ids: Sequence[int], owner: str | None = None) -> Sequence[MessageDomain]:
+        """Delete messages by ID and return those deleted; with an owner, other users' messages are skipped."""
+        return await self.repo.remove_many(list(ids), owner)
 
     async def delete(self, id: int) -> bool:
         """Delete a message by ID."""
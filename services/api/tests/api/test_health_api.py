@@ -6,9 +6,10 @@
 from httpx import AsyncClient, Response, ASGITransport
 
 from app.api.routes.healthcheck import get_healthcheck_service, router as health_router
+from app.auth.oidc_user import OIDCUser, map_oidc_user
 from app.services.health_service import HealthCheckService
 from app.infrastructure.health.mock_repository import MockHealthCheckRepository
-from app.schemas.health.response import HealthCheckResponse
+from app.schemas.health.response import HealthCheckResponse, PoolStatsResponse
 
 
 def get_mock_service() -> HealthCheckService:
@@ -43,3 +44,17 @@ async def test_healthcheck_returns_healthy(self: TestHealthApi, test_app: FastAP
         assert data["status"] == "healthy"
         assert "mock" in data["details"]
         assert isinstance(HealthCheckResponse.model_validate(data), HealthCheckResponse)
+
+    async def test_pool_stats_require_admin(self: TestHealthApi, test_app: FastAPI, test_user: OIDCUser) -> None:
+        """Pool statistics are reserved for admins; /health stays open."""
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            test_app.dependency_overrides[map_oidc_user] = lambda: test_user.model_copy(update={"roles": ["user"]})
+            assert (await client.get("/health/pool")).status_code == 403
+            assert (await client.get("/health")).status_code == 200
+
+            test_app.dependency_overrides[map_oidc_user] = lambda: test_user
+            resp: Response = await client.get("/health/pool")
+
+        assert resp.status_code == 200
+        assert isinstance(PoolStatsResponse.model_validate(resp.json()), PoolStatsResponse)
@@ -4,12 +4,16 @@
 import pytest
 from fastapi import FastAPI
 from httpx import AsyncClient, ASGITransport, Response
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from app.api.routes.maps import MAPS_API_PREFIX, router as map_states_router, get_map_service
 from app.auth.oidc_user import OIDCUser, map_oidc_user
+from app.domain.maps.models import MapDomain
+from app.domain.pagination import Cursor, Page
 from app.services.maps_service import MapService
+from app.infrastructure.maps.memory_repository import InMemoryMapRepository
 from app.infrastructure.maps.dao import MapDAO
 from app.infrastructure.maps.repository import SqlAlchemyMapRepository
 from app.schemas.maps import MapCreate, MapRead, MapSave
@@ -106,7 +110,7 @@ async def test_update(self: TestMapApi, test_app: FastAPI) -> None:
             map_state_id = resp.json()["id"]
             update_resp: Response = await client.put(
                 f"{MAPS_API_PREFIX}/{map_state_id}",
-                json={"name": "B", "description": "d2", "state": "{1}"},
+                json={"name": "B", "description": "d2", "state": '{"v": 1}'},
             )
             assert update_resp.status_code == status.HTTP_200_OK
             assert update_resp.json()["name"] == "B"
@@ -175,3 +179,181 @@ async def test_save_map_creates_and_updates(self: TestMapApi, test_app: FastAPI)
         assert updated.id == map_id
 
         await client.aclose()
+
+    async def test_save_map_refuses_other_owner(
+        self: TestMapApi,
+        test_app: FastAPI,
+        db_session: AsyncSession,
+    ) -> None:
+        """POST /maps with the ID of someone else's map is forbidden and changes nothing."""
+        other = await MapDAO(db_session).create("someone-else", MapCreate(name="Theirs", description="", state="{}"))
+
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            payload = MapSave(id=other.id, name="Mine now", description="", state="{}")
+            resp = await client.post(f"{MAPS_API_PREFIX}/", json=payload.model_dump(mode="json"))
+
+        assert resp.status_code == status.HTTP_403_FORBIDDEN
+        assert other.name == "Theirs"
+
+    async def test_batch_get_in_request_order(
+        self: TestMapApi,
+        test_app: FastAPI,
+        db_session: AsyncSession,
+        test_user: OIDCUser,
+    ) -> None:
+        """GET /maps/batch answers every ID in request order, marking misses and other users' maps."""
+        dao = MapDAO(db_session)
+        mine = await dao.create(test_user.sub, MapCreate(name="mine", description="", state="{}"))
+        theirs = await dao.create("someone-else", MapCreate(name="theirs", description="", state="{}"))
+        test_app.dependency_overrides[map_oidc_user] = lambda: test_user.model_copy(update={"roles": ["user"]})
+
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            resp: Response = await client.get(f"{MAPS_API_PREFIX}/batch", params={"ids": [9999, theirs.id, mine.id]})
+
+        assert resp.status_code == status.HTTP_200_OK
+        body: list[dict[str, Any]] = resp.json()
+        assert [(i["id"], i["status"]) for i in body] == [(9999, "not_found"), (theirs.id, "forbidden"), (mine.id, "ok")]
+        assert body[0]["item"] is None and body[1]["item"] is None
+        assert body[2]["item"]["name"] == "mine"
+
+    async def test_list_summary_view(
+        self: TestMapApi,
+        test_app: FastAPI,
+        db_session: AsyncSession,
+        test_user: OIDCUser,
+    ) -> None:
+        """?view=summary lists maps without their state and pages like the full view."""
+        dao = MapDAO(db_session)
+        for i in range(3):
+            await dao.create(test_user.sub, MapCreate(name=f"m{i}", description="", state='{"big": true}'))
+
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            resp: Response = await client.get(f"{MAPS_API_PREFIX}/me", params={"view": "summary", "limit": 2})
+            invalid: Response = await client.get(f"{MAPS_API_PREFIX}/me", params={"view": "compact"})
+
+        assert resp.status_code == status.HTTP_200_OK
+        body: list[dict[str, Any]] = resp.json()
+        assert len(body) == 2 and all("state" not in m for m in body)
+        assert body[0]["user"]["sub"] == test_user.sub
+        assert "X-Next-Cursor" in resp.headers
+        assert invalid.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_search_maps_scoped_to_caller(
+        self: TestMapApi,
+        test_app: FastAPI,
+        db_session: AsyncSession,
+        test_user: OIDCUser,
+    ) -> None:
+        """GET /maps/search returns the caller's fuzzy matches as ranked summaries; admins see every owner's."""
+        dao = MapDAO(db_session)
+        mine = await dao.create(test_user.sub, MapCreate(name="Harbour cranes", description="", state='{"big": true}'))
+        theirs = await dao.create("someone-else", MapCreate(name="Harbor lights", description="", state="{}"))
+
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            as_admin: Response = await client.get(f"{MAPS_API_PREFIX}/search", params={"q": "harbour"})
+            test_app.dependency_overrides[map_oidc_user] = lambda: test_user.model_copy(update={"roles": ["user"]})
+            as_user: Response = await client.get(f"{MAPS_API_PREFIX}/search", params={"q": "harbour"})
+
+        assert as_admin.status_code == status.HTTP_200_OK
+        assert [m["id"] for m in as_admin.json()] == [mine.id, theirs.id]
+        body: list[dict[str, Any]] = as_user.json()
+        assert [m["id"] for m in body] == [mine.id]
+        assert "state" not in body[0] and body[0]["rank"] == 1.0
+
+    async def test_state_filters_are_admin_only(
+        self: TestMapApi,
+        test_app: FastAPI,
+        db_session: AsyncSession,
+        test_user: OIDCUser,
+    ) -> None:
+        """Listings filter on layer type, dataset and config for admins; others get 403, bad config 400."""
+        dao = MapDAO(db_session)
+        heat = await dao.create(
+            "someone-else",
+            MapCreate(name="Heat", description="", state='{"config": {"visState": {"layers": [{"type": "heatmap"}]}}}'),
+        )
+        await dao.create(test_user.sub, MapCreate(name="Plain", description="", state='{"config": {}}'))
+
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            full: Response = await client.get(f"{MAPS_API_PREFIX}/", params={"layer_type": "heatmap"})
+            summary: Response = await client.get(
+                f"{MAPS_API_PREFIX}/", params={"config": '{"visState": {}}', "view": "summary"}
+            )
+            invalid: Response = await client.get(f"{MAPS_API_PREFIX}/", params={"config": "[1]"})
+            test_app.dependency_overrides[map_oidc_user] = lambda: test_user.model_copy(update={"roles": ["user"]})
+            as_user: Response = await client.get(f"{MAPS_API_PREFIX}/me", params={"layer_type": "heatmap"})
+
+        assert full.status_code == status.HTTP_200_OK
+        assert [(m["id"], m["state"]) for m in full.json()] == [(heat.id, heat.state)]
+        assert [m["id"] for m in summary.json()] == [heat.id] and "state" not in summary.json()[0]
+        assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+        assert as_user.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_get_map_state_fragments(
+        self: TestMapApi,
+        test_app: FastAPI,
+        db_session: AsyncSession,
+        test_user: OIDCUser,
+    ) -> None:
+        """GET /maps/{id}/state returns only the requested fragments, owner or admin only."""
+        dao = MapDAO(db_session)
+        state: str = '{"config": {"mapState": {"zoom": 4}, "visState": {"layers": [{"id": "l1"}]}}}'
+        mine = await dao.create(test_user.sub, MapCreate(name="Mine", description="", state=state))
+        theirs = await dao.create("someone-else", MapCreate(name="Theirs", description="", state=state))
+        url: str = f"{MAPS_API_PREFIX}/{mine.id}/state"
+
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            test_app.dependency_overrides[map_oidc_user] = lambda: test_user.model_copy(update={"roles": ["user"]})
+            resp: Response = await client.get(url, params={"path": ["config.mapState", "config.visState.layers[0]", "x"]})
+            bad: Response = await client.get(url, params={"path": "config..mapState"})
+            none: Response = await client.get(url)
+            forbidden: Response = await client.get(f"{MAPS_API_PREFIX}/{theirs.id}/state", params={"path": "config"})
+            missing: Response = await client.get(f"{MAPS_API_PREFIX}/9999/state", params={"path": "config"})
+
+        assert resp.status_code == status.HTTP_200_OK
+        body: dict[str, Any] = resp.json()
+        assert body["fragments"] == {"config.mapState": {"zoom": 4}, "config.visState.layers[0]": {"id": "l1"}}
+        assert "state" not in body and body["user"]["sub"] == test_user.sub
+        assert bad.status_code == status.HTTP_400_BAD_REQUEST
+        assert none.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert forbidden.status_code == status.HTTP_403_FORBIDDEN
+        assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_save_map_rejects_state_jsonb_cannot_store(self: TestMapApi, test_app: FastAPI) -> None:
+        """State must be JSON that Postgres accepts as JSONB: no NaN/Infinity, \u0000 or lone surrogate escapes."""
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            rejected: list[Response] = [
+                await client.post(f"{MAPS_API_PREFIX}/", json={"name": "m", "description": "", "state": state})
+                for state in (
+                    "{1}",
+                    '{"zoom": NaN}',
+                    '[-Infinity]',
+                    '{"name": "a\\u0000b"}',
+                    '{"name": "\\ud800"}',
+                    '{"\\udc00": 1}',
+                )
+            ]
+            escaped: Response = await client.post(
+                f"{MAPS_API_PREFIX}/", json={"name": "m", "description": "", "state": '{"path": "C:\\\\u0000"}'}
+            )
+            paired: Response = await client.post(
+                f"{MAPS_API_PREFIX}/", json={"name": "m", "description": "", "state": '{"emoji": "\\ud83d\\ude00"}'}
+            )
+
+        assert [r.status_code for r in rejected] == [status.HTTP_422_UNPROCESSABLE_ENTITY] * 6
+        assert escaped.status_code == status.HTTP_201_CREATED
+        assert paired.status_code == status.HTTP_201_CREATED
+
+    async def test_budget_errors_reach_query_budget(self: TestMapApi, test_app: FastAPI) -> None:
+        """Routes with a catch-all 500 let budget errors through, so clients get the structured 503."""
+
+        class PoolExhaustedService(MapService):
+            async def page(self: PoolExhaustedService, limit: int, after: Cursor | None = None) -> Page[MapDomain]:
+                raise exc.TimeoutError("QueuePool limit reached")
+
+        test_app.dependency_overrides[get_map_service] = lambda: PoolExhaustedService(InMemoryMapRepository())
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            resp: Response = await client.get(f"{MAPS_API_PREFIX}/")
+
+        assert resp.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert resp.json()["detail"]["error"] == "database_unavailable"
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator
+
 import pytest
 from fastapi import FastAPI
 from httpx import AsyncClient, ASGITransport, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-from app.api.routes.messages import router as messages_router, get_message_service
+from app.api.routes.messages import bulk_router, router as messages_router, get_message_service
 from app.auth.oidc_user import OIDCUser, map_oidc_user
+from app.core.settings import get_settings
 from app.services.message_service import MessageService
 from app.infrastructure.messages.dao import MessageDAO
 from app.infrastructure.messages.repository import SqlAlchemyMessageRepository
@@ -27,6 +31,7 @@ async def override_service() -> MessageService:
     app.dependency_overrides[get_message_service] = override_service
     app.dependency_overrides[map_oidc_user] = lambda: test_user
     app.include_router(messages_router)
+    app.include_router(bulk_router)
     return app
 
 
@@ -109,3 +114,170 @@ async def test_generate_message(self: TestMessagesApi, test_app: FastAPI) -> Non
             assert data["user_id"] == "test-user-id"
             assert data["content"].startswith("Hello from ChatGPT")
             assert isinstance(MessageRead.model_validate(data), MessageRead)
+
+    async def test_list_pages_with_cursor(self: TestMessagesApi, test_app: FastAPI) -> None:
+        """Listings are paged newest first; the next page is linked until the last one."""
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            created: list[int] = []
+            for i in range(5):
+                resp: Response = await client.post("/messages/", json={"content": f"m{i}"})
+                created.append(resp.json()["id"])
+
+            seen: list[int] = []
+            params: dict[str, str | int] = {"limit": 2}
+            while True:
+                page: Response = await client.get("/messages/me", params=params)
+                assert page.status_code == status.HTTP_200_OK
+                seen += [m["id"] for m in page.json()]
+                cursor: str | None = page.headers.get("X-Next-Cursor")
+                if cursor is None:
+                    assert "Link" not in page.headers
+                    break
+                assert 'rel="next"' in page.headers["Link"]
+                params = {"limit": 2, "cursor": cursor}
+
+            assert seen == sorted(created, reverse=True)
+
+    async def test_list_rejects_bad_cursor(self: TestMessagesApi, test_app: FastAPI) -> None:
+        """A malformed cursor is a client error."""
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            resp: Response = await client.get("/messages/me", params={"cursor": "not-a-cursor"})
+            assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_update_checks_owner_in_statement(
+        self: TestMessagesApi,
+        test_app: FastAPI,
+        db_session: AsyncSession,
+        test_user: OIDCUser,
+    ) -> None:
+        """Non-admins get 403 for another user's message and 404 for a missing one."""
+        theirs = await MessageDAO(db_session).create("someone-else", "theirs")
+        test_app.dependency_overrides[map_oidc_user] = lambda: test_user.model_copy(update={"roles": ["user"]})
+
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            forbidden: Response = await client.put(f"/messages/{theirs.id}", json={"content": "mine"})
+            missing: Response = await client.put("/messages/9999", json={"content": "mine"})
+
+        assert forbidden.status_code == status.HTTP_403_FORBIDDEN
+        assert missing.status_code == status.HTTP_404_NOT_FOUND
+        assert theirs.content == "theirs"
+
+    async def test_bulk_delete_returns_deleted_messages(
+        self: TestMessagesApi,
+        test_app: FastAPI,
+        db_session: AsyncSession,
+        test_user: OIDCUser,
+    ) -> None:
+        """DELETE /messages/batch removes the caller's messages and skips everyone else's for non-admins."""
+        dao = MessageDAO(db_session)
+        mine = [await dao.create(test_user.sub, f"mine {i}") for i in range(2)]
+        theirs = await dao.create("someone-else", "theirs")
+        test_app.dependency_overrides[map_oidc_user] = lambda: test_user.model_copy(update={"roles": ["user"]})
+
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            ids: list[int] = [mine[0].id, theirs.id, mine[1].id, 9999]
+            resp: Response = await client.delete("/messages/batch", params={"ids": ids})
+            forbidden: Response = await client.delete(f"/messages/{theirs.id}")
+
+        assert resp.status_code == status.HTTP_200_OK
+        assert sorted(m["id"] for m in resp.json()) == [mine[0].id, mine[1].id]
+        assert forbidden.status_code == status.HTTP_403_FORBIDDEN
+        assert await MessageDAO(db_session).get(theirs.id) is not None
+
+    async def test_bulk_create_reports_invalid_items(self: TestMessagesApi, test_app: FastAPI) -> None:
+        """POST /messages/bulk creates valid items in order and reports the rest by position."""
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            resp: Response = await client.post(
+                "/messages/bulk",
+                json=[{"content": "one"}, {"wrong": "field"}, {"content": "two"}],
+            )
+
+        assert resp.status_code == status.HTTP_201_CREATED
+        body = resp.json()
+        assert [m["content"] for m in body["created"]] == ["one", "two"]
+        assert [e["index"] for e in body["errors"]] == [1]
+        assert body["errors"][0]["detail"][0]["loc"] == ["content"]
+
+    async def test_bulk_create_from_ndjson(
+        self: TestMessagesApi,
+        test_app: FastAPI,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """NDJSON bodies are read line by line and inserted in chunks."""
+        monkeypatch.setattr(get_settings(), "bulk_chunk_size", 2)
+        lines: str = "\n".join(['{"content": "a"}', "not json", '{"content": "b"}', '{"content": "c"}']) + "\n"
+
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            resp: Response = await client.post(
+                "/messages/bulk",
+                content=lines,
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert [m["content"] for m in resp.json()["created"]] == ["a", "b", "c"]
+        assert [e["index"] for e in resp.json()["errors"]] == [1]
+
+    async def test_bulk_create_has_its_own_budget(
+        self: TestMessagesApi,
+        test_app: FastAPI,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """A slowly streamed bulk body runs under the bulk budget, not the default route budget."""
+        monkeypatch.setattr(get_settings().database, "query_budget_seconds", 0.01)
+
+        async def slow_lines() -> AsyncIterator[bytes]:
+            for i in range(3):
+                await asyncio.sleep(0.02)
+                yield f'{{"content": "m{i}"}}\n'.encode()
+
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            resp: Response = await client.post(
+                "/messages/bulk", content=slow_lines(), headers={"Content-Type": "application/x-ndjson"}
+            )
+
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert [m["content"] for m in resp.json()["created"]] == ["m0", "m1", "m2"]
+
+    async def test_bulk_create_caps_item_count(
+        self: TestMessagesApi,
+        test_app: FastAPI,
+        db_session: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Bodies with more than BULK_ITEMS_MAX items are refused with 413."""
+        monkeypatch.setattr(get_settings(), "bulk_items_max", 2)
+
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            at_cap: Response = await client.post("/messages/bulk", json=[{"content": "a"}, {"content": "b"}])
+            over: Response = await client.post("/messages/bulk", json=[{"content": "c"}] * 3)
+
+        assert at_cap.status_code == status.HTTP_201_CREATED
+        assert over.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+    async def test_search_scoped_to_caller(
+        self: TestMessagesApi,
+        test_app: FastAPI,
+        db_session: AsyncSession,
+        test_user: OIDCUser,
+    ) -> None:
+        """GET /messages/search returns the caller's matches with their rank and pages with a cursor."""
+        dao = MessageDAO(db_session)
+        for content in ["search me", "search me again", "unrelated"]:
+            await dao.create(test_user.sub, content)
+        await dao.create("someone-else", "search me too")
+        test_app.dependency_overrides[map_oidc_user] = lambda: test_user.model_copy(update={"roles": ["user"]})
+
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            first: Response = await client.get("/messages/search", params={"q": "search", "limit": 1})
+            second: Response = await client.get(
+                "/messages/search", params={"q": "search", "limit": 1, "cursor": first.headers["X-Next-Cursor"]}
+            )
+            missing_q: Response = await client.get("/messages/search")
+
+        assert first.status_code == status.HTTP_200_OK
+        hits = first.json() + second.json()
+        assert sorted(h["content"] for h in hits) == ["search me", "search me again"]
+        assert hits[0]["rank"] >= hits[1]["rank"]
+        assert "X-Next-Cursor" not in second.headers
+        assert missing_q.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from httpx import AsyncClient, ASGITransport, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from app.api.budget import query_budget
+from app.db.unit_of_work import UnitOfWork, get_unit_of_work
+
+
+@pytest.fixture
+def test_app(db_session: AsyncSession) -> FastAPI:
+    """Fixture to create a test FastAPI app with budgeted routes."""
+    app = FastAPI()
+    app.dependency_overrides[get_unit_of_work] = lambda: UnitOfWork(db_session)
+
+    @app.get("/fast", dependencies=[Depends(query_budget(1.0))])
+    async def fast() -> dict[str, str]:  # pyright: ignore[reportUnusedFunction]
+        return {"status": "ok"}
+
+    @app.get("/slow", dependencies=[Depends(query_budget(0.05))])
+    async def slow() -> dict[str, str]:  # pyright: ignore[reportUnusedFunction]
+        await asyncio.sleep(5)
+        return {"status": "too late"}
+
+    @app.post("/upload", dependencies=[Depends(query_budget(1.0))])
+    async def upload(request: Request) -> dict[str, int]:  # pyright: ignore[reportUnusedFunction]
+        return {"bytes": sum([len(chunk) async for chunk in request.stream()])}
+
+    return app
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.api
+class TestQueryBudget:
+    """API tests for per-route query budgets."""
+
+    async def test_within_budget(self: TestQueryBudget, test_app: FastAPI) -> None:
+        """A route finishing inside its budget responds normally."""
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            resp: Response = await client.get("/fast")
+        assert resp.status_code == status.HTTP_200_OK
+
+    async def test_budget_exceeded(self: TestQueryBudget, test_app: FastAPI) -> None:
+        """A route running past its budget is cancelled with a structured 504."""
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            resp: Response = await client.get("/slow")
+
+        assert resp.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+        detail: dict[str, Any] = resp.json()["detail"]
+        assert detail["error"] == "query_budget_exceeded"
+        assert detail["route"] == "slow"
+        assert detail["budget_ms"] == 50
+        assert detail["elapsed_ms"] < 5000
+
+    async def test_handler_reads_its_own_body(self: TestQueryBudget, test_app: FastAPI) -> None:
+        """The disconnect watcher relays body messages to handlers that stream the body themselves."""
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for _ in range(50):
+                yield b"x" * 1000
+
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            resp: Response = await client.post("/upload", content=chunks())
+
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.json() == {"bytes": 50_000}
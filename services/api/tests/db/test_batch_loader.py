@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Mapping
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.db.entities.map import Map
+from app.db.entities.message import Message
+from app.infrastructure.batch_loader import BatchLoader
+from app.infrastructure.maps.dao import MapDAO
+from app.infrastructure.messages.dao import MessageDAO
+from app.schemas.maps import MapCreate
+
+
+class RecordingBatch:
+    """Batch function resolving even keys to their double and recording each call."""
+
+    def __init__(self: RecordingBatch, fail: bool = False) -> None:
+        self.calls: list[list[int]] = []
+        self.fail: bool = fail
+
+    async def __call__(self: RecordingBatch, keys: list[int]) -> Mapping[int, int]:
+        self.calls.append(keys)
+        if self.fail:
+            raise RuntimeError("boom")
+        return {k: k * 2 for k in keys if k % 2 == 0}
+
+
+def count_selects(engine: AsyncEngine) -> list[str]:
+    """Record every SELECT issued on an engine."""
+    statements: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:  # pyright: ignore[reportUnusedFunction]
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    return statements
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.db
+class TestBatchLoader:
+    """Unit tests for the request-scoped batch loader."""
+
+    async def test_coalesces_loads_in_one_tick(self: TestBatchLoader) -> None:
+        """Concurrent loads share one batch call; misses resolve to None."""
+        batch = RecordingBatch()
+        loader: BatchLoader[int, int] = BatchLoader(batch)
+
+        assert await asyncio.gather(loader.load(2), loader.load(3), loader.load(4), loader.load(2)) == [4, None, 8, 4]
+        assert batch.calls == [[2, 3, 4]]
+
+    async def test_memoizes_hits_and_misses(self: TestBatchLoader) -> None:
+        """Repeated loads, including misses, are answered without another batch."""
+        batch = RecordingBatch()
+        loader: BatchLoader[int, int] = BatchLoader(batch)
+
+        assert await loader.load_many([2, 3]) == [4, None]
+        assert await loader.load(2) == 4
+        assert await loader.load(3) is None
+        assert await loader.load(6) == 12
+        assert batch.calls == [[2, 3], [6]]
+
+    async def test_prime_and_clear(self: TestBatchLoader) -> None:
+        """Primed values skip the batch; cleared keys are reloaded."""
+        batch = RecordingBatch()
+        loader: BatchLoader[int, int] = BatchLoader(batch)
+
+        loader.prime(2, 100)
+        assert await loader.load(2) == 100
+        assert batch.calls == []
+
+        loader.clear(2)
+        assert await loader.load(2) == 4
+        assert batch.calls == [[2]]
+
+    async def test_chunks_large_batches(self: TestBatchLoader) -> None:
+        """Batches are split at max_batch_size."""
+        batch = RecordingBatch()
+        loader: BatchLoader[int, int] = BatchLoader(batch, max_batch_size=2)
+
+        await loader.load_many([0, 2, 4, 6, 8])
+        assert batch.calls == [[0, 2], [4, 6], [8]]
+
+    async def test_errors_are_not_memoized(self: TestBatchLoader) -> None:
+        """A failed batch fails every waiter and the keys are retried on the next load."""
+        batch = RecordingBatch(fail=True)
+        loader: BatchLoader[int, int] = BatchLoader(batch)
+
+        results: list[Any] = await asyncio.gather(loader.load(2), loader.load(4), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        batch.fail = False
+        assert await loader.load(2) == 4
+        assert batch.calls == [[2, 4], [2]]
+
+    async def test_batch_outlives_no_waiter(self: TestBatchLoader) -> None:
+        """Cancelling the last waiter cancels the batch and waits for it; another waiter keeps it running."""
+        started: asyncio.Event = asyncio.Event()
+        release: asyncio.Event = asyncio.Event()
+        stopped: list[list[int]] = []
+
+        async def slow(keys: list[int]) -> Mapping[int, int]:
+            started.set()
+            try:
+                await release.wait()
+            except asyncio.CancelledError:
+                stopped.append(keys)
+                raise
+            return {k: k * 2 for k in keys}
+
+        loader: BatchLoader[int, int] = BatchLoader(slow)
+        first: asyncio.Task[int | None] = asyncio.create_task(loader.load(2))
+        second: asyncio.Task[int | None] = asyncio.create_task(loader.load(2))
+        await started.wait()
+
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        assert stopped == [] and not second.done()
+
+        second.cancel()
+        await asyncio.gather(second, return_exceptions=True)
+        assert stopped == [[2]]
+        assert loader.tasks == set() and loader.batches == {} and loader.waiters == {}
+
+        release.set()
+        assert await loader.load(2) == 4
+
+    async def test_batch_cancelled_before_it_starts(self: TestBatchLoader) -> None:
+        """A load cancelled right after dispatch never reaches the batch function and is not memoized."""
+        batch = RecordingBatch()
+        loader: BatchLoader[int, int] = BatchLoader(batch)
+
+        pending: asyncio.Task[int | None] = asyncio.create_task(loader.load(2))
+        await asyncio.sleep(0)
+        pending.cancel()
+        await asyncio.gather(pending, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert batch.calls == []
+        assert await loader.load(2) == 4
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.db
+class TestDAOBatching:
+    """Gets through the DAOs are coalesced and memoized per DAO."""
+
+    async def test_map_gets_share_one_query(
+        self: TestDAOBatching,
+        test_engine: AsyncEngine,
+        db_session: AsyncSession,
+    ) -> None:
+        """Concurrent map gets issue one SELECT; repeats and missing IDs issue none."""
+        writer = MapDAO(db_session)
+        ids: list[int] = [
+            (await writer.create("u1", MapCreate(name=f"m{i}", description="", state="{}"))).id
+            for i in range(3)
+        ]
+        db_session.expunge_all()
+
+        statements: list[str] = count_selects(test_engine)
+        dao = MapDAO(db_session)
+        maps: list[Map | None] = list(await asyncio.gather(*(dao.get(i) for i in [*ids, 999])))
+        assert [m.id if m else None for m in maps] == [*ids, None]
+        assert len(statements) == 1
+
+        assert await dao.get(ids[0]) is maps[0]
+        assert await dao.get(999) is None
+        assert len(statements) == 1
+
+    async def test_get_many_is_one_query_in_order(
+        self: TestDAOBatching,
+        test_engine: AsyncEngine,
+        db_session: AsyncSession,
+    ) -> None:
+        """get_many() reads every requested message with one SELECT and keeps the request order."""
+        dao = MessageDAO(db_session)
+        ids: list[int] = [(await dao.create("u1", f"m{i}")).id for i in range(3)]
+        db_session.expunge_all()
+
+        statements: list[str] = count_selects(test_engine)
+        found: list[Message | None] = await MessageDAO(db_session).get_many([ids[2], 999, ids[0]])
+        assert [m.id if m else None for m in found] == [ids[2], None, ids[0]]
+        assert len(statements) == 1
+
+    async def test_delete_reuses_loaded_message(
+        self: TestDAOBatching,
+        test_engine: AsyncEngine,
+        db_session: AsyncSession,
+    ) -> None:
+        """A get followed by delete reads the row once, and the deleted row reads as missing."""
+        created: Message = await MessageDAO(db_session).create("u1", "hello")
+        db_session.expunge_all()
+
+        statements: list[str] = count_selects(test_engine)
+        dao = MessageDAO(db_session)
+        assert await dao.get(created.id) is not None
+        assert await dao.delete(created.id) is True
+        assert await dao.get(created.id) is None
+        assert len(statements) == 1
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic import SecretStr
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import NullPool, StaticPool
+
+from app.core.settings import DatabaseSettings
+from app.db.engine import build_engine, engine_options
+from app.db.pool import InstrumentedAsyncAdaptedQueuePool, get_pool_stats
+
+
+def make_database(**overrides: Any) -> DatabaseSettings:
+    """Build DatabaseSettings with a dummy password and the given overrides."""
+    values: dict[str, Any] = {
+        "hostname": "test.localhost",
+        "port": 5432,
+        "user": "testuser",
+        "password": SecretStr("testpass"),
+        "name": "universal_test",
+    }
+    return DatabaseSettings(**(values | overrides))
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.db
+class TestEngineProfiles:
+    """Unit tests for pool profile selection and pool statistics."""
+
+    async def test_postgres_defaults_to_queue_pool(self: TestEngineProfiles) -> None:
+        """Postgres should get an instrumented queue pool sized from settings."""
+        engine: AsyncEngine = build_engine(make_database(pool_size=7, pool_max_overflow=3))
+        try:
+            pool = engine.sync_engine.pool
+            assert isinstance(pool, InstrumentedAsyncAdaptedQueuePool)
+            assert pool.size() == 7
+            assert pool._max_overflow == 3  # pyright: ignore[reportPrivateUsage]
+        finally:
+            await engine.dispose()
+
+    async def test_postgres_statement_cache_options(self: TestEngineProfiles) -> None:
+        """asyncpg should get the configured prepared statement cache size."""
+        options: dict[str, Any] = engine_options(make_database(prepared_statement_cache_size=42, compiled_cache_size=7))
+        assert options["connect_args"] == {"prepared_statement_cache_size": 42}
+        assert options["query_cache_size"] == 7
+
+    async def test_sqlite_memory_uses_static_pool(self: TestEngineProfiles) -> None:
+        """In-memory SQLite should share a single connection via StaticPool."""
+        engine: AsyncEngine = build_engine(make_database(backend="sqlite", name=":memory:"))
+        try:
+            assert isinstance(engine.sync_engine.pool, StaticPool)
+        finally:
+            await engine.dispose()
+
+    async def test_sqlite_file_uses_null_pool(self: TestEngineProfiles, tmp_path: Path) -> None:
+        """File-backed SQLite should not keep pooled connections by default."""
+        engine: AsyncEngine = build_engine(make_database(backend="sqlite", name=str(tmp_path / "db.sqlite")))
+        try:
+            assert isinstance(engine.sync_engine.pool, NullPool)
+        finally:
+            await engine.dispose()
+
+    async def test_queue_pool_reports_stats(self: TestEngineProfiles, tmp_path: Path) -> None:
+        """An explicit queue profile should record checkouts and open connections."""
+        engine: AsyncEngine = build_engine(
+            make_database(backend="sqlite", name=str(tmp_path / "db.sqlite"), pool_profile="queue", pool_size=2)
+        )
+        try:
+            for _ in range(3):
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+
+            stats: dict[str, Any] = get_pool_stats(engine)
+            assert stats["pool"] == "InstrumentedAsyncAdaptedQueuePool"
+            assert stats["checkouts"] == 3
+            assert stats["connections_opened"] == 1
+            assert stats["connections_open"] == 1
+            assert stats["checked_out"] == 0
+            assert stats["checkout_wait_max_ms"] >= 0.0
+            assert stats["connection_age_max_s"] >= 0.0
+        finally:
+            await engine.dispose()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.engine import Dialect
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.sql.compiler import SQLCompiler
+
+from app.db.entities.map import Map
+from app.domain.maps.filters import StateFilter
+from app.infrastructure.maps.dao import list_maps_matching_stmt, update_map_stmt, upsert_map_stmt
+from app.schemas.maps import MapCreate, MapUpdate
+
+STATE: str = '{"config": {}}'
+
+
+@pytest.fixture
+def dialect() -> Dialect:
+    """The production Postgres driver's dialect."""
+    return asyncpg.dialect()
+
+
+@pytest.mark.unit
+@pytest.mark.db
+@pytest.mark.maps
+class TestJSONDocumentOnAsyncpg:
+    """Compile-level tests of map state as JSONB through asyncpg."""
+
+    def test_ddl_declares_jsonb(self: TestJSONDocumentOnAsyncpg, dialect: Dialect) -> None:
+        """create_all() makes state a JSONB column, which the jsonb_path_ops index requires."""
+        assert "state JSONB NOT NULL" in str(CreateTable(Map.__table__).compile(dialect=dialect))
+
+    def test_insert_casts_text_to_jsonb(self: TestJSONDocumentOnAsyncpg, dialect: Dialect) -> None:
+        """State is bound as text, unprocessed, and cast to JSONB by Postgres."""
+        compiled: SQLCompiler = insert(Map).compile(
+            dialect=dialect, column_keys=["user_id", "name", "description", "state"]
+        )
+        assert "CAST($4::VARCHAR AS JSONB)" in compiled.string
+        params: dict[str, str] = {"user_id": "u", "name": "n", "description": "d", "state": STATE}
+        assert compiled.construct_params(params)["state"] == STATE
+        assert "state" not in compiled._bind_processors
+
+    def test_upsert_and_update_cast_to_jsonb(self: TestJSONDocumentOnAsyncpg, dialect: Dialect) -> None:
+        """Writes through the DAO statements cast state to JSONB and read it back as text."""
+        upsert: str = str(
+            upsert_map_stmt("postgresql", 1, "u", MapCreate(name="n", description="d", state=STATE)).compile(dialect=dialect)
+        )
+        update: str = str(
+            update_map_stmt(1, MapUpdate(name="n", description="d", state=STATE)).compile(dialect=dialect)
+        )
+        for sql in (upsert, update):
+            assert "::VARCHAR AS JSONB)" in sql
+            assert "CAST(maps.state AS TEXT) AS state" in sql
+
+    def test_containment_operand_is_jsonb(self: TestJSONDocumentOnAsyncpg, dialect: Dialect) -> None:
+        """State filters compare JSONB with JSONB, so Postgres can use the GIN index."""
+        sql: str = str(list_maps_matching_stmt("postgresql", StateFilter(layer_type="heatmap")).compile(dialect=dialect))
+        assert "maps.state @> CAST($1::VARCHAR AS JSONB)" in sql
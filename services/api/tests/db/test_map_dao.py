@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import json
 import pytest
 from typing import Sequence
+from sqlalchemy import inspect
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.entities.map import Map
+from app.domain.errors import NotOwnerError
+from app.domain.maps.filters import StateFilter
+from app.domain.maps.paths import StatePath
+from app.domain.pagination import RankCursor, Ranked
 from app.infrastructure.maps.dao import MapDAO
 from app.schemas.maps import MapCreate, MapUpdate
 
@@ -42,11 +49,11 @@ async def test_update(self: TestMapDAO, db_session: AsyncSession) -> None:
         )
         updated: Map | None = await dao.update(
             original.id,
-            MapUpdate(name="New", description="d2", state="{1}"),
+            MapUpdate(name="New", description="d2", state='{"v": 1}'),
         )
         assert updated is not None
         assert updated.name == "New"
-        assert updated.state == "{1}"
+        assert updated.state == '{"v": 1}'
 
     async def test_delete(self: TestMapDAO, db_session: AsyncSession) -> None:
         """Test deleting an existing map."""
@@ -65,3 +72,170 @@ async def test_delete_nonexistent(self: TestMapDAO, db_session: AsyncSession) ->
         dao = MapDAO(db_session)
         deleted: bool = await dao.delete(9999)
         assert deleted is False
+
+    async def test_upsert_creates_and_updates(self: TestMapDAO, db_session: AsyncSession) -> None:
+        """Upsert creates unknown IDs with a fresh ID and updates the owner's existing map."""
+        dao = MapDAO(db_session)
+        created = await dao.upsert(None, "owner", MapCreate(name="A", description="", state="{}"))
+        assert created is not None and created[1] is True
+
+        updated = await dao.upsert(created[0].id, "owner", MapCreate(name="B", description="d", state='{"v": 1}'))
+        assert updated is not None
+        assert updated[1] is False
+        assert (updated[0].id, updated[0].name, updated[0].state) == (created[0].id, "B", '{"v": 1}')
+
+        fresh = await dao.upsert(9999, "owner", MapCreate(name="C", description="", state="{}"))
+        assert fresh is not None
+        assert fresh[1] is True
+        assert fresh[0].id != 9999
+
+        # The next rowid equals the requested ID, which must still count as a create
+        following = await dao.upsert(fresh[0].id + 1, "owner", MapCreate(name="D", description="", state="{}"))
+        assert following is not None
+        assert (following[0].id, following[1]) == (fresh[0].id + 1, True)
+
+    async def test_upsert_refuses_other_owner(self: TestMapDAO, db_session: AsyncSession) -> None:
+        """Upserting another user's map returns None and leaves the row untouched."""
+        dao = MapDAO(db_session)
+        created: Map = await dao.create("owner", MapCreate(name="Mine", description="", state="{}"))
+
+        assert await dao.upsert(created.id, "intruder", MapCreate(name="Stolen", description="", state="{}")) is None
+
+        db_session.expunge_all()
+        fetched: Map | None = await MapDAO(db_session).get(created.id)
+        assert fetched is not None
+        assert (fetched.user_id, fetched.name) == ("owner", "Mine")
+
+    async def test_remove_returns_deleted_row(self: TestMapDAO, db_session: AsyncSession) -> None:
+        """remove() returns the deleted map, refuses other owners and reports missing maps as None."""
+        dao = MapDAO(db_session)
+        created: Map = await dao.create("owner", MapCreate(name="Gone", description="", state="{}"))
+
+        with pytest.raises(NotOwnerError):
+            await dao.remove(created.id, owner="intruder")
+        removed: Map | None = await dao.remove(created.id, owner="owner")
+        assert removed is not None and (removed.id, removed.name) == (created.id, "Gone")
+        assert await dao.remove(created.id) is None
+        assert await dao.get(created.id) is None
+
+    async def test_remove_many_skips_other_owners(self: TestMapDAO, db_session: AsyncSession) -> None:
+        """remove_many() deletes the owner's maps in one statement and leaves the rest."""
+        dao = MapDAO(db_session)
+        mine: list[Map] = [await dao.create("owner", MapCreate(name=f"m{i}", description="", state="{}")) for i in range(3)]
+        theirs: Map = await dao.create("other", MapCreate(name="t", description="", state="{}"))
+
+        removed: Sequence[Map] = await dao.remove_many([m.id for m in mine] + [theirs.id, 9999], owner="owner")
+        assert sorted(m.id for m in removed) == [m.id for m in mine]
+        assert [m.id for m in await dao.list()] == [theirs.id]
+
+    async def test_list_summaries_defers_state(self: TestMapDAO, db_session: AsyncSession) -> None:
+        """list_summaries() never reads the state column, and a later get() still loads it."""
+        dao = MapDAO(db_session)
+        created: Map = await dao.create("owner", MapCreate(name="Big", description="d", state='{"layers": []}'))
+        await dao.create("other", MapCreate(name="Theirs", description="", state="{}"))
+        db_session.expunge_all()
+
+        dao = MapDAO(db_session)
+        summaries: Sequence[Map] = await dao.list_summaries("owner")
+        assert [(m.id, m.name) for m in summaries] == [(created.id, "Big")]
+        assert "state" in inspect(summaries[0]).unloaded
+        with pytest.raises(InvalidRequestError):
+            summaries[0].state
+
+        fetched: Map | None = await dao.get(created.id)
+        assert fetched is not None and fetched.state == '{"layers": []}'
+
+    async def test_search_is_typo_tolerant(self: TestMapDAO, db_session: AsyncSession) -> None:
+        """search() ranks fuzzy name/description matches, scopes by user and pages by (rank, id)."""
+        dao = MapDAO(db_session)
+        exact: Map = await dao.create("owner", MapCreate(name="Berlin traffic", description="", state="{}"))
+        described: Map = await dao.create("owner", MapCreate(name="Rush hour", description="Traffic in Berlin", state="{}"))
+        await dao.create("owner", MapCreate(name="Paris", description="museums", state="{}"))
+        theirs: Map = await dao.create("other", MapCreate(name="Berlin", description="", state="{}"))
+        db_session.expunge_all()
+
+        dao = MapDAO(db_session)
+        hits: list[Ranked[Map]] = await dao.search("berln trafic", "owner")
+        assert [h.item.id for h in hits] == [exact.id, described.id]
+        assert "state" in inspect(hits[0].item).unloaded
+        assert theirs.id in [h.item.id for h in await dao.search("berlin")]
+
+        after = RankCursor(rank=hits[0].rank, id=exact.id)
+        assert [h.item.id for h in await dao.search("berln trafic", "owner", limit=5, after=after)] == [described.id]
+        assert await dao.search("zzzz") == []
+
+    async def test_list_matching_filters_state_in_database(self: TestMapDAO, db_session: AsyncSession) -> None:
+        """list_matching() finds maps by layer type, dataset and config containment, with the state deferred."""
+
+        def state(layers: list[tuple[str, str]], map_state: dict[str, object]) -> str:
+            return json.dumps(
+                {
+                    "datasets": [{"data": {"id": data_id}} for _, data_id in layers],
+                    "config": {
+                        "visState": {"layers": [{"type": t, "config": {"dataId": d}} for t, d in layers]},
+                        "mapState": map_state,
+                    },
+                }
+            )
+
+        dao = MapDAO(db_session)
+        points: Map = await dao.create(
+            "owner", MapCreate(name="P", description="", state=state([("point", "trips")], {"zoom": 3}))
+        )
+        heat: Map = await dao.create(
+            "owner",
+            MapCreate(name="H", description="", state=state([("heatmap", "trips"), ("arc", "flows")], {"zoom": 9.5})),
+        )
+        theirs: Map = await dao.create(
+            "other", MapCreate(name="T", description="", state=state([("point", "census")], {"dragRotate": False}))
+        )
+        await dao.create("other", MapCreate(name="Empty", description="", state="{}"))
+        db_session.expunge_all()
+
+        dao = MapDAO(db_session)
+        by_type: Sequence[Map] = await dao.list_matching(StateFilter(layer_type="point"))
+        assert [m.id for m in by_type] == [theirs.id, points.id]
+        assert "state" in inspect(by_type[0]).unloaded
+        assert [m.id for m in await dao.list_matching(StateFilter(dataset_id="trips"))] == [heat.id, points.id]
+        assert [m.id for m in await dao.list_matching(StateFilter(layer_type="heatmap", dataset_id="flows"))] == [heat.id]
+        assert await dao.list_matching(StateFilter(layer_type="heatmap", dataset_id="census")) == []
+        assert [m.id for m in await dao.list_matching(StateFilter(config={"mapState": {"zoom": 9.5}}))] == [heat.id]
+        assert [m.id for m in await dao.list_matching(StateFilter(config={"mapState": {"dragRotate": False}}))] == [
+            theirs.id
+        ]
+        # JSON booleans are not numbers
+        assert await dao.list_matching(StateFilter(config={"mapState": {"dragRotate": 0}})) == []
+        assert [m.id for m in await dao.list_matching(StateFilter(layer_type="point"), "owner")] == [points.id]
+        assert [m.id for m in await dao.list_matching(StateFilter(layer_type="point"), limit=1)] == [theirs.id]
+
+    async def test_get_state_fragments(self: TestMapDAO, db_session: AsyncSession) -> None:
+        """get_state_fragments() returns the JSON text at each path, None for missing ones, with the state deferred."""
+        dao = MapDAO(db_session)
+        state: str = (
+            '{"config": {"mapState": {"zoom": 3}, "visState": {"layers": [{"id": "a"}, {"id": "b", "isVisible": true}]},'
+            ' "tooltip": null}}'
+        )
+        created: Map = await dao.create("owner", MapCreate(name="M", description="", state=state))
+        db_session.expunge_all()
+
+        dao = MapDAO(db_session)
+        paths: list[StatePath] = [
+            StatePath.parse(p)
+            for p in (
+                "config.mapState",
+                "config.visState.layers[1]",
+                "config.visState.layers[1].id",
+                "config.nope",
+                "config.visState.layers[1].isVisible",
+                "config.tooltip",
+            )
+        ]
+        found = await dao.get_state_fragments(created.id, paths)
+        assert found is not None
+        map_, fragments = found
+        assert (map_.id, map_.user_id) == (created.id, "owner")
+        assert "state" in inspect(map_).unloaded
+        assert fragments[3] is None
+        assert fragments[4:] == ["true", "null"]
+        assert [json.loads(f) for f in fragments[:3]] == [{"zoom": 3}, {"id": "b", "isVisible": True}, "b"]
+        assert await dao.get_state_fragments(9999, paths) is None
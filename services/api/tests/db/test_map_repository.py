@@ -39,10 +39,10 @@ async def test_update(self: TestSqlMapRepository, db_session: AsyncSession) -> N
         dao = MapDAO(db_session)
         repo = SqlAlchemyMapRepository(dao)
         ms: MapDomain = await repo.create("u", "orig", "d1", "{}")
-        updated: MapDomain | None = await repo.update(ms.id, "new", "d2", "{1}")
+        updated: MapDomain | None = await repo.update(ms.id, "new", "d2", '{"v": 1}')
         assert updated is not None
         assert updated.name == "new"
-        assert updated.state == "{1}"
+        assert updated.state == '{"v": 1}'
 
     async def test_delete(self: TestSqlMapRepository, db_session: AsyncSession) -> None:
         """Test deleting an existing map."""
@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.unit_of_work import UnitOfWork
+from app.domain.maps.filters import StateFilter
+from app.domain.maps.models import MapDomain, MapFragmentsDomain, MapSummaryDomain
+from app.domain.maps.paths import StatePath
+from app.domain.messages.models import MessageDomain
+from app.domain.pagination import Cursor, RankCursor, Ranked
+from app.infrastructure.maps.dao import MapDAO
+from app.infrastructure.maps.memory_repository import InMemoryMapRepository, WriteThroughMapRepository
+from app.infrastructure.maps.repository import SqlAlchemyMapRepository
+from app.infrastructure.memory_store import InMemoryStore
+from app.infrastructure.messages.dao import MessageDAO
+from app.infrastructure.messages.memory_repository import InMemoryMessageRepository, WriteThroughMessageRepository
+from app.infrastructure.messages.repository import SqlAlchemyMessageRepository
+
+
+class GatedMapBackend(InMemoryMapRepository):
+    """In-memory stand-in for the database whose reads snapshot their rows, then wait for a gate."""
+
+    def __init__(self: GatedMapBackend) -> None:
+        super().__init__()
+        self.entered: asyncio.Event = asyncio.Event()
+        self.gate: asyncio.Event = asyncio.Event()
+
+    async def _hold(self: GatedMapBackend) -> None:
+        """Signal that a read is in flight and wait until the test releases it."""
+        self.entered.set()
+        await self.gate.wait()
+
+    async def get(self: GatedMapBackend, id: int) -> MapDomain | None:
+        snapshot: MapDomain | None = await super().get(id)
+        await self._hold()
+        return snapshot
+
+    async def list_by_user(
+        self: GatedMapBackend,
+        user_id: str,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[MapDomain]:
+        snapshot: list[MapDomain] = await super().list_by_user(user_id, limit, after)
+        await self._hold()
+        return snapshot
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.maps
+class TestInMemoryMapRepository:
+    """Unit tests for the standalone in-memory map repository."""
+
+    async def test_crud(self: TestInMemoryMapRepository) -> None:
+        """Maps can be created, fetched, updated and deleted."""
+        repo = InMemoryMapRepository()
+        created: MapDomain = await repo.create("u1", "A", "d", "{}")
+        assert (await repo.get(created.id)) == created
+
+        updated: MapDomain | None = await repo.update(created.id, "B", "d2", '{"v": 1}')
+        assert updated is not None and updated.name == "B" and updated.updated_at >= created.updated_at
+        assert await repo.update(999, "x", "x", "x") is None
+
+        assert await repo.delete(created.id) is True
+        assert await repo.delete(created.id) is False
+        assert await repo.get(created.id) is None
+
+    async def test_upsert(self: TestInMemoryMapRepository) -> None:
+        """Upsert creates unknown IDs, updates the owner's map and refuses other users."""
+        repo = InMemoryMapRepository()
+        saved = await repo.upsert(999, "u1", "A", "d", "{}")
+        assert saved is not None and saved[1] is True and saved[0].id != 999
+
+        again = await repo.upsert(saved[0].id, "u1", "B", "d", "{}")
+        assert again is not None and again[1] is False and again[0].name == "B"
+        assert await repo.upsert(saved[0].id, "u2", "C", "d", "{}") is None
+
+    async def test_search(self: TestInMemoryMapRepository) -> None:
+        """search() matches names and descriptions with typos and returns summaries best first."""
+        repo = InMemoryMapRepository()
+        named: MapDomain = await repo.create("u1", "Flood risk", "", "{}")
+        described: MapDomain = await repo.create("u1", "Rivers", "flood plains", "{}")
+        await repo.create("u2", "Flood", "", "{}")
+
+        hits: list[Ranked[MapSummaryDomain]] = await repo.search("flod risk", "u1")
+        assert [h.item.id for h in hits] == [named.id]
+        assert isinstance(hits[0].item, MapSummaryDomain)
+        assert sorted(h.item.id for h in await repo.search("flod", "u1")) == [named.id, described.id]
+
+    async def test_list_matching(self: TestInMemoryMapRepository) -> None:
+        """list_matching() applies JSONB containment semantics to the stored state."""
+        repo = InMemoryMapRepository()
+        heat: MapDomain = await repo.create(
+            "u1", "H", "", '{"config": {"visState": {"layers": [{"type": "heatmap", "config": {"dataId": "d1"}}]}}}'
+        )
+        await repo.create("u1", "P", "", '{"config": {"visState": {"layers": [{"type": "point"}]}}}')
+        await repo.create("u2", "Invalid", "", "not json")
+
+        hits: list[MapSummaryDomain] = list(await repo.list_matching(StateFilter(layer_type="heatmap")))
+        assert [m.id for m in hits] == [heat.id] and isinstance(hits[0], MapSummaryDomain)
+        assert [m.id for m in await repo.list_matching(StateFilter(dataset_id="d1"), "u1")] == [heat.id]
+        assert await repo.list_matching(StateFilter(dataset_id="d1"), "u2") == []
+        assert await repo.list_matching(StateFilter(config={"visState": {"layers": {}}})) == []
+
+    async def test_get_fragments(self: TestInMemoryMapRepository) -> None:
+        """get_fragments() extracts values by path and leaves out paths with no value."""
+        repo = InMemoryMapRepository()
+        created: MapDomain = await repo.create("u1", "M", "", '{"config": {"layers": [{"id": "a"}], "zoom": null}}')
+        paths: list[StatePath] = [StatePath.parse(p) for p in ("config.layers[0].id", "config.zoom", "config.layers[1]")]
+
+        found: MapFragmentsDomain | None = await repo.get_fragments(created.id, paths)
+        assert found is not None and found.fragments == {"config.layers[0].id": "a", "config.zoom": None}
+        assert await repo.get_fragments(999, paths) is None
+
+    async def test_lists_ordered_by_updated_at(self: TestInMemoryMapRepository) -> None:
+        """Listings come back most recently updated first, per user and overall."""
+        repo = InMemoryMapRepository()
+        first: MapDomain = await repo.create("u1", "first", "d", "{}")
+        second: MapDomain = await repo.create("u1", "second", "d", "{}")
+        other: MapDomain = await repo.create("u2", "other", "d", "{}")
+
+        assert [m.id for m in await repo.list_by_user("u1")] == [second.id, first.id]
+        await asyncio.sleep(0.02)  # keep updated_at strictly later on coarse clocks
+        await repo.update(first.id, "first", "touched", "{}")
+        assert [m.id for m in await repo.list_by_user("u1")] == [first.id, second.id]
+        assert [m.id for m in await repo.list()] == [first.id, other.id, second.id]
+        assert await repo.list_by_user("nobody") == []
+
+    async def test_results_are_copies(self: TestInMemoryMapRepository) -> None:
+        """Decorating a returned map does not leak into the store."""
+        repo = InMemoryMapRepository()
+        created: MapDomain = await repo.create("u1", "A", "d", "{}")
+        created.name = "mutated"
+        fetched: MapDomain | None = await repo.get(created.id)
+        assert fetched is not None and fetched.name == "A"
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.messages
+class TestInMemoryMessageRepository:
+    """Unit tests for the standalone in-memory message repository."""
+
+    async def test_crud_and_per_user_index(self: TestInMemoryMessageRepository) -> None:
+        """Messages are indexed by user and survive updates with the index intact."""
+        repo = InMemoryMessageRepository()
+        a: MessageDomain = await repo.create("u1", "a")
+        b: MessageDomain = await repo.create("u2", "b")
+
+        assert [m.id for m in await repo.list_by_user("u1")] == [a.id]
+        updated: MessageDomain | None = await repo.update(b.id, "b2")
+        assert updated is not None and updated.content == "b2"
+        assert [m.content for m in await repo.list_by_user("u2")] == ["b2"]
+        assert await repo.delete(a.id) is True
+        assert [m.id for m in await repo.list()] == [b.id]
+
+    async def test_search(self: TestInMemoryMessageRepository) -> None:
+        """search() needs every word, ranks denser matches first and honours the cursor."""
+        repo = InMemoryMessageRepository()
+        sparse: MessageDomain = await repo.create("u1", "red fox and a dog")
+        dense: MessageDomain = await repo.create("u1", "red fox")
+        await repo.create("u2", "red hen")
+
+        hits: list[Ranked[MessageDomain]] = await repo.search("Fox red")
+        assert [h.item.id for h in hits] == [dense.id, sparse.id]
+        after = RankCursor(rank=hits[0].rank, id=dense.id)
+        assert [h.item.id for h in await repo.search("fox red", "u1", after=after)] == [sparse.id]
+        assert await repo.search("fox", "u2") == []
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.maps
+class TestWriteThroughMapRepository:
+    """Unit tests for the in-memory front over the SQL map repository."""
+
+    async def test_reads_hit_memory_after_first_load(
+        self: TestWriteThroughMapRepository,
+        db_session: AsyncSession,
+        mocker: MockerFixture,
+    ) -> None:
+        """Writes are mirrored and repeated reads never reach the backend."""
+        backend = SqlAlchemyMapRepository(MapDAO(db_session))
+        repo = WriteThroughMapRepository(backend, InMemoryStore())
+        created: MapDomain = await repo.create("u1", "A", "d", "{}")
+
+        get = mocker.spy(backend, "get")
+        list_by_user = mocker.spy(backend, "list_by_user")
+        assert (await repo.get(created.id)) == created
+        assert [m.id for m in await repo.list_by_user("u1")] == [created.id]
+        assert [m.id for m in await repo.list_by_user("u1")] == [created.id]
+        get.assert_not_called()
+        assert list_by_user.call_count == 1
+
+        updated: MapDomain | None = await repo.update(created.id, "B", "d", "{}")
+        assert updated is not None
+        fetched: MapDomain | None = await repo.get(created.id)
+        assert fetched is not None and fetched.name == "B"
+
+        assert await repo.delete(created.id) is True
+        assert await repo.get(created.id) is None
+        assert await backend.get(created.id) is None
+
+    async def test_loads_backend_rows_on_miss(
+        self: TestWriteThroughMapRepository,
+        db_session: AsyncSession,
+    ) -> None:
+        """Rows written behind the front's back are loaded on first read."""
+        backend = SqlAlchemyMapRepository(MapDAO(db_session))
+        existing: MapDomain = await backend.create("u1", "A", "d", "{}")
+        repo = WriteThroughMapRepository(backend, InMemoryStore())
+
+        assert (await repo.get(existing.id)) == existing
+        assert [m.id for m in await repo.list()] == [existing.id]
+
+    async def test_rollback_evicts_writes(
+        self: TestWriteThroughMapRepository,
+        db_session: AsyncSession,
+    ) -> None:
+        """A rolled back unit of work removes its writes from memory."""
+        store: InMemoryStore[MapDomain] = InMemoryStore()
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork(db_session) as uow:
+                repo = WriteThroughMapRepository(
+                    SqlAlchemyMapRepository(MapDAO(db_session)), store, uow.on_commit, uow.on_rollback
+                )
+                created: MapDomain = await repo.create("u1", "A", "d", "{}")
+                raise RuntimeError("boom")
+
+        assert store.get(created.id) is None
+        assert "u1" not in store.complete_users
+
+    async def test_writes_reach_the_store_on_commit(
+        self: TestWriteThroughMapRepository,
+        db_session: AsyncSession,
+    ) -> None:
+        """Other requests never see uncommitted writes; the writing request sees its own."""
+        store: InMemoryStore[MapDomain] = InMemoryStore()
+        backend = SqlAlchemyMapRepository(MapDAO(db_session))
+        existing: MapDomain = await backend.create("u1", "A", "d", "{}")
+        await db_session.commit()
+        store.put(existing)
+        store.complete_users.add("u1")
+
+        async with UnitOfWork(db_session) as uow:
+            repo = WriteThroughMapRepository(backend, store, uow.on_commit, uow.on_rollback)
+            created: MapDomain = await repo.create("u1", "B", "d", "{}")
+            updated: MapDomain | None = await repo.update(existing.id, "A2", "d", "{}")
+            assert updated is not None
+
+            assert store.get(created.id) is None
+            assert store.get(existing.id) == existing
+            assert [m.id for m in store.list_by_user("u1")] == [existing.id]
+
+            assert await repo.get(created.id) == created
+            assert [m.name for m in await repo.get_many([existing.id, created.id]) if m] == ["A2", "B"]
+            assert {m.id for m in await repo.list_by_user("u1")} == {existing.id, created.id}
+
+        assert store.get(created.id) == created
+        assert store.get(existing.id) == updated
+        assert "u1" in store.complete_users
+
+    async def test_update_during_fill_wins(self: TestWriteThroughMapRepository) -> None:
+        """A row read before another request's committed update never overwrites it in the store."""
+        database = GatedMapBackend()
+        created: MapDomain = await database.create("u1", "A", "d", "{}")
+        store: InMemoryStore[MapDomain] = InMemoryStore()
+        reader = WriteThroughMapRepository(database, store)
+        writer = WriteThroughMapRepository(database, store)
+
+        read: asyncio.Task[MapDomain | None] = asyncio.create_task(reader.get(created.id))
+        await database.entered.wait()
+        updated: MapDomain | None = await writer.update(created.id, "B", "d", "{}")
+        database.gate.set()
+
+        stale: MapDomain | None = await read
+        assert stale is not None and stale.name == "A"
+        assert store.get(created.id) == updated
+        assert store.changed == {}
+
+    async def test_delete_during_fill_wins(self: TestWriteThroughMapRepository) -> None:
+        """A map deleted while a get or a listing is reading it does not come back from the store."""
+        database = GatedMapBackend()
+        first: MapDomain = await database.create("u1", "A", "d", "{}")
+        second: MapDomain = await database.create("u1", "B", "d", "{}")
+        store: InMemoryStore[MapDomain] = InMemoryStore()
+        reader = WriteThroughMapRepository(database, store)
+        writer = WriteThroughMapRepository(database, store)
+
+        read: asyncio.Task[MapDomain | None] = asyncio.create_task(reader.get(first.id))
+        listing: asyncio.Task[list[MapDomain]] = asyncio.create_task(reader.list_by_user("u1"))
+        await database.entered.wait()
+        await asyncio.sleep(0)
+        assert await writer.remove(first.id) is not None
+        database.gate.set()
+        await asyncio.gather(read, listing)
+
+        assert store.get(first.id) is None
+        assert await reader.get(first.id) is None
+        assert [m.id for m in await reader.list_by_user("u1")] == [second.id]
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.messages
+class TestWriteThroughMessageRepository:
+    """Unit tests for the in-memory front over the SQL message repository."""
+
+    async def test_write_through(
+        self: TestWriteThroughMessageRepository,
+        db_session: AsyncSession,
+        mocker: MockerFixture,
+    ) -> None:
+        """Messages are mirrored on write and served from memory."""
+        backend = SqlAlchemyMessageRepository(MessageDAO(db_session))
+        repo = WriteThroughMessageRepository(backend, InMemoryStore())
+        created: MessageDomain = await repo.create("u1", "hello")
+
+        get = mocker.spy(backend, "get")
+        assert (await repo.get(created.id)) == created
+        get.assert_not_called()
+
+        updated: MessageDomain | None = await repo.update(created.id, "bye")
+        assert updated is not None
+        assert [m.content for m in await repo.list_by_user("u1")] == ["bye"]
+        assert await repo.delete(created.id) is True
+        assert await repo.list() == []
@@ -5,6 +5,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.entities.message import Message
+from app.domain.errors import NotOwnerError
+from app.domain.pagination import RankCursor, Ranked
 from app.infrastructure.messages.dao import MessageDAO
 from app.schemas.messages import MessageCreate
 
@@ -60,6 +62,54 @@ async def test_update_message_content(self: TestMessageDAO, db_session: AsyncSes
         assert updated.id == original.id
         assert updated.content == "Updated content"
 
+    async def test_update_restricted_to_owner(self: TestMessageDAO, db_session: AsyncSession) -> None:
+        """Should update the owner's message, refuse anyone else's and report missing ones as None."""
+        dao = MessageDAO(db_session)
+        original: Message = await dao.create(user_id="owner", content="Original content")
+
+        updated: Message | None = await dao.update(original.id, "By owner", owner="owner")
+        assert updated is not None and updated.content == "By owner"
+
+        with pytest.raises(NotOwnerError):
+            await dao.update(original.id, "By intruder", owner="intruder")
+        assert await dao.update(9999, "Missing", owner="owner") is None
+
+        db_session.expunge_all()
+        fetched: Message | None = await MessageDAO(db_session).get(original.id)
+        assert fetched is not None and fetched.content == "By owner"
+
+    async def test_create_many_keeps_order(self: TestMessageDAO, db_session: AsyncSession) -> None:
+        """Should insert many messages with RETURNING and give them back in input order."""
+        dao = MessageDAO(db_session)
+        contents: list[str] = [f"bulk {i}" for i in range(25)]
+
+        created: Sequence[Message] = await dao.create_many("user-bulk", contents)
+
+        assert [m.content for m in created] == contents
+        assert all(m.id is not None and m.created_at is not None for m in created)
+        assert await dao.create_many("user-bulk", []) == []
+        assert len(await dao.list_by_user("user-bulk")) == len(contents)
+
+    async def test_search_ranks_and_pages(self: TestMessageDAO, db_session: AsyncSession) -> None:
+        """search() matches stemmed words through the index, best first, and pages by (rank, id)."""
+        dao = MessageDAO(db_session)
+        dense: Message = await dao.create("u1", "dogs dogs dogs")
+        sparse: Message = await dao.create("u1", "a dog ran past the quiet house")
+        await dao.create("u1", "cats only")
+        theirs: Message = await dao.create("u2", "dog")
+
+        hits: list[Ranked[Message]] = await dao.search("Dog")
+        assert [h.item.id for h in hits][0] == dense.id and hits[-1].item.id == sparse.id
+        assert [h.item.id for h in await dao.search("dog", user_id="u1")] == [dense.id, sparse.id]
+
+        after = RankCursor(rank=hits[0].rank, id=hits[0].item.id)
+        assert [h.item.id for h in await dao.search("dog", limit=1, after=after)] == [hits[1].item.id]
+
+        await dao.update(theirs.id, "no pets")
+        await dao.delete(dense.id)
+        assert [h.item.id for h in await dao.search("dog")] == [sparse.id]
+        assert await dao.search('" OR') == [] and await dao.search("?!") == []
+
     async def test_delete_message(self: TestMessageDAO, db_session: AsyncSession) -> None:
         """Should delete a message and return True, and confirm it's gone."""
         # Arrange
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.settings import Settings, get_settings
+from app.db.migrations import _upgrade, current_revisions, run_migrations_async, script_heads
+
+
+def write_revision(directory: Path, revision: str, down_revision: str | None) -> None:
+    """Write a minimal migration script."""
+    down: str = f'"{down_revision}"' if down_revision else "None"
+    (directory / f"{revision}.py").write_text(
+        f'"""{revision}"""\nrevision = "{revision}"\ndown_revision = {down}\n'
+    )
+
+
+async def stamp(url: str, revisions: set[str]) -> None:
+    """Create alembic_version stamped at the given revisions."""
+    engine: AsyncEngine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        for revision in revisions:
+            await conn.execute(text("INSERT INTO alembic_version VALUES (:v)"), {"v": revision})
+    await engine.dispose()
+
+
+@pytest.mark.unit
+@pytest.mark.db
+class TestScriptHeads:
+    """Unit tests for parsing migration heads without Alembic."""
+
+    def test_linear_history(self: TestScriptHeads, tmp_path: Path) -> None:
+        """The last revision of a linear chain is the only head."""
+        write_revision(tmp_path, "a", None)
+        write_revision(tmp_path, "b", "a")
+        write_revision(tmp_path, "c", "b")
+        assert script_heads(tmp_path) == {"c"}
+
+    def test_merge_revision(self: TestScriptHeads, tmp_path: Path) -> None:
+        """A merge revision's tuple of parents is parsed."""
+        write_revision(tmp_path, "a", None)
+        write_revision(tmp_path, "b", "a")
+        write_revision(tmp_path, "c", "a")
+        (tmp_path / "d.py").write_text('revision = "d"\ndown_revision = ("b", "c")\n')
+        assert script_heads(tmp_path) == {"d"}
+
+    def test_project_migrations(self: TestScriptHeads) -> None:
+        """The project's history has one head: the revision of its highest-numbered script."""
+        versions: Path = get_settings().system.project_root / "migrations" / "versions"
+        latest: Path = max(versions.glob("[0-9]*.py"))
+        revision: re.Match[str] | None = re.search(r'^revision = "([^"]+)"', latest.read_text(), re.MULTILINE)
+        assert revision is not None
+        assert script_heads(versions) == {revision.group(1)}
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.db
+class TestRunMigrations:
+    """Unit tests for the startup migration fast path."""
+
+    async def test_current_revisions_without_table(self: TestRunMigrations, tmp_path: Path) -> None:
+        """A fresh database has no stamped revisions."""
+        engine: AsyncEngine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'fresh.db'}")
+        async with engine.connect() as conn:
+            assert await current_revisions(conn) == set()
+        await engine.dispose()
+
+    async def test_skips_upgrade_when_current(self: TestRunMigrations, tmp_path: Path, mocker: MockerFixture) -> None:
+        """A database stamped at the script heads never loads Alembic."""
+        url: str = f"sqlite+aiosqlite:///{tmp_path / 'current.db'}"
+        await stamp(url, script_heads(get_settings().system.project_root / "migrations" / "versions"))
+        upgrade: MagicMock = mocker.patch("app.db.migrations._upgrade")
+
+        await run_migrations_async(url)
+
+        upgrade.assert_not_called()
+
+    async def test_upgrades_when_behind(self: TestRunMigrations, tmp_path: Path, mocker: MockerFixture) -> None:
+        """A database behind the script heads is upgraded once."""
+        url: str = f"sqlite+aiosqlite:///{tmp_path / 'behind.db'}"
+        await stamp(url, {"0001_create_message_table"})
+        upgrade: MagicMock = mocker.patch("app.db.migrations._upgrade")
+
+        await run_migrations_async(url)
+
+        upgrade.assert_called_once()
+        assert upgrade.call_args.args[2] == url
+
+
+@pytest.mark.unit
+@pytest.mark.db
+class TestMigrationHistory:
+    """Runs the project's migrations against a real database."""
+
+    def test_round_trip_on_fresh_database(self: TestMigrationHistory, tmp_path: Path) -> None:
+        """A fresh database upgrades to head, downgrades to 0003 and upgrades to head again."""
+        from alembic import command
+        from alembic.config import Config
+
+        settings: Settings = get_settings()
+        url: str = f"sqlite+aiosqlite:///{tmp_path / 'fresh.db'}"
+        _upgrade(settings, settings.system.project_root / "alembic.ini", url)
+
+        alembic_cfg = Config(str(settings.system.project_root / "alembic.ini"))
+        alembic_cfg.set_main_option("script_location", str(settings.system.project_root / "migrations"))
+        alembic_cfg.set_main_option("sqlalchemy.url", url)
+        command.downgrade(alembic_cfg, "0003_add_description_to_map_state_table")
+        command.upgrade(alembic_cfg, "head")
+
+        with sqlite3.connect(tmp_path / "fresh.db") as conn:
+            assert {row[0] for row in conn.execute("SELECT version_num FROM alembic_version")} == script_heads(
+                settings.system.project_root / "migrations" / "versions"
+            )
+            assert "description" in {row[1] for row in conn.execute("PRAGMA table_info(maps)")}
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from pytest_mock import MockerFixture
+from sqlalchemy import exc
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.online_migrations import (
+    BackfillProgress,
+    _retry_on_lock_timeout,
+    backfill_in_batches,
+    create_index_concurrently,
+    drop_index_concurrently,
+    run_with_lock_timeout,
+)
+
+ROWS: int = 2500
+
+
+class LockNotAvailable(Exception):
+    """Stand-in for a driver error carrying the lock_timeout SQLSTATE."""
+
+    sqlstate: str = "55P03"
+
+
+@pytest.fixture
+def migration_conn(tmp_path: Path) -> Generator[Connection, None, None]:
+    """Fixture providing a connection inside an Alembic operations context with a populated table."""
+    engine: Engine = sa.create_engine(f"sqlite:///{tmp_path / 'online.db'}")
+    with engine.connect() as conn:
+        conn.execute(sa.text("CREATE TABLE messages (id INTEGER PRIMARY KEY, content TEXT, length INTEGER)"))
+        conn.execute(
+            sa.text("INSERT INTO messages (id, content) VALUES (:id, :content)"),
+            [{"id": i, "content": "x" * (i % 7)} for i in range(1, ROWS + 1)],
+        )
+        conn.commit()
+        with Operations.context(MigrationContext.configure(connection=conn)):
+            yield conn
+    engine.dispose()
+
+
+@pytest.mark.unit
+@pytest.mark.db
+class TestOnlineMigrations:
+    """Unit tests for the lock-safe migration helpers."""
+
+    def test_backfill_in_batches(self: TestOnlineMigrations, migration_conn: Connection) -> None:
+        """Every row is filled in key-range batches with progress reported per batch."""
+        reports: list[BackfillProgress] = []
+
+        result: BackfillProgress = backfill_in_batches(
+            "messages",
+            {"length": sa.func.length(sa.column("content"))},
+            batch_size=1000,
+            pause_seconds=0,
+            progress=reports.append,
+        )
+
+        assert result.rows_updated == ROWS
+        assert result.batches == 3
+        assert [r.batches for r in reports] == [1, 2, 3]
+        assert reports[-1].percent == 100.0
+        missing: int = migration_conn.execute(
+            sa.text("SELECT count(*) FROM messages WHERE length IS NULL OR length != length(content)")
+        ).scalar_one()
+        assert missing == 0
+
+    def test_backfill_respects_where(self: TestOnlineMigrations, migration_conn: Connection) -> None:
+        """Rows outside the predicate are left untouched."""
+        result: BackfillProgress = backfill_in_batches(
+            "messages",
+            {"length": 0},
+            where=sa.column("id") <= 10,
+            batch_size=4,
+            pause_seconds=0,
+        )
+
+        assert result.rows_updated == 10
+        filled: int = migration_conn.execute(sa.text("SELECT count(*) FROM messages WHERE length = 0")).scalar_one()
+        assert filled == 10
+
+    def test_backfill_empty_table(self: TestOnlineMigrations, migration_conn: Connection) -> None:
+        """An empty table finishes without batches."""
+        migration_conn.execute(sa.text("DELETE FROM messages"))
+        migration_conn.commit()
+
+        result: BackfillProgress = backfill_in_batches("messages", {"length": 0}, pause_seconds=0)
+
+        assert result.batches == 0
+        assert result.rows_updated == 0
+
+    def test_create_and_drop_index(self: TestOnlineMigrations, migration_conn: Connection) -> None:
+        """Index helpers are idempotent and fall back to plain DDL off Postgres."""
+        create_index_concurrently("ix_messages_length", "messages", ["length"])
+        create_index_concurrently("ix_messages_length", "messages", ["length"])
+        assert "ix_messages_length" in {i["name"] for i in sa.inspect(migration_conn).get_indexes("messages")}
+
+        drop_index_concurrently("ix_messages_length", "messages")
+        assert "ix_messages_length" not in {i["name"] for i in sa.inspect(migration_conn).get_indexes("messages")}
+
+    def test_run_with_lock_timeout_off_postgres(self: TestOnlineMigrations, migration_conn: Connection) -> None:
+        """Off Postgres the operation simply runs once."""
+        assert run_with_lock_timeout(lambda: 42) == 42
+
+    def test_retries_on_lock_timeout(self: TestOnlineMigrations, mocker: MockerFixture) -> None:
+        """Lock timeouts are retried with exponential backoff until the attempt succeeds."""
+        sleep = mocker.patch("app.db.online_migrations.time.sleep")
+        attempts: list[int] = []
+
+        def attempt() -> str:
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise exc.OperationalError("ALTER TABLE", {}, LockNotAvailable())
+            return "done"
+
+        assert _retry_on_lock_timeout("alter", attempt, retries=5, backoff_seconds=0.5) == "done"
+        assert [c.args[0] for c in sleep.call_args_list] == [0.5, 1.0]
+
+    def test_gives_up_after_retries(self: TestOnlineMigrations, mocker: MockerFixture) -> None:
+        """The last lock timeout propagates once retries are exhausted."""
+        mocker.patch("app.db.online_migrations.time.sleep")
+
+        def attempt() -> None:
+            raise exc.OperationalError("ALTER TABLE", {}, LockNotAvailable())
+
+        with pytest.raises(exc.OperationalError):
+            _retry_on_lock_timeout("alter", attempt, retries=2, backoff_seconds=0)
+
+    def test_other_errors_are_not_retried(self: TestOnlineMigrations, mocker: MockerFixture) -> None:
+        """Errors other than lock timeouts fail immediately."""
+        sleep = mocker.patch("app.db.online_migrations.time.sleep")
+
+        def attempt() -> None:
+            raise exc.OperationalError("ALTER TABLE", {}, Exception("syntax error"))
+
+        with pytest.raises(exc.OperationalError):
+            _retry_on_lock_timeout("alter", attempt, retries=2, backoff_seconds=0)
+        sleep.assert_not_called()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.maps.models import MapDomain
+from app.domain.pagination import Cursor, Page
+from app.infrastructure.maps.dao import MapDAO
+from app.infrastructure.maps.memory_repository import InMemoryMapRepository, WriteThroughMapRepository
+from app.infrastructure.maps.repository import SqlAlchemyMapRepository
+from app.infrastructure.memory_store import InMemoryStore
+from app.infrastructure.messages.dao import MessageDAO
+from app.schemas.maps import MapCreate
+from app.services.maps_service import MapService
+
+
+@pytest.mark.unit
+class TestCursor:
+    """Unit tests for the opaque keyset cursor."""
+
+    def test_round_trip(self: TestCursor) -> None:
+        """Encoded cursors decode to the same position."""
+        cursor = Cursor(updated_at=datetime(2025, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc), id=42)
+        assert Cursor.decode(cursor.encode()) == cursor
+
+    def test_decodes_timestamps_to_utc(self: TestCursor) -> None:
+        """Tokens without an offset are taken as UTC and offsets are converted, so every cursor compares alike."""
+        naive = Cursor(updated_at=datetime(2025, 1, 2, 3, 4, 5), id=1)
+        shifted = Cursor(updated_at=datetime(2025, 1, 2, 5, 4, 5, tzinfo=timezone(timedelta(hours=2))), id=1)
+        expected = Cursor(updated_at=datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc), id=1)
+        assert Cursor.decode(naive.encode()) == expected
+        decoded: Cursor = Cursor.decode(shifted.encode())
+        assert decoded == expected and decoded.updated_at.utcoffset() == timedelta(0)
+
+    @pytest.mark.parametrize("token", ["", "not-base64!", "bnVsbA", "WzEsMiwzXQ", "WyJ4IiwgMV0"])
+    def test_rejects_malformed(self: TestCursor, token: str) -> None:
+        """Garbage, wrong shapes and bad timestamps raise ValueError."""
+        with pytest.raises(ValueError):
+            Cursor.decode(token)
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.db
+class TestKeysetPagination:
+    """Keyset pages over the SQL and in-memory listings."""
+
+    async def test_map_pages_cover_every_row_once(self: TestKeysetPagination, db_session: AsyncSession) -> None:
+        """Rows sharing a timestamp are split across pages by ID without gaps or repeats."""
+        dao = MapDAO(db_session)
+        for i in range(7):
+            await dao.create("u1" if i % 2 else "u2", MapCreate(name=f"m{i}", description="", state="{}"))
+
+        everything: list[int] = [m.id for m in await dao.list()]
+        assert everything == sorted(everything, reverse=True)
+
+        seen: list[int] = []
+        after: Cursor | None = None
+        while page := await dao.list(3, after):
+            seen += [m.id for m in page]
+            after = Cursor.after(page[-1])
+        assert seen == everything
+
+        mine: list[int] = [m.id for m in await dao.list_by_user("u1")]
+        first = await dao.list_by_user("u1", 2)
+        rest = await dao.list_by_user("u1", 10, Cursor.after(first[-1]))
+        assert [m.id for m in [*first, *rest]] == mine
+
+    async def test_message_pages(self: TestKeysetPagination, db_session: AsyncSession) -> None:
+        """Message listings page the same way."""
+        dao = MessageDAO(db_session)
+        ids: list[int] = [(await dao.create("u1", f"m{i}")).id for i in range(4)]
+
+        first = await dao.list_by_user("u1", 3)
+        rest = await dao.list_by_user("u1", 3, Cursor.after(first[-1]))
+        assert [m.id for m in [*first, *rest]] == sorted(ids, reverse=True)
+
+    async def test_service_pages(self: TestKeysetPagination, db_session: AsyncSession) -> None:
+        """The service hands out a next cursor only while rows remain."""
+        service = MapService(SqlAlchemyMapRepository(MapDAO(db_session)))
+        for i in range(3):
+            await service.repo.create("u1", f"m{i}", "", "{}")
+
+        page: Page[MapDomain] = await service.page_by_user("u1", 2)
+        assert len(page.items) == 2 and page.next is not None
+        last: Page[MapDomain] = await service.page_by_user("u1", 2, page.next)
+        assert len(last.items) == 1 and last.next is None
+
+    async def test_memory_pages_match_sql_order(self: TestKeysetPagination) -> None:
+        """The in-memory store pages its sorted index with the same cursor."""
+        repo = InMemoryMapRepository()
+        ids: list[int] = [(await repo.create("u1", f"m{i}", "", "{}")).id for i in range(5)]
+
+        first: list[MapDomain] = await repo.list_by_user("u1", 2)
+        rest: list[MapDomain] = await repo.list(10, Cursor.after(first[-1]))
+        assert [m.id for m in [*first, *rest]] == sorted(ids, reverse=True)
+
+    async def test_decoded_cursors_page_every_backend(
+        self: TestKeysetPagination,
+        db_session: AsyncSession,
+    ) -> None:
+        """Client tokens, with or without an offset, page SQL, write-through and in-memory listings alike."""
+        sql = SqlAlchemyMapRepository(MapDAO(db_session))
+        ids: list[int] = [(await sql.create("u1", f"m{i}", "", "{}")).id for i in range(3)]
+        # SQLite hands back naive timestamps, so the write-through store is keyed by them
+        front = WriteThroughMapRepository(sql, InMemoryStore())
+        await front.list_by_user("u1")
+        for repo in (sql, front):
+            first: list[MapDomain] = await repo.list_by_user("u1", 1)
+            rest: list[MapDomain] = await repo.list_by_user("u1", 10, Cursor.decode(Cursor.after(first[-1]).encode()))
+            assert [m.id for m in [*first, *rest]] == sorted(ids, reverse=True)
+
+        memory = InMemoryMapRepository()
+        created: list[MapDomain] = [await memory.create("u1", f"m{i}", "", "{}") for i in range(3)]
+        naive = Cursor(updated_at=created[-1].updated_at.replace(tzinfo=None), id=created[-1].id)
+        assert [m.id for m in await memory.list_by_user("u1", 10, Cursor.decode(naive.encode()))] == [
+            m.id for m in reversed(created[:-1])
+        ]
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from starlette.requests import Request
+
+from app.db.base import Base
+from app.db.entities.map import Map
+from app.db.routing import ReadYourWritesTracker, RoutingSession, read_your_writes_key
+from app.db.unit_of_work import UnitOfWork
+from app.infrastructure.maps.dao import MapDAO
+from app.schemas.maps import MapCreate
+
+
+async def make_engine(path: Path) -> AsyncEngine:
+    """Create a file-backed SQLite engine with the schema in place."""
+    engine: AsyncEngine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+@pytest.fixture
+async def engines(tmp_path: Path) -> AsyncGenerator[tuple[AsyncEngine, AsyncEngine], None]:
+    """Fixture providing separate primary and replica databases."""
+    primary: AsyncEngine = await make_engine(tmp_path / "primary.db")
+    replica: AsyncEngine = await make_engine(tmp_path / "replica.db")
+    yield primary, replica
+    await primary.dispose()
+    await replica.dispose()
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.db
+class TestRoutingSession:
+    """Unit tests for read/write routing between primary and replica."""
+
+    async def test_reads_replica_writes_primary(
+        self: TestRoutingSession,
+        engines: tuple[AsyncEngine, AsyncEngine],
+    ) -> None:
+        """Writes land on the primary; a fresh session reads from the replica."""
+        primary, replica = engines
+        tracker = ReadYourWritesTracker(window=0)
+        factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
+            sync_session_class=RoutingSession,
+            expire_on_commit=False,
+            primary=primary,
+            replicas=[replica],
+            tracker=tracker,
+        )
+
+        async with factory() as session, UnitOfWork(session):
+            created: Map = await MapDAO(session).create("u", MapCreate(name="A", description="d", state="{}"))
+            # Same session stays on the primary after writing
+            assert await MapDAO(session).get(created.id) is not None
+
+        async with factory() as session:
+            assert await MapDAO(session).list_by_user("u") == []
+
+        async with AsyncSession(primary) as session:
+            assert len(await MapDAO(session).list_by_user("u")) == 1
+
+    async def test_read_your_writes_window(
+        self: TestRoutingSession,
+        engines: tuple[AsyncEngine, AsyncEngine],
+    ) -> None:
+        """A caller who just committed keeps reading from the primary."""
+        primary, replica = engines
+        tracker = ReadYourWritesTracker(window=60)
+        factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
+            sync_session_class=RoutingSession,
+            expire_on_commit=False,
+            primary=primary,
+            replicas=[replica],
+            tracker=tracker,
+        )
+
+        async with factory(sticky_key="writer") as session, UnitOfWork(session):
+            await MapDAO(session).create("writer", MapCreate(name="A", description="d", state="{}"))
+
+        assert tracker.is_recent("writer")
+        assert not tracker.is_recent("someone-else")
+
+        async with factory(sticky_key="writer") as session:
+            assert len(await MapDAO(session).list_by_user("writer")) == 1
+
+        async with factory(sticky_key="someone-else") as session:
+            assert await MapDAO(session).list_by_user("writer") == []
+
+
+def make_request(headers: dict[str, str], user: dict[str, str] | None = None) -> Request:
+    """A bare HTTP request from a fixed client address."""
+    return Request({
+        "type": "http",
+        "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+        "client": ("203.0.113.7", 50000),
+        "user": user,
+    })
+
+
+@pytest.mark.unit
+@pytest.mark.db
+class TestReadYourWritesKey:
+    """Unit tests for identifying the caller a commit makes sticky."""
+
+    def test_identified_callers(self: TestReadYourWritesKey) -> None:
+        """The token subject wins over the proxy's remote user header."""
+        assert read_your_writes_key(make_request({"x-remote-user": "apache"}, {"sub": "oidc"})) == "oidc"
+        assert read_your_writes_key(make_request({"x-remote-user": "apache"})) == "apache"
+
+    def test_anonymous_callers_are_not_sticky(self: TestReadYourWritesKey) -> None:
+        """Callers sharing an address are never pinned to the primary by each other's writes."""
+        assert read_your_writes_key(make_request({})) is None
+        assert read_your_writes_key(make_request({"x-remote-user": ""})) is None
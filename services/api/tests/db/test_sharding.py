@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Sequence
+
+import pytest
+from sqlalchemy import func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.base import Base
+from app.db.entities.map import Map
+from app.db.entities.message import Message
+from app.db.sharding import ShardRouter
+from app.domain.maps.filters import StateFilter
+from app.domain.maps.paths import StatePath
+from app.domain.pagination import Cursor, RankCursor
+from app.infrastructure.maps.sharded_dao import ShardedMapDAO
+from app.infrastructure.messages.sharded_dao import ShardedMessageDAO
+from app.schemas.maps import MapCreate, MapUpdate
+
+SHARDS: int = 3
+USERS: list[str] = [f"user-{i}" for i in range(12)]
+
+
+@pytest.fixture
+async def router(tmp_path: Path) -> AsyncGenerator[ShardRouter, None]:
+    """Fixture providing a router over SHARDS SQLite files with the schema in place."""
+    engines: list[AsyncEngine] = []
+    for i in range(SHARDS):
+        engine: AsyncEngine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / f'shard{i}.db'}", poolclass=NullPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        engines.append(engine)
+    yield ShardRouter(engines)
+    for engine in engines:
+        await engine.dispose()
+
+
+async def count_rows(engine: AsyncEngine, entity: type[Map] | type[Message], user_id: str) -> int:
+    """Count a user's rows stored on one shard."""
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(entity).where(entity.user_id == user_id))).scalar_one()
+
+
+@pytest.mark.unit
+class TestShardRouter:
+    """Unit tests for shard selection and global ID encoding."""
+
+    def test_shard_for_is_stable_and_spread(self: TestShardRouter) -> None:
+        """The same user always maps to the same shard and users spread over shards."""
+        router = ShardRouter([create_async_engine("sqlite+aiosqlite://") for _ in range(SHARDS)])
+        assert [router.shard_for(u) for u in USERS] == [router.shard_for(u) for u in USERS]
+        assert len({router.shard_for(u) for u in USERS}) > 1
+
+    def test_local_bound(self: TestShardRouter) -> None:
+        """Local IDs below the bound are exactly those whose global ID is below the global one."""
+        router = ShardRouter([create_async_engine("sqlite+aiosqlite://") for _ in range(SHARDS)])
+        for shard in range(SHARDS):
+            for global_id in range(1, 30):
+                bound: int = router.local_bound(shard, global_id)
+                assert all((router.global_id(shard, local) < global_id) == (local < bound) for local in range(15))
+
+    def test_global_id_round_trip(self: TestShardRouter) -> None:
+        """Global IDs decode back to their shard and local ID."""
+        router = ShardRouter([create_async_engine("sqlite+aiosqlite://") for _ in range(SHARDS)])
+        for shard in range(SHARDS):
+            for local_id in (1, 2, 1000):
+                assert router.locate(router.global_id(shard, local_id)) == (shard, local_id)
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.db
+class TestShardedMapDAO:
+    """Unit tests for maps partitioned across shards."""
+
+    async def test_user_maps_live_on_one_shard(self: TestShardedMapDAO, router: ShardRouter) -> None:
+        """Every map of a user is written to that user's shard only."""
+        async with router.unit_of_work() as uow:
+            for user_id in USERS:
+                await ShardedMapDAO(uow).create(user_id, MapCreate(name="A", description="d", state="{}"))
+
+        for user_id in USERS:
+            counts: list[int] = [await count_rows(e, Map, user_id) for e in router.engines]
+            assert counts[router.shard_for(user_id)] == 1
+            assert sum(counts) == 1
+
+    async def test_get_update_delete_by_global_id(self: TestShardedMapDAO, router: ShardRouter) -> None:
+        """Global IDs returned by create address the right row on the right shard."""
+        async with router.unit_of_work() as uow:
+            created: list[Map] = [
+                await ShardedMapDAO(uow).create(u, MapCreate(name=u, description="d", state="{}")) for u in USERS
+            ]
+        assert len({m.id for m in created}) == len(USERS)
+
+        async with router.unit_of_work() as uow:
+            dao = ShardedMapDAO(uow)
+            for m in created:
+                fetched: Map | None = await dao.get(m.id)
+                assert fetched is not None and fetched.name == m.user_id
+
+            updated: Map | None = await dao.update(created[0].id, MapUpdate(name="B", description="d", state="{}"))
+            assert updated is not None and updated.id == created[0].id and updated.name == "B"
+            assert await dao.delete(created[1].id) is True
+
+        async with router.unit_of_work() as uow:
+            assert await ShardedMapDAO(uow).get(created[1].id) is None
+
+    async def test_list_scatter_gathers_newest_first(self: TestShardedMapDAO, router: ShardRouter) -> None:
+        """list() merges every shard; list_by_user stays on the user's shard."""
+        async with router.unit_of_work() as uow:
+            for user_id in USERS:
+                await ShardedMapDAO(uow).create(user_id, MapCreate(name="A", description="d", state="{}"))
+
+        async with router.unit_of_work() as uow:
+            dao = ShardedMapDAO(uow)
+            maps: Sequence[Map] = await dao.list()
+            assert sorted(m.user_id for m in maps) == sorted(USERS)
+            assert [(m.updated_at, m.id) for m in maps] == sorted(((m.updated_at, m.id) for m in maps), reverse=True)
+            assert len(uow.sessions) == SHARDS
+
+        async with router.unit_of_work() as uow:
+            mine: Sequence[Map] = await ShardedMapDAO(uow).list_by_user(USERS[0])
+            assert [m.user_id for m in mine] == [USERS[0]]
+            assert list(uow.sessions) == [router.shard_for(USERS[0])]
+
+    async def test_list_summaries_span_shards(self: TestShardedMapDAO, router: ShardRouter) -> None:
+        """list_summaries() merges every shard with global IDs and leaves the state unloaded."""
+        async with router.unit_of_work() as uow:
+            created: list[Map] = [
+                await ShardedMapDAO(uow).create(u, MapCreate(name=u, description="", state="{}")) for u in USERS
+            ]
+
+        async with router.unit_of_work() as uow:
+            summaries: Sequence[Map] = await ShardedMapDAO(uow).list_summaries()
+            assert sorted(m.id for m in summaries) == sorted(m.id for m in created)
+            assert all("state" in inspect(m).unloaded for m in summaries)
+
+    async def test_state_queries_span_shards(self: TestShardedMapDAO, router: ShardRouter) -> None:
+        """list_matching() merges every shard; get_state_fragments() reads the shard encoded in a global ID."""
+        async with router.unit_of_work() as uow:
+            created: list[Map] = [
+                await ShardedMapDAO(uow).create(
+                    u, MapCreate(name=u, description="", state=f'{{"config": {{"mapState": {{"zoom": {i % 2}}}}}}}')
+                )
+                for i, u in enumerate(USERS)
+            ]
+
+        async with router.unit_of_work() as uow:
+            dao = ShardedMapDAO(uow)
+            zoomed: Sequence[Map] = await dao.list_matching(StateFilter(config={"mapState": {"zoom": 1}}))
+            assert sorted(m.id for m in zoomed) == sorted(m.id for m in created[1::2])
+            found = await dao.get_state_fragments(created[5].id, [StatePath.parse("config.mapState.zoom")])
+            assert found is not None and (found[0].id, found[0].user_id, found[1]) == (created[5].id, USERS[5], ["1"])
+
+    async def test_keyset_pages_span_shards(self: TestShardedMapDAO, router: ShardRouter) -> None:
+        """Paging list() with global-ID cursors returns every map once, in list() order."""
+        async with router.unit_of_work() as uow:
+            for user_id in USERS:
+                for name in ("A", "B"):
+                    await ShardedMapDAO(uow).create(user_id, MapCreate(name=name, description="d", state="{}"))
+
+        async with router.unit_of_work() as uow:
+            dao = ShardedMapDAO(uow)
+            expected: list[int] = [m.id for m in await dao.list()]
+            seen: list[int] = []
+            after: Cursor | None = None
+            while page := await dao.list(5, after):
+                seen += [m.id for m in page]
+                after = Cursor.after(page[-1])
+            assert seen == expected
+
+            mine: list[int] = [m.id for m in await dao.list_by_user(USERS[0])]
+            first: Sequence[Map] = await dao.list_by_user(USERS[0], 1)
+            rest: Sequence[Map] = await dao.list_by_user(USERS[0], 5, Cursor.after(first[0]))
+            assert [m.id for m in [*first, *rest]] == mine
+
+    async def test_upsert_by_global_id(self: TestShardedMapDAO, router: ShardRouter) -> None:
+        """Upsert updates the owner's map by global ID and refuses maps of users on other shards."""
+        owner: str = USERS[0]
+        other: str = next(u for u in USERS if router.shard_for(u) != router.shard_for(owner))
+        async with router.unit_of_work() as uow:
+            theirs: Map = await ShardedMapDAO(uow).create(other, MapCreate(name="T", description="d", state="{}"))
+
+        async with router.unit_of_work() as uow:
+            dao = ShardedMapDAO(uow)
+            created = await dao.upsert(None, owner, MapCreate(name="A", description="d", state="{}"))
+            assert created is not None and created[1] is True
+            updated = await dao.upsert(created[0].id, owner, MapCreate(name="B", description="d", state="{}"))
+            assert updated is not None and updated[1] is False
+            assert (updated[0].id, updated[0].name) == (created[0].id, "B")
+            assert await dao.upsert(theirs.id, owner, MapCreate(name="X", description="d", state="{}")) is None
+
+    async def test_remove_many_spans_shards(self: TestShardedMapDAO, router: ShardRouter) -> None:
+        """remove_many() deletes global IDs on every shard involved and returns them with global IDs."""
+        async with router.unit_of_work() as uow:
+            created: list[Map] = [
+                await ShardedMapDAO(uow).create(u, MapCreate(name=u, description="d", state="{}")) for u in USERS
+            ]
+
+        async with router.unit_of_work() as uow:
+            removed: list[Map] = await ShardedMapDAO(uow).remove_many([m.id for m in created])
+            assert sorted(m.id for m in removed) == sorted(m.id for m in created)
+
+        async with router.unit_of_work() as uow:
+            assert await ShardedMapDAO(uow).list() == []
+
+    async def test_rollback_on_error(self: TestShardedMapDAO, router: ShardRouter) -> None:
+        """A failing request leaves no rows on any shard."""
+        with pytest.raises(RuntimeError):
+            async with router.unit_of_work() as uow:
+                await ShardedMapDAO(uow).create(USERS[0], MapCreate(name="A", description="d", state="{}"))
+                raise RuntimeError("boom")
+
+        async with router.unit_of_work() as uow:
+            assert await ShardedMapDAO(uow).list() == []
+
+    async def test_session_hooks_apply_to_every_shard(self: TestShardedMapDAO, router: ShardRouter) -> None:
+        """on_session() configures sessions already open and those opened afterwards."""
+        async with router.unit_of_work() as uow:
+            first: AsyncSession = uow.session(0)
+            configured: list[AsyncSession] = []
+            uow.on_session(configured.append)
+            assert configured == [first]
+
+            await uow.scatter(lambda shard, session: asyncio.sleep(0))
+            assert configured == [first, *(uow.session(s) for s in range(1, SHARDS))]
+
+    async def test_transaction_hooks_run_after_the_shards_finish(
+        self: TestShardedMapDAO,
+        router: ShardRouter,
+    ) -> None:
+        """Commit hooks run once every shard committed; a failed request runs the rollback hooks instead."""
+        ran: list[str] = []
+        async with router.unit_of_work() as uow:
+            await ShardedMapDAO(uow).create(USERS[0], MapCreate(name="n", description="d", state="{}"))
+            uow.on_commit(lambda: ran.append("commit"))
+            uow.on_rollback(lambda: ran.append("rollback"))
+            assert ran == []
+        assert ran == ["commit"]
+
+        with pytest.raises(RuntimeError):
+            async with router.unit_of_work() as uow:
+                uow.on_commit(lambda: ran.append("commit"))
+                uow.on_rollback(lambda: ran.append("rollback"))
+                raise RuntimeError("boom")
+        assert ran == ["commit", "rollback"]
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.db
+class TestShardedMessageDAO:
+    """Unit tests for messages partitioned across shards."""
+
+    async def test_create_get_and_list(self: TestShardedMessageDAO, router: ShardRouter) -> None:
+        """Messages round-trip by global ID and list() covers every shard."""
+        async with router.unit_of_work() as uow:
+            created: list[Message] = [await ShardedMessageDAO(uow).create(u, f"hi {u}") for u in USERS]
+
+        async with router.unit_of_work() as uow:
+            dao = ShardedMessageDAO(uow)
+            for msg in created:
+                fetched: Message | None = await dao.get(msg.id)
+                assert fetched is not None and fetched.content == f"hi {msg.user_id}"
+            assert len(await dao.list()) == len(USERS)
+            assert [m.user_id for m in await dao.list_by_user(USERS[3])] == [USERS[3]]
+
+    async def test_search_merges_shards_by_rank(self: TestShardedMessageDAO, router: ShardRouter) -> None:
+        """search() covers every shard with global IDs, ranked, and pages across shards without repeats."""
+        async with router.unit_of_work() as uow:
+            created: list[Message] = [await ShardedMessageDAO(uow).create(u, f"needle {u}") for u in USERS]
+            await ShardedMessageDAO(uow).create(USERS[0], "haystack")
+
+        async with router.unit_of_work() as uow:
+            dao = ShardedMessageDAO(uow)
+            seen: list[int] = []
+            after: RankCursor | None = None
+            while page := await dao.search("needle", limit=5, after=after):
+                assert [(h.rank, h.item.id) for h in page] == sorted(((h.rank, h.item.id) for h in page), reverse=True)
+                seen += [h.item.id for h in page]
+                after = RankCursor(rank=page[-1].rank, id=page[-1].item.id)
+            assert sorted(seen) == sorted(m.id for m in created)
+            assert [h.item.user_id for h in await dao.search("needle", USERS[2])] == [USERS[2]]
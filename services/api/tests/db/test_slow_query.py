@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from pydantic import SecretStr
+from pytest_mock import MockerFixture
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.settings import DatabaseSettings
+from app.db.engine import build_engine
+from app.db.slow_query import parameters_shape
+
+
+def make_database(**overrides: Any) -> DatabaseSettings:
+    """Build SQLite DatabaseSettings with the given overrides."""
+    values: dict[str, Any] = {
+        "backend": "sqlite",
+        "hostname": "test.localhost",
+        "port": 5432,
+        "user": "testuser",
+        "password": SecretStr("testpass"),
+        "name": ":memory:",
+    }
+    return DatabaseSettings(**(values | overrides))
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.db
+class TestSlowQueryLog:
+    """Unit tests for the slow query log engine hooks."""
+
+    async def test_logs_statements_over_threshold(self: TestSlowQueryLog, mocker: MockerFixture) -> None:
+        """Statements slower than the threshold are logged with their parameter shape."""
+        log = mocker.patch("app.db.slow_query.log")
+        engine: AsyncEngine = build_engine(make_database(slow_query_ms=0.000001))
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT :value"), {"value": 1})
+        finally:
+            await engine.dispose()
+
+        slow_calls: list[Any] = [c for c in log.warning.call_args_list if c.args[0] == "🐢 Slow query"]
+        assert slow_calls
+        kwargs: dict[str, Any] = slow_calls[-1].kwargs
+        assert kwargs["statement"] == "SELECT ?"
+        assert kwargs["parameters"] == ["int"]
+
+    async def test_disabled_when_threshold_is_zero(self: TestSlowQueryLog, mocker: MockerFixture) -> None:
+        """A zero threshold disables the hooks entirely."""
+        log = mocker.patch("app.db.slow_query.log")
+        engine: AsyncEngine = build_engine(make_database(slow_query_ms=0))
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        finally:
+            await engine.dispose()
+
+        log.warning.assert_not_called()
+
+    def test_parameters_shape(self: TestSlowQueryLog) -> None:
+        """Parameter shapes expose types and row counts but no values."""
+        assert parameters_shape({"user_id": "secret", "limit": 10}) == {"user_id": "str", "limit": "int"}
+        assert parameters_shape([("a", 1), ("b", 2)], executemany=True) == {"rows": 2, "row": ["str", "int"]}
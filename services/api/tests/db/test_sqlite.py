@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic import SecretStr
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.settings import DatabaseSettings
+from app.db.base import Base
+from app.db.routing import ReadYourWritesTracker, RoutingSession
+from app.db.sqlite import build_sqlite_engines
+from app.db.unit_of_work import UnitOfWork
+from app.infrastructure.messages.dao import MessageDAO
+
+
+def make_database(path: Path, **overrides: Any) -> DatabaseSettings:
+    """Build file-backed SQLite DatabaseSettings in production mode."""
+    values: dict[str, Any] = {
+        "backend": "sqlite",
+        "hostname": "test.localhost",
+        "port": 5432,
+        "user": "testuser",
+        "password": SecretStr("testpass"),
+        "name": str(path),
+        "sqlite_wal": True,
+    }
+    return DatabaseSettings(**(values | overrides))
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.db
+class TestSqliteProductionMode:
+    """Unit tests for the single-node SQLite mode."""
+
+    async def test_pragmas_applied(self: TestSqliteProductionMode, tmp_path: Path) -> None:
+        """Writer and readers run in WAL mode with tuned pragmas; readers are read-only."""
+        writer, reader = build_sqlite_engines(make_database(tmp_path / "edge.db", sqlite_busy_timeout_ms=1234))
+        try:
+            async with writer.connect() as conn:
+                assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+                assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1
+                assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == 1234
+                assert (await conn.execute(text("PRAGMA query_only"))).scalar() == 0
+
+            async with reader.connect() as conn:
+                assert (await conn.execute(text("PRAGMA query_only"))).scalar() == 1
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("CREATE TABLE nope (id INTEGER)"))
+        finally:
+            await writer.dispose()
+            await reader.dispose()
+
+    async def test_routes_writes_to_writer(self: TestSqliteProductionMode, tmp_path: Path) -> None:
+        """Writes go through the single writer and are visible to the reader pool after commit."""
+        writer, reader = build_sqlite_engines(make_database(tmp_path / "edge.db"))
+        async with writer.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
+            sync_session_class=RoutingSession,
+            expire_on_commit=False,
+            primary=writer,
+            replicas=[reader],
+            tracker=ReadYourWritesTracker(0),
+        )
+        try:
+            async with factory() as session, UnitOfWork(session):
+                await MessageDAO(session).create("u", "hello")
+
+            async with factory() as session:
+                assert [m.content for m in await MessageDAO(session).list_by_user("u")] == ["hello"]
+        finally:
+            await writer.dispose()
+            await reader.dispose()
+
+    def test_rejects_memory_database(self: TestSqliteProductionMode) -> None:
+        """WAL mode needs a file-backed database."""
+        with pytest.raises(ValueError):
+            build_sqlite_engines(make_database(Path(":memory:")))
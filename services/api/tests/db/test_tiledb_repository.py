@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+# TileDB is the optional "tiledb" extra; task test:db:tiledb installs it and sets TILEDB_REQUIRED
+if not os.environ.get("TILEDB_REQUIRED"):
+    pytest.importorskip("tiledb")
+
+from app.domain.datasets.models import BoundingBox, DatasetInfo, DatasetSlice  # noqa: E402
+from app.infrastructure.datasets.tiledb_repository import TileDBDatasetRepository  # noqa: E402
+
+ROWS: int = 1000
+
+
+def points() -> dict[str, list[Any]]:
+    """A grid of ROWS points with a numeric and a text attribute."""
+    return {
+        "lon": [float(i % 40) for i in range(ROWS)],
+        "lat": [float(i // 40) for i in range(ROWS)],
+        "value": list(range(ROWS)),
+        "label": [f"p{i}" for i in range(ROWS)],
+    }
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.db
+class TestTileDBDatasetRepository:
+    """Unit tests for TileDB dataset storage."""
+
+    async def test_write_and_info(self: TestTileDBDatasetRepository, tmp_path: Path) -> None:
+        """Writing records the row count, column types and spatial axes."""
+        repo = TileDBDatasetRepository(str(tmp_path), tile_rows=128)
+        info: DatasetInfo = await repo.write(1, "points", points(), x="lon", y="lat")
+
+        assert info.rows == ROWS
+        assert info.columns == {"lon": "float64", "lat": "float64", "value": "int64", "label": "str"}
+        assert await repo.info(1, "points") == info
+        assert await repo.info(1, "missing") is None
+
+    async def test_read_rows(self: TestTileDBDatasetRepository, tmp_path: Path) -> None:
+        """Row ranges are half-open and clamped to the dataset."""
+        repo = TileDBDatasetRepository(str(tmp_path), tile_rows=128)
+        await repo.write(1, "points", points(), x="lon", y="lat")
+
+        data: DatasetSlice | None = await repo.read_rows(1, "points", 100, 105, ["value", "label"])
+        assert data is not None
+        assert data.row_ids == [100, 101, 102, 103, 104]
+        assert data.columns == {"value": [100, 101, 102, 103, 104], "label": ["p100", "p101", "p102", "p103", "p104"]}
+
+        tail: DatasetSlice | None = await repo.read_rows(1, "points", ROWS - 2, ROWS + 50)
+        assert tail is not None and tail.row_ids == [ROWS - 2, ROWS - 1]
+
+    async def test_read_bbox(self: TestTileDBDatasetRepository, tmp_path: Path) -> None:
+        """Bounding-box reads return exactly the points inside the box, in row order."""
+        repo = TileDBDatasetRepository(str(tmp_path), tile_rows=128)
+        columns = points()
+        await repo.write(1, "points", columns, x="lon", y="lat")
+
+        data: DatasetSlice | None = await repo.read_bbox(1, "points", BoundingBox(min_x=2, min_y=3, max_x=4, max_y=5))
+        expected: list[int] = [
+            i for i in range(ROWS) if 2 <= columns["lon"][i] <= 4 and 3 <= columns["lat"][i] <= 5
+        ]
+        assert data is not None
+        assert data.row_ids == expected
+        assert data.columns["value"] == expected
+        assert data.columns["lon"] == [columns["lon"][i] for i in expected]
+
+    async def test_replace_and_delete(self: TestTileDBDatasetRepository, tmp_path: Path) -> None:
+        """Writing again replaces the dataset; deleting removes it."""
+        repo = TileDBDatasetRepository(str(tmp_path), tile_rows=128)
+        await repo.write(1, "points", points(), x="lon", y="lat")
+        info: DatasetInfo = await repo.write(1, "points", {"value": [1, 2, 3]})
+
+        assert info.rows == 3 and not info.is_spatial
+        with pytest.raises(ValueError):
+            await repo.read_bbox(1, "points", BoundingBox(min_x=0, min_y=0, max_x=1, max_y=1))
+        assert await repo.delete(1, "points") is True
+        assert await repo.delete(1, "points") is False
+
+    async def test_rejects_ragged_columns(self: TestTileDBDatasetRepository, tmp_path: Path) -> None:
+        """Columns of different lengths are rejected."""
+        repo = TileDBDatasetRepository(str(tmp_path))
+        with pytest.raises(ValueError):
+            await repo.write(1, "bad", {"a": [1, 2], "b": [1]})
+
+    async def test_columns_named_like_axes(self: TestTileDBDatasetRepository, tmp_path: Path) -> None:
+        """Columns called x and y are plain data, not the sparse array's dimensions."""
+        repo = TileDBDatasetRepository(str(tmp_path), tile_rows=128)
+        columns: dict[str, list[Any]] = {
+            **points(),
+            "x": [-i for i in range(ROWS)],
+            "y": [f"y{i}" for i in range(ROWS)],
+        }
+        await repo.write(1, "points", columns, x="lon", y="lat")
+
+        data: DatasetSlice | None = await repo.read_bbox(1, "points", BoundingBox(min_x=0, min_y=0, max_x=1, max_y=0))
+        assert data is not None
+        assert data.row_ids == [0, 1]
+        assert data.columns["x"] == [0, -1]
+        assert data.columns["y"] == ["y0", "y1"]
+        assert data.columns["lon"] == [0.0, 1.0]
+
+    @pytest.mark.parametrize(
+        "columns",
+        [
+            {"a": [[1, 2], [3, 4]]},
+            {"a": [["p", "q"], ["r", "s"]]},
+            {"_row": [1, 2]},
+            {"_x": [1, 2]},
+            {"_y": [1, 2]},
+        ],
+    )
+    async def test_rejects_unstorable_columns(
+        self: TestTileDBDatasetRepository, tmp_path: Path, columns: dict[str, list[Any]]
+    ) -> None:
+        """Nested values and reserved column names are rejected before anything is written."""
+        repo = TileDBDatasetRepository(str(tmp_path))
+        with pytest.raises(ValueError):
+            await repo.write(1, "bad", columns)
+        assert await repo.info(1, "bad") is None
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Sequence
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.base import Base
+from app.db.entities.map import Map
+from app.db.entities.message import Message
+from app.db.unit_of_work import UnitOfWork
+from app.infrastructure.maps.dao import MapDAO
+from app.infrastructure.messages.dao import MessageDAO
+from app.schemas.maps import MapCreate
+
+
+@pytest.fixture
+async def file_engine(tmp_path: Path) -> AsyncEngine:
+    """Fixture providing a file-backed SQLite engine so commits are observable across sessions."""
+    engine: AsyncEngine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'uow.db'}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.db
+class TestUnitOfWork:
+    """Unit tests for the request-scoped UnitOfWork."""
+
+    async def test_commits_once_on_success(self: TestUnitOfWork, file_engine: AsyncEngine) -> None:
+        """Writes from several DAOs are committed together at the end."""
+        async with AsyncSession(file_engine, expire_on_commit=False) as session:
+            async with UnitOfWork(session):
+                created: Map = await MapDAO(session).create("u", MapCreate(name="A", description="d", state="{}"))
+                msg: Message = await MessageDAO(session).create("u", "hello")
+                # Server defaults are hydrated by RETURNING, no refresh needed
+                assert created.id is not None and created.created_at is not None
+                assert msg.id is not None and msg.updated_at is not None
+
+        async with AsyncSession(file_engine) as session:
+            maps: Sequence[Map] = await MapDAO(session).list()
+            messages: Sequence[Message] = await MessageDAO(session).list()
+            assert len(maps) == 1
+            assert len(messages) == 1
+
+        await file_engine.dispose()
+
+    async def test_rolls_back_on_error(self: TestUnitOfWork, file_engine: AsyncEngine) -> None:
+        """An exception inside the unit of work discards all flushed writes."""
+        with pytest.raises(RuntimeError):
+            async with AsyncSession(file_engine) as session:
+                async with UnitOfWork(session):
+                    await MessageDAO(session).create("u", "lost")
+                    raise RuntimeError("boom")
+
+        async with AsyncSession(file_engine) as session:
+            assert await MessageDAO(session).list() == []
+
+        await file_engine.dispose()
+
+    async def test_runs_the_hooks_of_the_outcome(self: TestUnitOfWork, file_engine: AsyncEngine) -> None:
+        """Commit hooks run only after a successful commit, rollback hooks only after a rollback."""
+        ran: list[str] = []
+        async with AsyncSession(file_engine) as session:
+            async with UnitOfWork(session) as uow:
+                await MessageDAO(session).create("u", "kept")
+                uow.on_commit(lambda: ran.append("commit"))
+                uow.on_rollback(lambda: ran.append("rollback"))
+                assert ran == []
+            assert ran == ["commit"]
+
+            with pytest.raises(RuntimeError):
+                async with UnitOfWork(session) as uow:
+                    uow.on_commit(lambda: ran.append("commit"))
+                    uow.on_rollback(lambda: ran.append("rollback"))
+                    raise RuntimeError("boom")
+            assert ran == ["commit", "rollback"]
+
+        await file_engine.dispose()
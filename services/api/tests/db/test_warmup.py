@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.db.pool import InstrumentedAsyncAdaptedQueuePool, attach_pool_stats, get_pool_stats
+from app.db.warmup import WarmupReport, warm_up
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.db
+class TestWarmup:
+    """Unit tests for startup connection warm-up."""
+
+    async def test_warm_up_fills_pool(self: TestWarmup, tmp_path: Path) -> None:
+        """Warm-up should leave the requested number of validated connections in the pool."""
+        engine: AsyncEngine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}",
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_size=3,
+        )
+        attach_pool_stats(engine)
+        try:
+            report: WarmupReport = await warm_up(engine, connections=3)
+            stats: dict[str, Any] = get_pool_stats(engine)
+
+            assert report.connections == 3
+            assert report.total_seconds >= 0
+            assert stats["connections_opened"] == 3
+            assert stats["checked_in"] == 3
+            assert stats["checked_out"] == 0
+        finally:
+            await engine.dispose()
+
+    async def test_warm_up_without_connections(self: TestWarmup, tmp_path: Path) -> None:
+        """A zero-connection warm-up only configures mappers."""
+        engine: AsyncEngine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}")
+        attach_pool_stats(engine)
+        try:
+            report: WarmupReport = await warm_up(engine, connections=0)
+            assert report.connections == 0
+            assert get_pool_stats(engine)["connections_opened"] == 0
+        finally:
+            await engine.dispose()
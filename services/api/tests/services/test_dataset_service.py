@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import pytest
+
+from app.domain.datasets.models import BoundingBox, DatasetInfo
+from app.infrastructure.datasets.mock_repository import MockDatasetRepository
+from app.schemas.datasets import DatasetSliceRead, DatasetWrite
+from app.services.dataset_service import DatasetService
+
+POINTS = DatasetWrite(
+    columns={
+        "lon": [float(i) for i in range(10)],
+        "lat": [float(-i) for i in range(10)],
+        "label": [f"p{i}" for i in range(10)],
+    },
+    x="lon",
+    y="lat",
+)
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+@pytest.mark.maps
+class TestDatasetService:
+    """Unit tests for DatasetService read limits."""
+
+    async def test_read_rows_is_capped(self: TestDatasetService) -> None:
+        """Open-ended and oversized ranges are clamped and flagged as truncated."""
+        service = DatasetService(MockDatasetRepository(), read_max_rows=4)
+        info: DatasetInfo = await service.write(1, "points", POINTS)
+        assert info.rows == 10
+
+        capped: DatasetSliceRead | None = await service.read_rows(1, "points", 2, None)
+        assert capped is not None
+        assert capped.row_ids == [2, 3, 4, 5]
+        assert capped.truncated is True
+
+        tail: DatasetSliceRead | None = await service.read_rows(1, "points", 8, None, ["label"])
+        assert tail is not None
+        assert tail.columns == {"label": ["p8", "p9"]}
+        assert tail.truncated is False
+
+    async def test_read_bbox_is_capped(self: TestDatasetService) -> None:
+        """Bounding-box reads keep the first read_max_rows rows."""
+        service = DatasetService(MockDatasetRepository(), read_max_rows=3)
+        await service.write(1, "points", POINTS)
+
+        data: DatasetSliceRead | None = await service.read_bbox(
+            1, "points", BoundingBox(min_x=1, min_y=-6, max_x=6, max_y=0)
+        )
+        assert data is not None
+        assert data.row_ids == [1, 2, 3]
+        assert data.truncated is True
+
+    async def test_missing_dataset(self: TestDatasetService) -> None:
+        """Reads of unknown datasets return None."""
+        service = DatasetService(MockDatasetRepository(), read_max_rows=3)
+        assert await service.read_rows(1, "missing", 0, 10) is None
+        assert await service.info(1, "missing") is None
@@ -48,7 +48,7 @@ async def test_update(self: TestMapService, db_session: AsyncSession) -> None:
             "u", MapCreate(name="old", description="d1", state="{}")
         )
         updated: MapDomain | None = await service.update(
-            ms.id, MapUpdate(name="new", description="d2", state="{1}")
+            ms.id, MapUpdate(name="new", description="d2", state='{"v": 1}')
         )
         assert updated is not None
         assert updated.name == "new"